@@ -88,6 +88,21 @@ else:
     DATABASES = {"default": dj_database_url.parse(config("DATABASE_URL"))}
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# shared by the processes of the server : a version of the cached facets and
+# totals renewed by one worker is read by the others, see
+# epic_events/facets.py. The table is created by the migration 0035_cache_table
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "epic_events_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -20,9 +20,10 @@ urlpatterns = [
     path("", include("epic_events.urls.company")),
     path("", include("epic_events.urls.customer")),
     path("", include("epic_events.urls.contract")),
-    path("", include("epic_events.urls.contract_filter")),
     path("", include("epic_events.urls.event")),
     path("", include("epic_events.urls.location")),
+    path("", include("epic_events.urls.search")),
+    path("", include("epic_events.urls.typeahead")),
 ]
 
 # images url configuration
@@ -0,0 +1,245 @@
+"""Calendar of the events : the week and month views, and the ICS feeds of the
+supports and of the commercials.
+
+A period lists the events overlapping it. start_date is indexed, but an event
+starting before the period may still be running during it : the events are
+read from the start of the period minus longest_event(), the longest duration
+of an event, cached once per version of the data, to its end. The query is a
+range scan of the index of start_date instead of a read of all the past
+events.
+
+The feeds are polled every few minutes by the calendar clients. Their ETag
+and Last-Modified come from one aggregate query over the events of the feed,
+read through the index of the collaborator : the count and the latest
+edition_time of the events and of their customers, locations and supports.
+An unchanged feed answers 304 without being rendered, a changed one is
+streamed line by line from an iterator over its events. The clients cannot log in, the URL of a feed holds a
+signature of the collaborator id."""
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from hashlib import md5
+
+from django.core import signing
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Q,
+    QuerySet,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .facets import cached_facets
+from .models.collaborator import Collaborator
+from .models.contract_event import Event
+
+periods = ("week", "month")
+# past events listed by the feeds
+feed_history = timedelta(days=90)
+# lines of the feeds are folded after 75 octets, RFC 5545
+line_length = 75
+feed_salt = "epic_events.agenda.feed"
+
+
+def period(kind: str, day: datetime = None) -> tuple:
+    """(start, end) of the week or of the month of the day, today by default,
+    the month starts on the monday of its first week and ends on the sunday of
+    its last one"""
+
+    day = timezone.localtime(day).replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind == "week":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+
+    first = day.replace(day=1)
+    if first.month == 12:
+        next_first = first.replace(year=first.year + 1, month=1)
+    else:
+        next_first = first.replace(month=first.month + 1)
+    start = first - timedelta(days=first.weekday())
+    end = next_first + timedelta(days=(7 - next_first.weekday()) % 7)
+
+    return start, end
+
+
+def longest_event() -> timedelta:
+    """longest duration of an event"""
+
+    duration = ExpressionWrapper(
+        F("end_date") - F("start_date"), output_field=DurationField()
+    )
+    longest = Event.objects.filter(end_date__gt=F("start_date")).aggregate(
+        longest=Max(duration)
+    )["longest"]
+
+    return longest or timedelta(0)
+
+
+def events_between(start: datetime, end: datetime, qs: QuerySet = None) -> QuerySet:
+    """events of the qs overlapping [start, end], an event lasting an instant
+    at start included, by start date"""
+
+    if qs is None:
+        qs = Event.objects.all()
+    earliest = start - cached_facets(longest_event)
+
+    return (
+        qs.filter(start_date__gte=earliest, start_date__lt=end)
+        .alias(ends=Coalesce("end_date", "start_date"))
+        .filter(Q(start_date__gte=start) | Q(ends__gt=start))
+        .select_related("contract__customer", "location", "support")
+        .order_by("start_date", "id")
+    )
+
+
+def calendar_days(start: datetime, end: datetime, events) -> list:
+    """weeks [[(date, [event])]] of the period, each event listed on the days
+    it lasts"""
+
+    days = (end - start).days
+    first = timezone.localtime(start).date()
+    events_by_day = [[] for _ in range(days)]
+    for event in events:
+        event_start = timezone.localtime(event.start_date).date()
+        if event.end_date and event.end_date > event.start_date:
+            # an event ending at midnight does not last the next day
+            event_end = timezone.localtime(event.end_date - timedelta(microseconds=1))
+            event_end = event_end.date()
+        else:
+            event_end = event_start
+        for i in range(
+            max((event_start - first).days, 0), min((event_end - first).days + 1, days)
+        ):
+            events_by_day[i].append(event)
+
+    calendar = [(first + timedelta(days=i), events_by_day[i]) for i in range(days)]
+
+    # the days 7 by 7
+    return [list(week) for week in zip(*[iter(calendar)] * 7)]
+
+
+def feed_events(collaborator: Collaborator) -> QuerySet:
+    """events of the support, or of the customers of the commercial, started
+    at most feed_history ago, None for the other roles"""
+
+    if collaborator.role == "Support":
+        qs = Event.objects.filter(support=collaborator)
+    elif collaborator.role == "Commercial":
+        qs = Event.objects.filter(contract__customer__commercial=collaborator)
+    else:
+        return None
+
+    return qs.filter(start_date__gte=timezone.now() - feed_history)
+
+
+def feed_state(qs: QuerySet) -> tuple:
+    """(ETag, Last-Modified) of the events of the feed, one aggregate query"""
+
+    state = qs.aggregate(
+        count=Count("id"),
+        events=Max("edition_time"),
+        customers=Max("contract__customer__edition_time"),
+        locations=Max("location__edition_time"),
+        supports=Max("support__edition_time"),
+    )
+    times = [time for name, time in state.items() if name != "count" and time]
+    modified = max(times) if times else None
+    etag = md5(f"{state['count']}:{times}".encode()).hexdigest()
+
+    return etag, modified
+
+
+def feed_signature(id: int) -> str:
+    """signature of the URL of the feed of a collaborator"""
+
+    return signing.Signer(salt=feed_salt).signature(str(id))
+
+
+def ics_text(text: str) -> str:
+    """TEXT value, RFC 5545 3.3.11"""
+
+    return (
+        str(text)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ics_time(value: datetime) -> str:
+    """UTC DATE-TIME value, '20261017T090000Z'"""
+
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def folded(line: str) -> str:
+    """content line folded after line_length octets, with its CRLF"""
+
+    parts = []
+    part, size = "", 0
+    for char in line:
+        octets = len(char.encode())
+        if size + octets > line_length:
+            parts.append(part)
+            # the continuation lines start with a space
+            part, size = " ", 1
+        part += char
+        size += octets
+    parts.append(part)
+
+    return "\r\n".join(parts) + "\r\n"
+
+
+def event_lines(event: Event, url: str) -> list:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@epic-events",
+        f"DTSTAMP:{ics_time(event.edition_time or event.creation_time)}",
+        f"DTSTART:{ics_time(event.start_date)}",
+    ]
+    if event.end_date and event.end_date > event.start_date:
+        lines.append(f"DTEND:{ics_time(event.end_date)}")
+    lines.append(f"SUMMARY:{ics_text(f'n°{event.id} - {event.customer_name}')}")
+    if event.location:
+        lines.append(f"LOCATION:{ics_text(event.location)}")
+    if event.note:
+        lines.append(f"DESCRIPTION:{ics_text(event.note)}")
+    lines.extend([f"URL:{url}", "END:VEVENT"])
+
+    return lines
+
+
+def feed_lines(name: str, qs: QuerySet, url, chunk_size: int = 500):
+    """folded lines of the ICS feed of the events of the qs, url(event) is
+    the address of an event"""
+
+    yield from map(
+        folded,
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Epic Events//Agenda//FR",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{ics_text(name)}",
+        ],
+    )
+    events = (
+        qs.filter(start_date__isnull=False)
+        .select_related("contract__customer", "location")
+        .order_by("start_date", "id")
+    )
+    for event in events.iterator(chunk_size=chunk_size):
+        yield "".join(map(folded, event_lines(event, url(event))))
+    yield folded("END:VCALENDAR")
+
+
+def day_value(day: datetime) -> str:
+    """'2026-10-17', value of the query string"""
+
+    return timezone.localtime(day).date().isoformat()
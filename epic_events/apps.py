@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EpicEventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'epic_events'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,248 @@
+"""Automatic assignment of the supports to the events without support.
+
+The managers assign the supports one event at a time with ChangeSupportView.
+propose_assignments() proposes a support for each upcoming event without
+support, in one pass : the cost of a support for an event is
+
+- its workload, event_cost per event of the support during the period of
+  the events to assign, the ones proposed by the pass included,
+- the km between the postal code of the event and the closest one of the
+  events of the support, unknown_distance without any : the codes of its
+  events are held in a KDTree, see epic_events/gazetteer.py,
+
+and a support busy on the dates of the event is excluded. The events are
+read once : the events of the supports during the period give their
+workload, their postal codes and an IntervalTree per support, see
+epic_events/conflicts.py.
+
+The workload grows with each event proposed and two events proposed to the
+same support must not overlap : the costs change with each choice, and a
+cost matrix solved once would propose them all to the cheapest support.
+The events are proposed greedily, the ones with the fewest supports
+available first, then by start date, each to its cheapest support.
+apply_assignments() writes the pairs reviewed by the manager with one
+bulk_update, once checked again under the lock of their events."""
+
+from bisect import bisect_left
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from . import facets
+from .conflicts import IntervalTree, interval
+from .gazetteer import KDTree, arc, gazetteer
+from .models.collaborator import Collaborator
+from .models.contract_event import Event
+from .models.counter import counts, update_counters
+from .models.slugs import refresh_slugs
+from .views.paginator import counts_version_key
+
+# cost of one more event of a support, in km
+event_cost = 50
+# km to an event of a support without any event located
+unknown_distance = 100
+
+
+def zip_point(location) -> tuple:
+    """point of the postal code of the location on the unit sphere, None when
+    it is unknown"""
+
+    if location is None or not location.zip or gazetteer().find(location.zip) is None:
+        return None
+    return gazetteer().point(location.zip)
+
+
+class SupportSchedule:
+    """events of a support during the period : the existing ones in an
+    IntervalTree and their postal codes in a KDTree, the proposed ones in
+    sorted lists, without overlap"""
+
+    def __init__(self, support: Collaborator, events: list):
+        self.support = support
+        self.workload = len(events)
+        self.tree = IntervalTree(
+            [(*interval(event), event) for event in events if event.start_date]
+        )
+        points = {zip_point(event.location) for event in events} - {None}
+        self.places = KDTree((*point, 0) for point in points)
+        self.starts = []
+        self.ends = []
+        self.points = []
+
+    def is_busy(self, start: float, end: float) -> bool:
+        if self.tree.overlapping(start, end):
+            return True
+        # the proposed event starting last before end
+        i = bisect_left(self.starts, end) - 1
+
+        return i >= 0 and self.ends[i] > start
+
+    def distance(self, point: tuple) -> float:
+        """km from the point to the closest event, unknown_distance without
+        any"""
+
+        if point is None:
+            return unknown_distance
+        distances2 = [
+            sum((a - b) ** 2 for a, b in zip(point, other)) for other in self.points
+        ]
+        if len(self.places):
+            distances2.append(self.places.nearest(point, 1)[0][0])
+        if not distances2:
+            return unknown_distance
+
+        return arc(min(distances2) ** 0.5)
+
+    def add(self, event: Event, point: tuple):
+        if event.start_date:
+            start, end = interval(event)
+            i = bisect_left(self.starts, start)
+            self.starts.insert(i, start)
+            self.ends.insert(i, end)
+        if point is not None:
+            self.points.append(point)
+        self.workload += 1
+
+
+def unassigned_events(qs: QuerySet = None) -> QuerySet:
+    """events without support, not started"""
+
+    if qs is None:
+        qs = Event.objects.all()
+
+    return qs.filter(
+        Q(start_date__isnull=True) | Q(start_date__gte=timezone.now()),
+        support__isnull=True,
+    ).select_related("contract__customer", "location")
+
+
+def support_schedules(supports: list, events: list) -> list:
+    """[SupportSchedule] of the supports during the period of the events"""
+
+    dated = [event for event in events if event.start_date]
+    events_by_support = {support.id: [] for support in supports}
+    if dated:
+        start = min(event.start_date for event in dated)
+        end = max(event.end_date or event.start_date for event in dated)
+        busy = (
+            Event.objects.filter(support__in=supports, start_date__isnull=False)
+            .overlapping(start, max(end, start))
+            .select_related("location")
+        )
+        for event in busy:
+            events_by_support[event.support_id].append(event)
+
+    return [
+        SupportSchedule(support, events_by_support[support.id]) for support in supports
+    ]
+
+
+def propose_assignments(events: QuerySet = None, supports: QuerySet = None) -> tuple:
+    """([(event, support, workload, km)], [event left without support]) : the
+    workload of the support before the event, the km to its closest event"""
+
+    events = list(unassigned_events() if events is None else events)
+    if supports is None:
+        supports = Collaborator.objects.filter(department__name="Support")
+    schedules = support_schedules(list(supports.order_by("id")), events)
+
+    def available(event: Event) -> list:
+        if not event.start_date:
+            return schedules
+        start, end = interval(event)
+        return [schedule for schedule in schedules if not schedule.is_busy(start, end)]
+
+    # the most constrained events first
+    events.sort(
+        key=lambda event: (
+            len(available(event)),
+            event.start_date is None,
+            event.start_date or timezone.now(),
+            event.id,
+        )
+    )
+
+    proposals = []
+    unassigned = []
+    for event in events:
+        point = zip_point(event.location)
+        costs = []
+        for schedule in available(event):
+            km = schedule.distance(point)
+            costs.append((event_cost * schedule.workload + km, km, schedule))
+        if not costs:
+            unassigned.append(event)
+            continue
+
+        _, km, schedule = min(costs, key=lambda cost: (cost[0], cost[2].support.id))
+        proposals.append((event, schedule.support, schedule.workload, km))
+        schedule.add(event, point)
+
+    proposals.sort(key=lambda proposal: proposal[0].id)
+
+    return proposals, unassigned
+
+
+def apply_assignments(pairs: list) -> tuple:
+    """writes the (event id, support id) pairs reviewed by the manager with one
+    bulk_update, (number of events assigned, [(event id, support id, reason)]
+    of the pairs skipped)"""
+
+    with transaction.atomic():
+        # the events are checked again once locked : another manager may have
+        # assigned them, or moved them, since the review
+        events = {
+            event.id: event
+            for event in Event.objects.select_for_update().filter(
+                id__in=[event_id for event_id, _ in pairs]
+            )
+        }
+        supports = {
+            support.id: support
+            for support in Collaborator.objects.filter(
+                id__in=[support_id for _, support_id in pairs],
+                department__name="Support",
+            )
+        }
+        # the events of the supports, the pairs accepted included
+        schedules = {
+            schedule.support.id: schedule
+            for schedule in support_schedules(
+                list(supports.values()), list(events.values())
+            )
+        }
+
+        assigned = []
+        skipped = []
+        for event_id, support_id in pairs:
+            event = events.get(event_id)
+            if event is None or event.support_id is not None:
+                skipped.append((event_id, support_id, "déjà affecté ou supprimé"))
+                continue
+            if support_id not in supports:
+                skipped.append((event_id, support_id, "support inconnu"))
+                continue
+            schedule = schedules[support_id]
+            if event.start_date and schedule.is_busy(*interval(event)):
+                skipped.append((event_id, support_id, "support occupé sur ces dates"))
+                continue
+            schedule.add(event, None)
+            event.support = supports[support_id]
+            assigned.append(event)
+
+        ids = [event.id for event in assigned]
+        before = counts(events=ids)
+        now = timezone.now()
+        for event in assigned:
+            event.edition_time = now
+        Event.objects.bulk_update(assigned, ["support", "edition_time"])
+
+        # the bulk writes send no signal : the slugs hold the name of the
+        # support, the counters and the cached facets count the events
+        refresh_slugs(Event.objects.filter(id__in=ids))
+        update_counters(before, counts(events=ids))
+        facets.invalidate()
+        facets.invalidate(counts_version_key)
+
+    return len(assigned), skipped
@@ -0,0 +1,160 @@
+"""Scheduling conflicts of the supports : two events of the same support whose
+dates overlap. An event lasts from its start_date to its end_date, an event
+without end_date lasts an instant.
+
+ChangeSupportForm refuses a support busy on the dates of the event, and
+EventForm the dates on which its support is busy : Event.objects.overlapping()
+reads the events of the support starting before the end of the event from the
+index event_support_dates_idx, (support_id, start_date, end_date), and keeps
+the ones ending after its start without reading the table.
+
+support_conflicts() reports the conflicts of a period : the events of the
+period are read once and each support gets an IntervalTree of its events,
+where each event finds the ones it overlaps in O(log n + k). The report costs
+O(n log n + k) instead of comparing every pair of events of a support."""
+
+from array import array
+from collections import defaultdict
+from datetime import datetime
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models.contract_event import Event
+
+# events listed by the error of the forms
+listed_conflicts = 5
+
+
+def quarter(day: datetime = None) -> tuple:
+    """(start, end) of the quarter of the day, today by default"""
+
+    day = timezone.localtime(day)
+    first_month = 3 * ((day.month - 1) // 3) + 1
+    start = day.replace(
+        month=first_month, day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    if first_month == 10:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=first_month + 3)
+
+    return start, end
+
+
+def busy_error(support, event: Event, start: datetime, end: datetime) -> str:
+    """error of the forms when the support has other events overlapping
+    [start, end], else None"""
+
+    if support is None or start is None:
+        return None
+
+    ids = list(
+        Event.objects.filter(support=support)
+        .exclude(id=event.id)
+        .overlapping(start, end)
+        .order_by("start_date")
+        .values_list("id", flat=True)[:listed_conflicts]
+    )
+    if not ids:
+        return None
+
+    events = ", ".join(f"n°{id}" for id in ids)
+    return f"{support} est déjà affecté(e) à l'événement {events} sur ces dates."
+
+
+class IntervalTree:
+    """implicit interval tree : the intervals sorted by start, the middle of
+    each range of the arrays is its node, with the latest end of the range"""
+
+    def __init__(self, intervals: list):
+        """intervals [(start, end, value)], timestamps, end >= start"""
+
+        intervals = sorted(intervals, key=lambda item: item[:2])
+        self.starts = array("d", (start for start, _, _ in intervals))
+        self.ends = array("d", (end for _, end, _ in intervals))
+        self.values = [value for _, _, value in intervals]
+        self.max_ends = array("d", self.ends)
+        self.fill_max_ends(0, len(self.values))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def fill_max_ends(self, lo: int, hi: int) -> float:
+        """latest end of the range, the depth of the recursion is log2(n)"""
+
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        self.max_ends[mid] = max(
+            self.ends[mid], self.fill_max_ends(lo, mid), self.fill_max_ends(mid + 1, hi)
+        )
+        return self.max_ends[mid]
+
+    def overlapping(self, start: float, end: float) -> list:
+        """values of the intervals starting before end and ending after start,
+        an instant overlaps the intervals it is strictly inside"""
+
+        found = []
+        ranges = [(0, len(self))]
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # no interval of the range ends after start
+            if self.max_ends[mid] <= start:
+                continue
+            ranges.append((lo, mid))
+            if self.starts[mid] < end:
+                if self.ends[mid] > start:
+                    found.append(self.values[mid])
+                # the intervals of the right start after the middle one
+                ranges.append((mid + 1, hi))
+
+        return found
+
+
+def interval(event: Event) -> tuple:
+    """(start, end) timestamps of the event"""
+
+    start = event.start_date.timestamp()
+    if event.end_date is None or event.end_date < event.start_date:
+        return start, start
+    return start, event.end_date.timestamp()
+
+
+def support_conflicts(start: datetime, end: datetime, qs: QuerySet = None) -> list:
+    """[(support, [(event, event)])] of the events of the qs overlapping
+    [start, end] whose support has another event on the same dates, by
+    support and start date"""
+
+    if qs is None:
+        qs = Event.objects.all()
+    events = (
+        qs.filter(support__isnull=False, start_date__isnull=False)
+        .overlapping(start, end)
+        .select_related("support", "contract__customer")
+        .order_by("start_date", "id")
+    )
+
+    events_by_support = defaultdict(list)
+    for event in events:
+        events_by_support[event.support].append(event)
+
+    report = []
+    for support, support_events in events_by_support.items():
+        tree = IntervalTree([(*interval(event), event) for event in support_events])
+        # each pair is found from both of its events, listed once
+        pairs = [
+            (event, other)
+            for event in support_events
+            for other in tree.overlapping(*interval(event))
+            if (event.start_date, event.id) < (other.start_date, other.id)
+        ]
+        if pairs:
+            pairs.sort(key=lambda pair: (pair[0].start_date, pair[0].id, pair[1].id))
+            report.append((support, pairs))
+
+    report.sort(key=lambda item: (str(item[0]), item[0].id))
+    return report
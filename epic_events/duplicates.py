@@ -0,0 +1,249 @@
+"""Detection and merge of the duplicate customers.
+
+The commercials create the customers freely and only their email is unique :
+the same person is saved twice, with a typo in the name or another email.
+Comparing every pair of 1M customers is 5e11 comparisons, the customers are
+only compared within the blocks sharing a key :
+
+- the phone, E.164,
+- the company,
+- the phonetic key of the name, see phonetic_key().
+
+The blocks larger than max_block, a company of many customers or a common
+name, are sorted by name and each customer is compared to its window next
+ones. The names and the emails are read once into bit signatures of their
+trigrams : the similarity of a pair is two AND/OR of integers and their
+popcounts, without building strings or sets per pair.
+
+find_duplicates() scores the pairs, stored in DuplicateCustomer by
+store_duplicates() and listed by 'customer/duplicates.html', where
+merge_customers() merges them."""
+
+import re
+import zlib
+from collections import defaultdict
+from itertools import combinations
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models.contract_event import Contract
+from .models.counter import counts, update_counters
+from .models.customer import Customer
+from .models.duplicate import DuplicateCustomer
+from .models.slugs import refresh_dependent_slugs
+
+# blocks compared pair by pair, the larger ones by sorted neighbourhood
+max_block = 50
+window = 10
+# bits of the trigram signatures
+signature_bits = 256
+# pairs stored, see score()
+min_score = 0.8
+# similarity of the names sounding alike
+phonetic_score = 0.9
+
+# applied in order to the letters of a name, 'Philippe' -> 'filip'
+phonetic_rules = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in [
+        (r"ph", "f"),
+        (r"qu", "k"),
+        (r"gu(?=[eiy])", "g"),
+        (r"c(?=[eiy])", "s"),
+        (r"ck|c|q", "k"),
+        (r"w", "v"),
+        (r"z", "s"),
+        (r"y", "i"),
+        (r"h", ""),
+        # silent final letters, 'Dupont' and 'Dupond'
+        (r"(?<=.)[estxd]+$", ""),
+    ]
+]
+
+
+def normalize(text: str) -> str:
+    """'Éric  Dupont' -> 'eric dupont'"""
+
+    return slugify(text or "").replace("-", " ")
+
+
+def phonetic_key(name: str) -> str:
+    """first letter and consonants of the name once the letters sounding alike
+    are replaced, 'Dupond' and 'Dupont' -> 'dpn'"""
+
+    key = re.sub(r"[^a-z]", "", normalize(name))
+    for pattern, replacement in phonetic_rules:
+        key = pattern.sub(replacement, key)
+    if not key:
+        return ""
+
+    return re.sub(r"(.)\1+", r"\1", key[0] + re.sub(r"[aeiou]", "", key[1:]))
+
+
+def signature(text: str) -> int:
+    """bits of the trigrams of the text"""
+
+    padded = f" {text} "
+    bits = 0
+    for start, end in enumerate(range(3, len(padded) + 1)):
+        bits |= 1 << (zlib.crc32(padded[start:end].encode()) % signature_bits)
+
+    return bits
+
+
+def similarity(a: int, b: int) -> float:
+    """Jaccard index of the trigrams of two signatures"""
+
+    union = (a | b).bit_count()
+
+    return (a & b).bit_count() / union if union else 0.0
+
+
+class Customers:
+    """the columns compared, one list per column, read once"""
+
+    fields = ("id", "first_name", "last_name", "email", "phone_e164", "company_id")
+
+    def __init__(self, rows):
+        self.ids = []
+        self.names = []
+        self.first_name_signatures = []
+        self.last_name_signatures = []
+        self.email_signatures = []
+        self.phones = []
+        self.companies = []
+        self.phonetic_keys = []
+
+        for id, first_name, last_name, email, phone, company_id in rows:
+            self.ids.append(id)
+            self.names.append(normalize(f"{last_name} {first_name}"))
+            self.first_name_signatures.append(signature(normalize(first_name)))
+            self.last_name_signatures.append(signature(normalize(last_name)))
+            self.email_signatures.append(signature(email.split("@")[0].lower()))
+            self.phones.append(phone)
+            self.companies.append(company_id)
+            key = f"{phonetic_key(last_name)} {phonetic_key(first_name)}"
+            self.phonetic_keys.append(key if key.strip() else None)
+
+    def blocks(self):
+        """lists of the indexes of the customers sharing a key"""
+
+        for column in [self.phones, self.companies, self.phonetic_keys]:
+            block_keys = defaultdict(list)
+            for i, key in enumerate(column):
+                if key:
+                    block_keys[key].append(i)
+            yield from (block for block in block_keys.values() if len(block) > 1)
+
+    def pairs(self):
+        """(i, j) of the customers to compare, i < j, a pair may be repeated"""
+
+        for block in self.blocks():
+            if len(block) <= max_block:
+                yield from combinations(block, 2)
+                continue
+            # sorted neighbourhood
+            block.sort(key=self.names.__getitem__)
+            for start, i in enumerate(block, 1):
+                end = start + window
+                for j in block[start:end]:
+                    yield (i, j) if i < j else (j, i)
+
+    def score(self, i: int, j: int) -> tuple:
+        """(score, reasons) of a pair : the similarity of the names, the last
+        name weighing most, at least phonetic_score when they sound alike, and
+        of the emails, raised by a shared phone or company. The homonyms are
+        common : the names alone, without a like email, phone or company, stay
+        under min_score."""
+
+        same_phone = bool(self.phones[i]) and self.phones[i] == self.phones[j]
+        same_company = (
+            bool(self.companies[i]) and self.companies[i] == self.companies[j]
+        )
+        same_sound = bool(self.phonetic_keys[i]) and (
+            self.phonetic_keys[i] == self.phonetic_keys[j]
+        )
+
+        names = 0.3 * similarity(
+            self.first_name_signatures[i], self.first_name_signatures[j]
+        ) + 0.7 * similarity(self.last_name_signatures[i], self.last_name_signatures[j])
+        if same_sound:
+            # a typo in a short name shares few trigrams
+            names = max(names, phonetic_score)
+        emails = similarity(self.email_signatures[i], self.email_signatures[j])
+        score = 0.5 * names + 0.5 * emails + 0.4 * same_phone + 0.4 * same_company
+
+        reasons = [
+            reason
+            for reason, shared in [
+                ("téléphone", same_phone),
+                ("entreprise", same_company),
+                ("nom", same_sound),
+            ]
+            if shared
+        ]
+
+        return min(score, 1.0), reasons
+
+
+def find_duplicates(qs=None, threshold: float = min_score, chunk_size=2000) -> list:
+    """[DuplicateCustomer] of the pairs of customers, of the qs, scored at
+    least threshold, unsaved"""
+
+    if qs is None:
+        qs = Customer._base_manager.all()
+    customers = Customers(
+        qs.order_by("pk").values_list(*Customers.fields).iterator(chunk_size=chunk_size)
+    )
+
+    duplicates = {}
+    for i, j in customers.pairs():
+        if (i, j) in duplicates:
+            continue
+        score, reasons = customers.score(i, j)
+        if score >= threshold:
+            duplicates[i, j] = DuplicateCustomer(
+                customer_id=customers.ids[i],
+                duplicate_id=customers.ids[j],
+                score=round(score, 3),
+                reasons=", ".join(reasons),
+            )
+
+    return list(duplicates.values())
+
+
+def store_duplicates(duplicates: list, batch_size: int = 2000) -> int:
+    """replaces the stored pairs"""
+
+    with transaction.atomic():
+        DuplicateCustomer.objects.all().delete()
+        DuplicateCustomer.objects.bulk_create(duplicates, batch_size=batch_size)
+
+    return len(duplicates)
+
+
+def merge_customers(kept: Customer, duplicate: Customer) -> int:
+    """moves the contracts of the duplicate to the kept customer with one
+    UPDATE, fills the empty fields of the kept customer, deletes the duplicate,
+    number of contracts moved"""
+
+    with transaction.atomic():
+        contracts = Contract.objects.filter(customer=duplicate)
+        ids = list(contracts.values_list("id", flat=True))
+        before = counts(contracts=ids)
+        moved = contracts.update(customer=kept)
+        # the UPDATE sends no signal, the counters of both commercials count
+        # the contracts moved
+        update_counters(before, counts(contracts=ids))
+
+        for field in ("phone", "company", "commercial"):
+            if not getattr(kept, field):
+                setattr(kept, field, getattr(duplicate, field))
+        # then the customers, by delete() and save()
+        duplicate.delete()
+        kept.save()
+        # the slugs of the contracts and events moved hold the kept name
+        refresh_dependent_slugs(kept)
+
+    return moved
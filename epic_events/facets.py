@@ -0,0 +1,41 @@
+"""Cache of the filter menus facets.
+
+The cache keys hold a version token : epic_events/signals.py renews it when a
+contract, an event or a customer is saved or deleted, or a collaborator
+deleted, so the stale facets are never read again and expire by themselves.
+The version is read from the cache of the settings, a table shared by the
+processes of the server : the facets cached by a worker are invalidated by
+the writes of the others.
+
+A token is never reused : it is renewed by a single write once the
+transaction is committed, instead of an increment read then written inside
+it, and a token evicted from the cache is replaced by a new one, not by the
+first version of the data."""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+version_key = "facets_version"
+# the version already invalidates the facets, the timeout frees the memory
+timeout = 60 * 60
+
+
+def version(key: str = version_key) -> str:
+    return cache.get_or_set(key, lambda: uuid4().hex, timeout=None)
+
+
+def invalidate(key: str = version_key):
+    """renews the version once the data written is committed : a process
+    reading the facets in between caches them under the old version"""
+
+    transaction.on_commit(lambda: cache.set(key, uuid4().hex, timeout=None))
+
+
+def cached_facets(function, *args) -> dict:
+    """function(*args) result, computed once per version of the data"""
+
+    key = f"facets:{version()}:{function.__name__}:{':'.join(map(str, args))}"
+
+    return cache.get_or_set(key, lambda: function(*args), timeout=timeout)
@@ -0,0 +1,217 @@
+"""Query-string filters of the contract, event and location lists.
+
+'/contracts/?signed=1&paid=0&commercial=42' is parsed into one queryset : the
+parameters are whitelisted, each one filters an indexed column (foreign keys,
+Event().start_date) or a flag evaluated on the rows they select, so any
+combination still runs one single query. Any other parameter is rejected."""
+
+from datetime import datetime, time
+
+from django.db.models import QuerySet
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .gazetteer import gazetteer, near
+
+# handled by views/paginator.py
+reserved_parameters = ("cursor",)
+
+# km around the postal code of a 'near' filter
+default_radius = 20
+max_radius = 200
+
+
+class FilterError(ValueError):
+    """parameter outside the whitelist, repeated or with an invalid value"""
+
+
+def parse_bool(value: str) -> bool:
+    if value in ("1", "true"):
+        return True
+    if value in ("0", "false"):
+        return False
+    raise FilterError(f"'{value}' n'est pas un booléen (1 ou 0)")
+
+
+def parse_id(value: str) -> int | None:
+    """'none' filters the rows without relation"""
+
+    if value == "none":
+        return None
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    raise FilterError(f"'{value}' n'est pas un identifiant")
+
+
+def parse_datetime_value(value: str) -> datetime:
+    """ISO date or datetime, a date is the start of the day"""
+
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise ValueError
+            parsed = datetime.combine(date, time.min)
+    except ValueError:
+        raise FilterError(f"'{value}' n'est pas une date (AAAA-MM-JJ)")
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_postal_code(value: str) -> str:
+    if gazetteer().find(value) is None:
+        raise FilterError(f"'{value}' n'est pas un code postal connu")
+    return value
+
+
+def parse_radius(value: str) -> float:
+    """km, '20' or '2.5'"""
+
+    try:
+        radius = float(value)
+    except ValueError:
+        radius = None
+    if radius is None or not 0 < radius <= max_radius:
+        raise FilterError(f"'{value}' n'est pas un rayon (0 à {max_radius} km)")
+    return radius
+
+
+class FilterSet:
+    """parses the whitelisted parameters and applies them with the
+    filter_<parameter>() methods, in the order of the whitelist"""
+
+    # parameter : parser
+    parameters = {}
+
+    def __init__(self, params: QueryDict, **forced):
+        self.params = params
+        # values set by the url, ex : commercial=id in '/my_contracts/'
+        self.forced = forced
+
+    def clean(self) -> dict:
+        cleaned = {}
+        for name in self.params:
+            if name in reserved_parameters:
+                continue
+            if name not in self.parameters:
+                raise FilterError(f"le filtre '{name}' n'existe pas")
+            values = self.params.getlist(name)
+            if len(values) > 1:
+                raise FilterError(f"le filtre '{name}' est répété")
+            cleaned[name] = self.parameters[name](values[0])
+
+        cleaned.update(self.forced)
+
+        return {name: cleaned[name] for name in self.parameters if name in cleaned}
+
+    def filter(self, qs: QuerySet) -> QuerySet:
+        for name, value in self.clean().items():
+            qs = getattr(self, f"filter_{name}")(qs, value)
+
+        return qs
+
+    def urlencode(self) -> str:
+        """query string of the parameters, without the forced ones and the cursor,
+        used by the filter menus and the paginator links"""
+
+        query = QueryDict(mutable=True)
+        for name in self.parameters:
+            if name in self.params and name not in self.forced:
+                query[name] = self.params[name]
+
+        return query.urlencode()
+
+
+class ContractFilter(FilterSet):
+    parameters = {
+        "commercial": parse_id,
+        "customer": parse_id,
+        "signed": parse_bool,
+        "paid": parse_bool,
+        "ready_for_event": parse_bool,
+    }
+
+    def filter_commercial(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(customer__commercial__isnull=True)
+        return qs.filter(customer__commercial_id=value)
+
+    def filter_customer(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(customer__isnull=True)
+        return qs.filter(customer_id=value)
+
+    def filter_signed(self, qs: QuerySet, value: bool) -> QuerySet:
+        return qs.filter(is_signed=value)
+
+    def filter_paid(self, qs: QuerySet, value: bool) -> QuerySet:
+        return qs.filter(is_paid=value)
+
+    def filter_ready_for_event(self, qs: QuerySet, value: bool) -> QuerySet:
+        qs = qs.with_event_flag()
+        if value:
+            return qs.filter(is_signed=True, has_event=False)
+        return qs.exclude(is_signed=True, has_event=False)
+
+
+class EventFilter(FilterSet):
+    parameters = {
+        "support": parse_id,
+        "commercial": parse_id,
+        "contract": parse_id,
+        "location": parse_id,
+        "start_after": parse_datetime_value,
+        "start_before": parse_datetime_value,
+    }
+
+    def filter_support(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(support__isnull=True)
+        return qs.filter(support_id=value)
+
+    def filter_commercial(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(contract__customer__commercial__isnull=True)
+        return qs.filter(contract__customer__commercial_id=value)
+
+    def filter_contract(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(contract__isnull=True)
+        return qs.filter(contract_id=value)
+
+    def filter_location(self, qs: QuerySet, value: int | None) -> QuerySet:
+        if value is None:
+            return qs.filter(location__isnull=True)
+        return qs.filter(location_id=value)
+
+    def filter_start_after(self, qs: QuerySet, value: datetime) -> QuerySet:
+        return qs.filter(start_date__gte=value)
+
+    def filter_start_before(self, qs: QuerySet, value: datetime) -> QuerySet:
+        return qs.filter(start_date__lt=value)
+
+
+class LocationFilter(FilterSet):
+    """'?near=69003&radius=20' : the locations at most 20 km away"""
+
+    parameters = {"near": parse_postal_code, "radius": parse_radius}
+
+    def clean(self) -> dict:
+        """the radius is applied by filter_near()"""
+
+        cleaned = super().clean()
+        radius = cleaned.pop("radius", None)
+        if "near" in cleaned:
+            cleaned["near"] = (cleaned["near"], radius or default_radius)
+        elif radius is not None:
+            raise FilterError("le filtre 'radius' accompagne le filtre 'near'")
+
+        return cleaned
+
+    def filter_near(self, qs: QuerySet, value: tuple) -> QuerySet:
+        code, radius = value
+        return near(qs, code, radius)
@@ -1,6 +1,7 @@
 from django import forms
 from django.forms import DateTimeInput, Textarea
 
+from ..conflicts import busy_error
 from ..models.collaborator import Collaborator
 from ..models.contract_event import Event
 
@@ -19,6 +20,20 @@ class ChangeSupportForm(forms.ModelForm):
 
         self.fields["support"].queryset = supports
 
+    def clean(self):
+        cleaned_data = super().clean()
+        error = busy_error(
+            cleaned_data.get("support"),
+            self.instance,
+            self.instance.start_date,
+            self.instance.end_date,
+        )
+
+        if error:
+            self.add_error("support", forms.ValidationError(error))
+
+        return cleaned_data
+
 
 class EventForm(forms.ModelForm):
     """used by a Manager to CRUD a customer Contract()
@@ -48,5 +63,12 @@ class EventForm(forms.ModelForm):
                     "La date de fin doit avoir lieu après la date début."
                 ),
             )
+        else:
+            # the support of the event stays available on the new dates
+            error = busy_error(
+                self.instance.support, self.instance, start_date, end_date
+            )
+            if error:
+                self.add_error("start_date", forms.ValidationError(error))
 
         return cleaned_data
@@ -8,8 +8,12 @@ class SearchForm(forms.Form):
     )
 
     def __init__(self, *args, **kwargs):
-        """allow to change the search.placeholder in view"""
+        """allow to change the search.placeholder in view, the title lists the
+        qualifiers of the query, see epic_events/queries.py"""
 
         placeholder = kwargs.pop("placeholder", "Rechercher")
+        title = kwargs.pop("title", "")
         super(SearchForm, self).__init__(*args, **kwargs)
         self.fields["search"].widget.attrs["placeholder"] = placeholder
+        if title:
+            self.fields["search"].widget.attrs["title"] = title
@@ -0,0 +1,268 @@
+"""Offline gazetteer of the French postal codes, and the locations near a
+postal code.
+
+data/postal_codes.csv holds the centroid of each postal code : the town halls
+of its communes, weighted by their population. A town hall located more than
+2 km outside the outline of its commune is replaced by the centroid of the
+outline. Sources : base officielle des codes postaux (La Poste, INSEE),
+localisation des mairies (annuaire de l'administration, DILA) and contours des
+communes (ADMIN EXPRESS, IGN), Licence Ouverte 2.0.
+
+The table is read once per process into arrays, sorted by code, with a
+KD-tree of the centroids on the unit sphere : the distances are great-circle
+ones, the overseas codes included. A location is placed at the centroid of its
+postal code, the locations near a point are the ones of the postal codes near
+it, read through the index of Location.zip : the tree holds 6,000 codes
+whatever the number of locations, and is never updated."""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from functools import cache
+from math import asin, cos, pi, radians, sin
+from pathlib import Path
+
+from django.db.models import Count, QuerySet
+
+from .models.location import Location
+
+data_path = Path(__file__).parent / "data" / "postal_codes.csv"
+earth_radius = 6371.0
+# locations listed by nearby_locations()
+max_results = 50
+
+
+def unit_vector(latitude: float, longitude: float) -> tuple:
+    latitude, longitude = radians(latitude), radians(longitude)
+
+    return (
+        cos(latitude) * cos(longitude),
+        cos(latitude) * sin(longitude),
+        sin(latitude),
+    )
+
+
+def chord(distance: float) -> float:
+    """straight line between two points of the sphere distance km apart"""
+
+    return 2 * sin(min(distance / earth_radius, pi) / 2)
+
+
+def arc(chord_length: float) -> float:
+    """km along the sphere between two points chord_length apart"""
+
+    return 2 * earth_radius * asin(min(chord_length / 2, 1.0))
+
+
+class KDTree:
+    """implicit KD-tree of points : the middle of each range of the arrays is
+    its node, the range is split on the axis of its depth"""
+
+    def __init__(self, points: list):
+        """points [(x, y, z, value)]"""
+
+        points = list(points)
+        ranges = [(0, len(points), 0)]
+        while ranges:
+            lo, hi, depth = ranges.pop()
+            if hi - lo < 2:
+                continue
+            axis = depth % 3
+            points[lo:hi] = sorted(points[lo:hi], key=lambda point: point[axis])
+            mid = (lo + hi) // 2
+            ranges.extend([(lo, mid, depth + 1), (mid + 1, hi, depth + 1)])
+
+        self.axes = tuple(
+            array("d", (point[axis] for point in points)) for axis in range(3)
+        )
+        self.values = array("I", (point[3] for point in points))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def distance2(self, point: tuple, i: int) -> float:
+        x, y, z = self.axes
+        return (point[0] - x[i]) ** 2 + (point[1] - y[i]) ** 2 + (point[2] - z[i]) ** 2
+
+    def within(self, point: tuple, radius: float) -> list:
+        """[(squared distance, value)] of the points at most radius away"""
+
+        radius2 = radius * radius
+        found = []
+        ranges = [(0, len(self), 0)]
+        while ranges:
+            lo, hi, depth = ranges.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            distance2 = self.distance2(point, mid)
+            if distance2 <= radius2:
+                found.append((distance2, self.values[mid]))
+            difference = point[depth % 3] - self.axes[depth % 3][mid]
+            ranges.append(
+                (lo, mid, depth + 1) if difference < 0 else (mid + 1, hi, depth + 1)
+            )
+            # the other side holds points within radius when the plane does
+            if difference * difference <= radius2:
+                ranges.append(
+                    (mid + 1, hi, depth + 1) if difference < 0 else (lo, mid, depth + 1)
+                )
+
+        return found
+
+    def nearest(self, point: tuple, k: int) -> list:
+        """[(squared distance, value)] of the k nearest points"""
+
+        # max-heap of the k nearest points found, by negative distance
+        heap = []
+        # (squared distance to the plane of the range, range)
+        ranges = [(0.0, 0, len(self), 0)]
+        while ranges:
+            bound, lo, hi, depth = ranges.pop()
+            if lo >= hi or (len(heap) == k and bound > -heap[0][0]):
+                continue
+            mid = (lo + hi) // 2
+            distance2 = self.distance2(point, mid)
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance2, self.values[mid]))
+            elif distance2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance2, self.values[mid]))
+            difference = point[depth % 3] - self.axes[depth % 3][mid]
+            near, far = (lo, mid), (mid + 1, hi)
+            if difference >= 0:
+                near, far = far, near
+            # the near side is read first
+            ranges.append((difference * difference, *far, depth + 1))
+            ranges.append((bound, *near, depth + 1))
+
+        return sorted((-distance2, value) for distance2, value in heap)
+
+
+class Gazetteer:
+    """centroids of the postal codes, in arrays sorted by code"""
+
+    def __init__(self, lines):
+        rows = sorted(line.strip().split(",") for line in lines if line.strip())
+        self.codes = array("I", (int(code) for code, _, _ in rows))
+        self.latitudes = array("f", (float(latitude) for _, latitude, _ in rows))
+        self.longitudes = array("f", (float(longitude) for _, _, longitude in rows))
+        self.tree = KDTree(
+            (*unit_vector(self.latitudes[i], self.longitudes[i]), i)
+            for i in range(len(self.codes))
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def find(self, code: str) -> int:
+        """position of the code, None when it is unknown"""
+
+        if not (len(code) == 5 and code.isdigit()):
+            return None
+        i = bisect_left(self.codes, int(code))
+        if i < len(self.codes) and self.codes[i] == int(code):
+            return i
+        return None
+
+    def coordinates(self, code: str) -> tuple:
+        """(latitude, longitude) of the code, None when it is unknown"""
+
+        i = self.find(code)
+        if i is None:
+            return None
+        return (round(self.latitudes[i], 4), round(self.longitudes[i], 4))
+
+    def point(self, code: str) -> tuple:
+        i = self.find(code)
+        return unit_vector(self.latitudes[i], self.longitudes[i])
+
+    def distances(self, found: list) -> list:
+        """[(km, code)] of the [(squared chord, position)] found by the tree"""
+
+        return [(arc(distance2**0.5), f"{self.codes[i]:05d}") for distance2, i in found]
+
+    def within(self, code: str, radius: float) -> list:
+        """[(km, code)] of the codes at most radius km away from the code,
+        nearest first"""
+
+        found = self.tree.within(self.point(code), chord(radius))
+
+        return self.distances(sorted(found))
+
+    def nearest(self, code: str, k: int) -> list:
+        """[(km, code)] of the k codes nearest to the code, itself included"""
+
+        return self.distances(self.tree.nearest(self.point(code), k))
+
+
+@cache
+def gazetteer() -> Gazetteer:
+    """read once per process, in about 50 ms"""
+
+    with open(data_path, encoding="utf-8") as file:
+        next(file)
+        return Gazetteer(file)
+
+
+def closest_locations(neighbours: list, qs: QuerySet, limit: int) -> list:
+    """[(location, km)] of the limit first locations of the postal codes
+    [(km, code)], nearest first : the locations of each code are counted
+    through the index of Location.zip, then the ones of the codes needed are
+    read"""
+
+    counts = dict(
+        qs.filter(zip__in=[code for _, code in neighbours])
+        .order_by()
+        .values_list("zip")
+        .annotate(Count("id"))
+    )
+    distances = {}
+    total = 0
+    for distance, code in neighbours:
+        if total >= limit:
+            break
+        if code in counts:
+            distances[code] = distance
+            total += counts[code]
+
+    locations = qs.filter(zip__in=list(distances))
+    located = sorted(
+        ((location, distances[location.zip]) for location in locations),
+        key=lambda pair: (pair[1], pair[0].id),
+    )
+
+    return located[:limit]
+
+
+def nearby_locations(
+    code: str, radius: float = None, k: int = None, qs: QuerySet = None
+) -> list:
+    """[(location, km)] of the locations of the qs at most radius km away from
+    the postal code, or of the k nearest ones, nearest first, max_results at
+    most"""
+
+    if qs is None:
+        qs = Location.objects.all()
+    places = gazetteer()
+    limit = min(k or max_results, max_results)
+    if radius is not None:
+        neighbours = places.within(code, radius)
+
+    # the nearest locations are among the codes nearest to the code, more
+    # codes are read while they hold fewer locations
+    codes = limit
+    while True:
+        if radius is None:
+            batch = places.nearest(code, codes)
+        else:
+            batch = neighbours[:codes]
+        located = closest_locations(batch, qs, limit)
+        if len(located) >= limit or len(batch) < codes:
+            return located
+        codes *= 4
+
+
+def near(qs: QuerySet, code: str, radius: float) -> QuerySet:
+    """locations of the qs at most radius km away from the postal code"""
+
+    return qs.filter(zip__in=[code for _, code in gazetteer().within(code, radius)])
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils.text import slugify
+
+from epic_events.models import Collaborator, Customer, Location
+from epic_events.models.slugs import chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Stores the formatted phones, the display addresses and the normalized "
+        "cities of the rows saved before them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="rows streamed and written per chunk",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="rebuilds the columns of every row, not only the empty ones",
+        )
+
+    def backfill(self, qs, fields: list, build, chunk_size: int) -> int:
+        """streams the rows of the qs and writes the fields returned by build(obj)"""
+
+        backfilled = 0
+        rows = qs.order_by("pk").iterator(chunk_size=chunk_size)
+        for chunk in chunks(rows, chunk_size):
+            for obj in chunk:
+                values = build(obj)
+                for field, value in zip(fields, values):
+                    setattr(obj, field, value)
+            qs.model._base_manager.bulk_update(chunk, fields, batch_size=chunk_size)
+            backfilled += len(chunk)
+
+        return backfilled
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        for model in [Collaborator, Customer]:
+            qs = model._base_manager.only("id", "phone")
+            if not options["all"]:
+                qs = qs.filter(phone__isnull=False, phone_international__isnull=True)
+            backfilled = self.backfill(
+                qs,
+                ["phone_international", "phone_e164"],
+                lambda obj: obj.build_phones(),
+                chunk_size,
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model.plural_name()} : {backfilled} phones stored"
+                )
+            )
+
+        qs = Location._base_manager.all()
+        if not options["all"]:
+            qs = qs.filter(Q(address__isnull=True) | Q(city_slug__isnull=True))
+        backfilled = self.backfill(
+            qs,
+            ["address", "city_slug"],
+            lambda obj: [obj.build_address(), slugify(obj.city)],
+            chunk_size,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"locations : {backfilled} addresses stored")
+        )
@@ -0,0 +1,36 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from epic_events.duplicates import find_duplicates, min_score, store_duplicates
+
+
+class Command(BaseCommand):
+    help = "Stores the pairs of customers likely to be the same person, listed in '/customers/duplicates/'"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-score",
+            type=float,
+            default=min_score,
+            help="score of the pairs stored, from 0 to 1",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="rows streamed and written per chunk",
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        duplicates = find_duplicates(
+            threshold=options["min_score"], chunk_size=options["chunk_size"]
+        )
+        stored = store_duplicates(duplicates, batch_size=options["chunk_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"customers : {stored} duplicate pairs stored in {perf_counter() - start:.1f}s"
+            )
+        )
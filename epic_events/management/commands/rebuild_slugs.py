@@ -0,0 +1,80 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+
+from epic_events.models.slugs import (
+    build_chunk,
+    built_slugs,
+    chunks,
+    slug_fields,
+    slug_models,
+    write_slugs,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the stale search slugs of every table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="rows streamed and built per chunk",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="processes building the slugs, 1 builds them in this process",
+        )
+
+    def rebuild(self, model, chunk_size: int, workers: int, executor) -> int:
+        """streams the rows, builds their slugs in the pool, at most 2 chunks per
+        worker in flight, and writes the stale ones"""
+
+        rows = (
+            model._base_manager.order_by("pk")
+            .values(*slug_fields(model))
+            .iterator(chunk_size=chunk_size)
+        )
+
+        if executor is None:
+            return sum(
+                write_slugs(model, built_slugs(model, chunk))
+                for chunk in chunks(rows, chunk_size)
+            )
+
+        rebuilt = 0
+        pending = deque()
+        for chunk in chunks(rows, chunk_size):
+            pending.append(executor.submit(build_chunk, model._meta.label, chunk))
+            if len(pending) >= 2 * workers:
+                rebuilt += write_slugs(model, pending.popleft().result())
+        while pending:
+            rebuilt += write_slugs(model, pending.popleft().result())
+
+        return rebuilt
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        workers = options["workers"]
+
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(workers, initializer=django.setup)
+
+        try:
+            for model in slug_models():
+                rebuilt = self.rebuild(model, chunk_size, workers, executor)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{model.plural_name()} : {rebuilt} slugs rebuilt"
+                    )
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from epic_events.models import Contract, Counter, Customer, Event
+from epic_events.models.counter import refresh_counters
+
+
+class Command(BaseCommand):
+    help = "Recomputes the dashboard counters and deletes the orphan ones"
+
+    def collaborator_ids(self) -> set:
+        """commercials of customers and contracts, supports of events"""
+
+        ids = set(Customer.objects.values_list("commercial_id", flat=True))
+        ids |= set(Contract.objects.values_list("customer__commercial_id", flat=True))
+        ids |= set(Event.objects.values_list("support_id", flat=True))
+
+        return ids - {None}
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            before = {
+                counter.scope: [getattr(counter, field) for field in Counter.fields]
+                for counter in Counter.objects.all()
+            }
+
+            counters = refresh_counters(self.collaborator_ids())
+            scopes = [counter.scope for counter in counters]
+            deleted, _ = Counter.objects.exclude(scope__in=scopes).delete()
+
+        drifted = [
+            counter.scope
+            for counter in counters
+            if before.get(counter.scope)
+            != [getattr(counter, field) for field in Counter.fields]
+        ]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(counters)} counters reconciled, {len(drifted)} drifted, "
+                f"{deleted} orphans deleted"
+            )
+        )
+        for scope in drifted:
+            self.stdout.write(f"  {scope}")
@@ -0,0 +1,75 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from epic_events.reminders import (
+    LogSink,
+    Scheduler,
+    poll_interval,
+    reminder_delay,
+    sinks,
+)
+
+
+class Command(BaseCommand):
+    help = "Sends the reminders of the events to their support, until interrupted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sink",
+            choices=sorted(sinks),
+            default="mail",
+            help="mail : EMAIL_BACKEND of the settings, log : lines of --log-file",
+        )
+        parser.add_argument(
+            "--log-file",
+            default="reminders.log",
+            help="file of the log sink",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=reminder_delay.total_seconds() / 3600,
+            help="hours between the reminder and the start of the event",
+        )
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=poll_interval,
+            help="seconds between two reads of the saved events",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="sends the reminders due and exits",
+        )
+
+    def handle(self, *args, **options):
+        if options["poll"] <= 0:
+            raise CommandError("--poll must be positive")
+        if options["sink"] == "log":
+            sink = LogSink(options["log_file"])
+        else:
+            sink = sinks[options["sink"]]()
+        scheduler = Scheduler(
+            sink, delay=timedelta(hours=options["delay"]), poll=options["poll"]
+        )
+
+        try:
+            while True:
+                # the connection of a long-running process may have been closed
+                close_old_connections()
+                sent = scheduler.run_once()
+                if sent or options["once"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"events : {sent} reminders sent, {len(scheduler)} scheduled"
+                        )
+                    )
+                if options["once"]:
+                    return
+                time.sleep(scheduler.sleep_time())
+        except KeyboardInterrupt:
+            self.stdout.write("reminders stopped")
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:05
+
+import epic_events.models.collaborator
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('epic_events', '0016_alter_collaborator_birthdate'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='collaborator',
+            managers=[
+                ('objects', epic_events.models.collaborator.CollaboratorManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def detach_duplicate_events(apps, schema_editor):
+    """a contract may hold several events, nothing forbade it : its oldest
+    event stays attached, the next ones are detached from the contract instead
+    of failing the unique index, their ids are printed to be reviewed"""
+
+    Event = apps.get_model("epic_events", "Event")
+
+    older = Event.objects.filter(
+        contract_id=OuterRef("contract_id"), id__lt=OuterRef("id")
+    )
+    duplicates = Event.objects.filter(contract__isnull=False).filter(Exists(older))
+    ids = list(duplicates.values_list("id", flat=True))
+    if ids:
+        Event.objects.filter(id__in=ids).update(contract=None)
+        print(f"\n  {len(ids)} events detached from their contract : {ids}")
+
+
+class Migration(migrations.Migration):
+    # the events are detached in their own transaction : PostgreSQL refuses
+    # to ALTER a table with pending foreign key checks
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0017_collaborator_managers"),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_duplicate_events, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="event",
+            name="contract",
+            field=models.OneToOneField(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="epic_events.contract",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0018_event_contract_one_to_one"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="start_date",
+            field=models.DateTimeField(
+                blank=True, db_index=True, null=True, verbose_name="Date de début"
+            ),
+        ),
+    ]
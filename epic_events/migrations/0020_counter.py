@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0019_event_start_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=64, unique=True)),
+                ("customers", models.PositiveIntegerField(default=0)),
+                ("contracts", models.PositiveIntegerField(default=0)),
+                ("unsigned_contracts", models.PositiveIntegerField(default=0)),
+                ("unpaid_contracts", models.PositiveIntegerField(default=0)),
+                ("contracts_ready_for_event", models.PositiveIntegerField(default=0)),
+                ("events", models.PositiveIntegerField(default=0)),
+                ("events_without_support", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("epic_events", "0020_counter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="collaborator",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="collaborator_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="company_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="contract_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="customer_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="department_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="event_edition_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["-edition_time", "-id"], name="location_edition_idx"
+            ),
+        ),
+    ]
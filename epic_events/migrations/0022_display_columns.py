@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-17 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0021_edition_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="collaborator",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True, editable=False, max_length=16, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="collaborator",
+            name="phone_international",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True, editable=False, max_length=16, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="phone_international",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="address",
+            field=models.CharField(
+                blank=True, editable=False, max_length=512, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def merge_duplicates(apps, schema_editor):
+    """fills the normalized keys and merges the rows sharing one, the references
+    are moved to the oldest row"""
+
+    for model_name, key, references in [
+        ("Department", lambda obj: slugify(obj.name), [("Collaborator", "department")]),
+        ("Company", lambda obj: slugify(obj.name), [("Customer", "company")]),
+        ("Location", lambda obj: obj.slug_form, [("Event", "location")]),
+    ]:
+        model = apps.get_model("epic_events", model_name)
+
+        kept = {}
+        for obj in model.objects.order_by("id"):
+            obj.slug_form = key(obj)
+            if obj.slug_form is None:
+                continue
+            if obj.slug_form not in kept:
+                kept[obj.slug_form] = obj.id
+                model.objects.filter(id=obj.id).update(slug_form=obj.slug_form)
+                continue
+
+            for reference_name, field in references:
+                apps.get_model("epic_events", reference_name).objects.filter(
+                    **{field: obj.id}
+                ).update(**{field: kept[obj.slug_form]})
+            obj.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0022_display_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="slug_form",
+            field=models.SlugField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="slug_form",
+            field=models.SlugField(max_length=255, null=True),
+        ),
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+    ]
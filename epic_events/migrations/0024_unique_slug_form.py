@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """apart from 0023_slug_form_keys : PostgreSQL cannot alter the tables updated
+    earlier in the same transaction"""
+
+    dependencies = [
+        ("epic_events", "0023_slug_form_keys"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="company",
+            name="slug_form",
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="department",
+            name="slug_form",
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="location",
+            name="slug_form",
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,169 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import epic_events.models.indexes
+from epic_events.operations import AddIndexOnline, RemoveIndexOnline
+
+
+class Migration(migrations.Migration):
+    """indexes of the filtered lists, built without locking the tables : the new
+    indexes are live before the ones they replace are dropped"""
+
+    # CREATE / DROP INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0024_unique_slug_form"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="collaborator",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="collaborator_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="company",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="company_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="contract_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["customer", "-edition_time", "-id"],
+                name="contract_customer_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["is_signed", "-edition_time", "-id"],
+                name="contract_signed_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="customer",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="customer_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="customer",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["commercial", "-edition_time", "-id"],
+                name="customer_commercial_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="department",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="department_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="event",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="event_list_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="event",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["support", "-edition_time", "-id"],
+                name="event_support_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="event",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["location", "-edition_time", "-id"],
+                name="event_location_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="location",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["-edition_time", "-id"], name="location_list_idx"
+            ),
+        ),
+        # the foreign key indexes are the prefixes of the list indexes
+        migrations.AlterField(
+            model_name="contract",
+            name="customer",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="epic_events.customer",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="commercial",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="commercial",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="event",
+            name="location",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="epic_events.location",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="event",
+            name="support",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        RemoveIndexOnline(
+            model_name="collaborator",
+            name="collaborator_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="company",
+            name="company_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="contract",
+            name="contract_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="customer",
+            name="customer_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="department",
+            name="department_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="event",
+            name="event_edition_idx",
+        ),
+        RemoveIndexOnline(
+            model_name="location",
+            name="location_edition_idx",
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def store_is_paid(apps, schema_editor):
+    """fills is_paid, the amounts paid above the total, saved before the
+    validation of ContractForm, are brought back to the total"""
+
+    Contract = apps.get_model("epic_events", "Contract")
+    Contract.objects.filter(amount_paid__gt=F("total_amount")).update(
+        amount_paid=F("total_amount")
+    )
+    Contract.objects.filter(amount_paid=F("total_amount")).update(is_paid=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0025_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contract",
+            name="is_paid",
+            field=models.BooleanField(
+                default=False, editable=False, verbose_name="Payé"
+            ),
+        ),
+        migrations.RunPython(store_is_paid, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations, models
+
+import epic_events.models.indexes
+from epic_events.operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+    """apart from 0026_contract_is_paid : PostgreSQL cannot alter the table
+    updated earlier in the same transaction"""
+
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0026_contract_is_paid"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="contract",
+            constraint=models.CheckConstraint(
+                check=models.Q(("amount_paid__lte", models.F("total_amount"))),
+                name="contract_amount_paid_lte_total",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contract",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(
+                        ("amount_paid", models.F("total_amount")), ("is_paid", True)
+                    ),
+                    models.Q(
+                        ("amount_paid__lt", models.F("total_amount")),
+                        ("is_paid", False),
+                    ),
+                    _connector="OR",
+                ),
+                name="contract_is_paid_stored",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                fields=["is_paid", "-edition_time", "-id"],
+                name="contract_paid_list_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                condition=models.Q(("is_paid", False), ("is_signed", True)),
+                fields=["-edition_time", "-id"],
+                name="contract_signed_unpaid_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="contract",
+            index=epic_events.models.indexes.ListIndex(
+                condition=models.Q(("is_paid", False), ("is_signed", False)),
+                fields=["-edition_time", "-id"],
+                name="contract_unsigned_unpaid_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+tables = [
+    "epic_events_collaborator",
+    "epic_events_department",
+    "epic_events_company",
+    "epic_events_customer",
+    "epic_events_contract",
+    "epic_events_location",
+    "epic_events_event",
+]
+
+
+def sqlite_statements(table: str) -> list:
+    """FTS5 trigram index of the slugs of the table, kept in sync by triggers,
+    see epic_events/search.py"""
+
+    search = f"{table}_search"
+    insert = f"INSERT INTO {search}(rowid, slug) VALUES (new.id, new.slug);"
+    delete = (
+        f"INSERT INTO {search}({search}, rowid, slug) "
+        f"VALUES ('delete', old.id, old.slug);"
+    )
+
+    return [
+        f"CREATE VIRTUAL TABLE {search} USING fts5(slug, content='{table}', "
+        f"content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {search}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER {search}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER {search}_update AFTER UPDATE OF slug ON {table} "
+        f"BEGIN {delete} {insert} END",
+        f"INSERT INTO {search}({search}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for table in tables:
+            for statement in sqlite_statements(table):
+                schema_editor.execute(statement)
+    elif schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table in tables:
+            schema_editor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_slug_trgm_idx "
+                f"ON {table} USING gin (slug gin_trgm_ops)"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for table in tables:
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_search")
+            for trigger in ["insert", "delete", "update"]:
+                schema_editor.execute(
+                    f"DROP TRIGGER IF EXISTS {table}_search_{trigger}"
+                )
+    elif schema_editor.connection.vendor == "postgresql":
+        for table in tables:
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {table}_slug_trgm_idx"
+            )
+
+
+class Migration(migrations.Migration):
+    """text index of the slugs, outside of the model state : FTS5 tables on
+    SQLite, trigram GIN indexes on PostgreSQL"""
+
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0027_contract_payment_constraints"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
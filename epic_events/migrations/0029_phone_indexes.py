@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+from epic_events.operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0028_search_index"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="collaborator",
+            index=models.Index(fields=["phone_e164"], name="collaborator_phone_idx"),
+        ),
+        AddIndexOnline(
+            model_name="customer",
+            index=models.Index(fields=["phone_e164"], name="customer_phone_idx"),
+        ),
+    ]
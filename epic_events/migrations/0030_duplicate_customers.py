@@ -0,0 +1,58 @@
+# Generated by Django 5.0.14 on 2026-10-17 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0029_phone_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateCustomer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("reasons", models.CharField(blank=True, max_length=128)),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="epic_events.customer",
+                    ),
+                ),
+                (
+                    "duplicate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="epic_events.customer",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["-score", "id"], name="duplicate_score_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="duplicatecustomer",
+            constraint=models.UniqueConstraint(
+                fields=("customer", "duplicate"), name="duplicate_customer_pair"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+from epic_events.operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0030_duplicate_customers"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="location",
+            index=models.Index(fields=["zip"], name="location_zip_idx"),
+        ),
+    ]
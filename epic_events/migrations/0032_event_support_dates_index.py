@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+from epic_events.operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0031_location_zip_index"),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name="event",
+            index=models.Index(
+                fields=["support", "start_date", "end_date"],
+                name="event_support_dates_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("epic_events", "0032_event_support_dates_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="reminded_start",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+    ]
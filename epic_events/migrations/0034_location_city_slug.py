@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-17 14:55
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+from epic_events.operations import AddIndexOnline
+
+
+def store_city_slugs(apps, schema_editor):
+    """the normalized city of the existing locations, filtered by the
+    'city:lyon' qualifier"""
+
+    Location = apps.get_model("epic_events", "Location")
+
+    locations = list(Location.objects.only("id", "city"))
+    for location in locations:
+        location.city_slug = slugify(location.city)
+    Location.objects.bulk_update(locations, ["city_slug"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("epic_events", "0033_event_reminded_start"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="city_slug",
+            field=models.SlugField(
+                blank=True, db_index=False, editable=False, max_length=100, null=True
+            ),
+        ),
+        migrations.RunPython(store_city_slugs, migrations.RunPython.noop),
+        AddIndexOnline(
+            model_name="location",
+            index=models.Index(fields=["city_slug"], name="location_city_slug_idx"),
+        ),
+    ]
@@ -1,8 +1,22 @@
 from .collaborator import Collaborator
 from .company import Company
 from .contract_event import Contract, Event
+from .counter import Counter
 from .customer import Customer
+from .deletion import Deletion
 from .department import Department
+from .duplicate import DuplicateCustomer
 from .location import Location
 
-[Collaborator, Department, Company, Customer, Contract, Location, Event]
+[
+    Collaborator,
+    Department,
+    Company,
+    Customer,
+    Contract,
+    Location,
+    Event,
+    Counter,
+    DuplicateCustomer,
+    Deletion,
+]
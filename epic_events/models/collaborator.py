@@ -1,9 +1,39 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models import OuterRef
+from django.utils.text import slugify
 
+from .counter import Counter, refreshes_counters, scope_name
 from .department import Department
 from .mixins import UserMixin
 from .str_template import unfilled
+from .subqueries import SubqueryCount
+
+
+class CollaboratorQuerySet(models.QuerySet):
+    def for_list(self) -> models.QuerySet:
+        """joins the relations displayed in 'collaborator/list.html'"""
+
+        return self.select_related("department")
+
+    def with_stats(self) -> models.QuerySet:
+        """annotates the aggregates displayed in 'collaborator/detail.html' :
+        the customers and contracts of a commercial, the events of a support"""
+
+        from .contract_event import contract_stats, event_stats
+        from .customer import Customer
+
+        return self.select_related("department").annotate(
+            customers_count=SubqueryCount(
+                Customer.objects.filter(commercial=OuterRef("pk"))
+            ),
+            **contract_stats(customer__commercial=OuterRef("pk")),
+            **event_stats(support=OuterRef("pk")),
+        )
+
+
+class CollaboratorManager(UserManager.from_queryset(CollaboratorQuerySet)):
+    pass
 
 
 class Collaborator(UserMixin, AbstractUser):
@@ -22,6 +52,14 @@ class Collaborator(UserMixin, AbstractUser):
     USERNAME_FIELD = "email"
     username = date_joined = None
 
+    objects = CollaboratorManager()
+
+    slug_lookups = ("department__name",)
+
+    # rows counted by the counters changed by a delete : its events lose their
+    # support, SET_NULL
+    counter_lookups = (("events", "event__id"),)
+
     @property
     def str_id(self) -> str:
         if self.id:
@@ -40,6 +78,9 @@ class Collaborator(UserMixin, AbstractUser):
             return f"{self.role} {self.first_name.capitalize()}"
         return f"{self.role} {unfilled}"
 
+    def slug_foreign_key(self, values: dict) -> str:
+        return slugify(values["department__name"] or unfilled)
+
     @classmethod
     def french_name(self) -> str:
         """used in flash messages"""
@@ -51,3 +92,12 @@ class Collaborator(UserMixin, AbstractUser):
         """used as title in template 'list'"""
 
         return f"{self.french_name()}s"
+
+    @refreshes_counters
+    def delete(self, *args, **kwargs):
+        id = self.id
+        result = super().delete(*args, **kwargs)
+        # its counters count no row anymore
+        Counter.objects.filter(scope=scope_name(id)).delete()
+
+        return result
@@ -1,9 +1,31 @@
+from django.db import models
+from django.db.models import OuterRef
+
 from .mixins import NameFieldMixin
+from .subqueries import SubqueryCount
+
+
+class CompanyQuerySet(models.QuerySet):
+    def with_stats(self) -> models.QuerySet:
+        """annotates the aggregates displayed in 'company/detail.html'"""
+
+        from .contract_event import contract_stats, event_stats
+        from .customer import Customer
+
+        return self.annotate(
+            customers_count=SubqueryCount(
+                Customer.objects.filter(company=OuterRef("pk"))
+            ),
+            **contract_stats(customer__company=OuterRef("pk")),
+            **event_stats(contract__customer__company=OuterRef("pk")),
+        )
 
 
 class Company(NameFieldMixin):
     """customers companies CRUD by commercials"""
 
+    objects = CompanyQuerySet.as_manager()
+
     @classmethod
     def french_name(self) -> str:
         """used in flash messages"""
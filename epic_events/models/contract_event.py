@@ -1,30 +1,100 @@
 from django.db import models
-from django.db.models import F, Q
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
 
 from .collaborator import Collaborator
+from .counter import refreshes_counters
 from .customer import Customer
+from .indexes import ListIndex, list_index
 from .location import Location
-from .mixins import TimeFieldMixin
-from .str_template import no, unfilled, yes
+from .mixins import RowQuerySetMixin, TimeFieldMixin
+from .rows import ContractRowIterable, EventRowIterable, user_name
+from .str_template import formatted_bool, formatted_number, unfilled
+from .subqueries import SubqueryCount, SubqueryMin, SubquerySum
+
+
+class ContractQuerySet(RowQuerySetMixin, models.QuerySet):
+    row_iterable = ContractRowIterable
+
+    def for_list(self) -> models.QuerySet:
+        """joins the relations displayed in 'contract/list.html'"""
+
+        return self.select_related("customer__commercial__department")
+
+    def with_event_flag(self) -> models.QuerySet:
+        """annotates has_event, read by Contract().is_ready_for_event"""
+
+        return self.annotate(
+            has_event=Exists(Event.objects.filter(contract=OuterRef("pk")))
+        )
+
+    def for_rows(self) -> models.QuerySet:
+        return self.with_event_flag()
 
 
 class Contract(TimeFieldMixin):
-    customer = models.ForeignKey(to=Customer, on_delete=models.CASCADE, null=True)
+    # indexed by contract_customer_list_idx
+    customer = models.ForeignKey(
+        to=Customer, on_delete=models.CASCADE, null=True, db_index=False
+    )
     total_amount = models.PositiveIntegerField(
         default=0, verbose_name="Montant total €"
     )
     amount_paid = models.PositiveIntegerField(default=0, verbose_name="Montant payé €")
     is_signed = models.BooleanField(default=False, verbose_name="Signé")
-
-    @property
-    def is_paid(self) -> bool:
-        return self.total_amount - self.amount_paid == 0
+    # amount_paid == total_amount, stored by compute_columns()
+    is_paid = models.BooleanField(default=False, editable=False, verbose_name="Payé")
+
+    class Meta(TimeFieldMixin.Meta):
+        # the filters of '/contracts/', in the order of the list
+        indexes = TimeFieldMixin.Meta.indexes + [
+            list_index("customer", name="contract_customer_list_idx"),
+            list_index("is_signed", name="contract_signed_list_idx"),
+            list_index("is_paid", name="contract_paid_list_idx"),
+            # the contracts left to cash, '/contracts/?signed=1&paid=0' and '?signed=0&paid=0'
+            ListIndex(
+                fields=["-edition_time", "-id"],
+                name="contract_signed_unpaid_idx",
+                condition=Q(is_signed=True, is_paid=False),
+            ),
+            ListIndex(
+                fields=["-edition_time", "-id"],
+                name="contract_unsigned_unpaid_idx",
+                condition=Q(is_signed=False, is_paid=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(amount_paid__lte=F("total_amount")),
+                name="contract_amount_paid_lte_total",
+            ),
+            # is_paid cannot disagree with the amounts, even updated without save()
+            models.CheckConstraint(
+                check=Q(is_paid=True, amount_paid=F("total_amount"))
+                | Q(is_paid=False, amount_paid__lt=F("total_amount")),
+                name="contract_is_paid_stored",
+            ),
+        ]
+
+    objects = ContractQuerySet.as_manager()
+
+    # rows counted by the counters changed by a write, its event is deleted
+    # with it
+    counter_lookups = (("contracts", "id"), ("events", "event__id"))
+
+    slug_lookups = (
+        "customer__id",
+        "customer__first_name",
+        "customer__last_name",
+        "customer__commercial__id",
+        "customer__commercial__first_name",
+        "customer__commercial__last_name",
+    )
 
     def _formatted_bool(self, bool: bool) -> str:
-        if bool:
-            return yes
-        return no
+        return formatted_bool(bool)
 
     @property
     def formatted_is_signed(self) -> str:
@@ -39,9 +109,7 @@ class Contract(TimeFieldMixin):
         return self.total_amount - self.amount_paid
 
     def _number_formatter(self, number: float) -> str:
-        if number or number == 0:
-            return "{:,}".format(number).replace(",", " ")
-        return unfilled
+        return formatted_number(number)
 
     @property
     def formatted_amount_paid(self) -> str:
@@ -105,10 +173,12 @@ class Contract(TimeFieldMixin):
 
     @property
     def is_ready_for_event(self) -> bool:
-        qs = Event.objects.filter(contract=self)
-        if self.is_signed and len(qs) == 0:
-            return True
-        return False
+        if not self.is_signed:
+            return False
+        # annotated by Contract.objects.with_event_flag()
+        if hasattr(self, "has_event"):
+            return not self.has_event
+        return not Event.objects.filter(contract=self).exists()
 
     @classmethod
     def french_name(self) -> str:
@@ -122,41 +192,107 @@ class Contract(TimeFieldMixin):
 
         return f"{self.french_name()}s"
 
-    def save(self, *args, **kwargs):
-        # first save to generate self.id
-        super().save(*args, **kwargs)
+    computed_fields = ("is_paid",)
 
-        # building slug field
-        if self.customer:
-            slug_customer = slugify(self.customer_name)
+    def compute_columns(self):
+        self.is_paid = self.amount_paid == self.total_amount
+
+    def build_slug(self, values: dict) -> str:
+        if values["customer__id"] is not None:
+            slug_customer = slugify(user_name(values, "customer__"))
         else:
             slug_customer = ""
 
-        if self.customer_has_commercial:
-            slug_commercial = slugify(self.commercial_name)
+        if values["customer__commercial__id"] is not None:
+            slug_commercial = slugify(user_name(values, "customer__commercial__"))
         else:
             slug_commercial = ""
 
-        self.slug = f"{self.id}{slug_customer}{slug_commercial}{self.total_amount}"
+        return f"{self.id}{slug_customer}{slug_commercial}{self.total_amount}"
 
+    @refreshes_counters
+    def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
+    @refreshes_counters
+    def delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
+
+
+class EventQuerySet(RowQuerySetMixin, models.QuerySet):
+    row_iterable = EventRowIterable
+
+    def for_list(self) -> models.QuerySet:
+        """joins the relations displayed in 'event/list.html'"""
+
+        return self.select_related(
+            "contract__customer__commercial__department", "location", "support"
+        )
+
+    def overlapping(self, start, end) -> models.QuerySet:
+        """events whose dates overlap [start, end], an event without end date
+        lasts an instant, see epic_events/conflicts.py"""
+
+        return self.alias(ends=Coalesce("end_date", "start_date")).filter(
+            start_date__lt=end or start, ends__gt=start
+        )
+
 
 class Event(TimeFieldMixin):
-    contract = models.ForeignKey(to=Contract, on_delete=models.CASCADE, null=True)
-    location = models.ForeignKey(to=Location, on_delete=models.SET_NULL, null=True)
+    contract = models.OneToOneField(to=Contract, on_delete=models.CASCADE, null=True)
+    # indexed by event_location_list_idx and event_support_list_idx
+    location = models.ForeignKey(
+        to=Location, on_delete=models.SET_NULL, null=True, db_index=False
+    )
     support = models.ForeignKey(
-        to=Collaborator, on_delete=models.SET_NULL, null=True, blank=True
+        to=Collaborator,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
     )
 
     attendees = models.PositiveIntegerField(
         default=0, verbose_name="Nombre de participants"
     )
     start_date = models.DateTimeField(
-        verbose_name="Date de début", null=True, blank=True
+        verbose_name="Date de début", null=True, blank=True, db_index=True
     )
     end_date = models.DateTimeField(verbose_name="Date de fin", null=True, blank=True)
     note = models.TextField(max_length=2048, null=True, blank=True)
+    # start date the support was reminded of, see epic_events/reminders.py
+    reminded_start = models.DateTimeField(null=True, editable=False)
+
+    class Meta(TimeFieldMixin.Meta):
+        # the filters of '/events/', in the order of the list
+        indexes = TimeFieldMixin.Meta.indexes + [
+            list_index("support", name="event_support_list_idx"),
+            list_index("location", name="event_location_list_idx"),
+            # the conflicts of a support, see epic_events/conflicts.py
+            models.Index(
+                fields=["support", "start_date", "end_date"],
+                name="event_support_dates_idx",
+            ),
+        ]
+
+    objects = EventQuerySet.as_manager()
+
+    # rows counted by the counters changed by a write, its contract, the one
+    # in the table and the one of the field, counts the contracts ready for
+    # an event
+    counter_lookups = (("events", "id"), ("contracts", "contract_id"))
+
+    slug_lookups = (
+        "contract__customer__id",
+        "contract__customer__first_name",
+        "contract__customer__last_name",
+        "contract__customer__commercial__id",
+        "contract__customer__commercial__first_name",
+        "contract__customer__commercial__last_name",
+        "support__id",
+        "support__first_name",
+        "support__last_name",
+    )
 
     @property
     def address(self):
@@ -236,33 +372,118 @@ class Event(TimeFieldMixin):
 
         return f"{self.french_name()}s"
 
-    def save(self, *args, **kwargs):
-        # first save to generate self.id
-        super().save(*args, **kwargs)
-        # building the slug field
-        customer_name = slugify(self.customer_name)
-        commercial_name = slugify(self.commercial_name)
-        support_name = slugify(self.support_name)
+    def build_slug(self, values: dict) -> str:
+        customer_name = slugify(user_name(values, "contract__customer__"))
+        commercial_name = slugify(user_name(values, "contract__customer__commercial__"))
+        support_name = slugify(user_name(values, "support__"))
 
-        if self.contract:
-            contract_id = self.contract.id
+        if self.contract_id:
+            contract_id = self.contract_id
         else:
             contract_id = ""
 
-        self.slug = (
+        return (
             f"{self.id} {contract_id} {customer_name} {commercial_name} {support_name}"
         )
+
+    @refreshes_counters
+    def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
+    @refreshes_counters
+    def delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
+
+
+""" Detail pages aggregates """
+
+
+def contract_stats(**lookup) -> dict:
+    """annotations counting and summing the contracts matching the lookup,
+    ex : contract_stats(customer=OuterRef("pk"))"""
+
+    qs = Contract.objects.filter(**lookup)
+
+    return {
+        "contracts_count": SubqueryCount(qs),
+        "signed_contracts_count": SubqueryCount(qs.filter(is_signed=True)),
+        "unpaid_contracts_count": SubqueryCount(qs.filter(is_paid=False)),
+        "total_amount_sum": SubquerySum(qs, F("total_amount")),
+        "remaining_amount_sum": SubquerySum(qs, F("total_amount") - F("amount_paid")),
+    }
+
+
+def event_stats(**lookup) -> dict:
+    """annotations counting the events matching the lookup and giving the
+    start date of the next one, ex : event_stats(support=OuterRef("pk"))"""
+
+    qs = Event.objects.filter(**lookup)
+
+    return {
+        "events_count": SubqueryCount(qs),
+        "next_event_date": SubqueryMin(
+            qs.filter(start_date__gte=timezone.now()), "start_date"
+        ),
+    }
+
+
+""" Filter menus facets """
+
+
+def _facets(qs: models.QuerySet, facets: dict, mine: Q) -> dict:
+    """counts each facet over the whole table and over the rows of one
+    collaborator (my_<facet>) with one conditional aggregation query"""
+
+    aggregates = {}
+    for name, condition in facets.items():
+        aggregates[name] = Count("pk", filter=condition)
+        aggregates[f"my_{name}"] = Count("pk", filter=condition & mine)
+
+    return qs.order_by().aggregate(**aggregates)
+
+
+def contract_facets(commercial_id: int) -> dict:
+    """counts displayed in 'contract/partials/filter.html'"""
+
+    paid = Q(is_paid=True)
+    unpaid = Q(is_paid=False)
+    facets = {
+        "all": Q(pk__isnull=False),
+        "signed_paid": Q(is_signed=True) & paid,
+        "signed_unpaid": Q(is_signed=True) & unpaid,
+        "unsigned_paid": Q(is_signed=False) & paid,
+        "unsigned_unpaid": Q(is_signed=False) & unpaid,
+        "ready_for_event": Q(is_signed=True, has_event=False),
+    }
+
+    return _facets(
+        Contract.objects.with_event_flag(),
+        facets,
+        Q(customer__commercial_id=commercial_id),
+    )
+
+
+def event_facets(support_id: int) -> dict:
+    """counts displayed in 'event/partials/filter.html'"""
+
+    facets = {
+        "all": Q(pk__isnull=False),
+        "without_support": Q(support__isnull=True),
+    }
+
+    return _facets(Event.objects.all(), facets, Q(support_id=support_id))
+
 
 """ Event filter """
 
 
 def events(support: Collaborator = None) -> list[Event]:
     if support:
-        return Event.objects.filter(support=support).order_by("-edition_time")
+        return (
+            Event.objects.for_list().filter(support=support).order_by("-edition_time")
+        )
 
-    return Event.objects.all().order_by("-edition_time")
+    return Event.objects.for_list().order_by("-edition_time")
 
 
 def events_without_support() -> list[Event]:
@@ -274,11 +495,13 @@ def events_without_support() -> list[Event]:
 
 def contracts(commercial: Collaborator = None) -> list[Contract]:
     if commercial:
-        return Contract.objects.filter(customer__commercial=commercial).order_by(
-            "-edition_time"
+        return (
+            Contract.objects.for_list()
+            .filter(customer__commercial=commercial)
+            .order_by("-edition_time")
         )
 
-    return Contract.objects.all().order_by("-edition_time")
+    return Contract.objects.for_list().order_by("-edition_time")
 
 
 def signed_contracts(commercial: Collaborator = None) -> list[Contract]:
@@ -290,30 +513,28 @@ def unsigned_contracts(commercial: Collaborator = None) -> list[Contract]:
 
 
 def contracts_ready_for_event(commercial: Collaborator = None) -> list[Contract]:
-    return signed_contracts(commercial).exclude(
-        Q(id__in=Event.objects.values("contract__id"))
-    )
+    return signed_contracts(commercial).with_event_flag().filter(has_event=False)
 
 
 def unpaid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return contracts(commercial).filter(amount_paid__lt=F("total_amount"))
+    return contracts(commercial).filter(is_paid=False)
 
 
 def paid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return contracts(commercial).filter(amount_paid=F("total_amount"))
+    return contracts(commercial).filter(is_paid=True)
 
 
 def signed_unpaid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return signed_contracts(commercial).filter(amount_paid__lt=F("total_amount"))
+    return signed_contracts(commercial).filter(is_paid=False)
 
 
 def signed_paid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return signed_contracts(commercial).filter(amount_paid=F("total_amount"))
+    return signed_contracts(commercial).filter(is_paid=True)
 
 
 def unsigned_unpaid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return unsigned_contracts(commercial).filter(amount_paid__lt=F("total_amount"))
+    return unsigned_contracts(commercial).filter(is_paid=False)
 
 
 def unsigned_paid_contracts(commercial: Collaborator = None) -> list[Contract]:
-    return unsigned_contracts(commercial).filter(amount_paid=F("total_amount"))
+    return unsigned_contracts(commercial).filter(is_paid=True)
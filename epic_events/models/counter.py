@@ -0,0 +1,243 @@
+"""Dashboard counters read by 'collaborator/home.html'.
+
+One row per scope : the whole table ("global") and each collaborator, as
+commercial of customers and contracts or as support of events. Each Contract,
+Event or Customer save or delete, and each Collaborator delete, counts the
+rows it changes before and after the write, cascades and SET_NULL included,
+and adds the differences to the counter rows with F() expressions in its
+transaction (see refreshes_counters) : a write changing no count updates no
+row, and the concurrent writes add their differences instead of overwriting
+each other. The missing rows are computed when read, the bulk updates are
+caught up by the 'reconcile_counters' command, which recomputes the rows."""
+
+from collections import defaultdict
+from functools import wraps
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+
+
+def scope_name(collaborator_id: int = None) -> str:
+    if collaborator_id is None:
+        return "global"
+    return f"collaborator-{collaborator_id}"
+
+
+class CounterQuerySet(models.QuerySet):
+    def for_home(self, collaborator_id: int) -> tuple:
+        """global and collaborator counters with one indexed lookup, the
+        missing rows are computed"""
+
+        scopes = [scope_name(), scope_name(collaborator_id)]
+        counters = {counter.scope: counter for counter in self.filter(scope__in=scopes)}
+
+        if len(counters) < len(scopes):
+            refresh_counters({collaborator_id})
+            counters = {
+                counter.scope: counter for counter in self.filter(scope__in=scopes)
+            }
+
+        return counters[scopes[0]], counters[scopes[1]]
+
+
+class Counter(models.Model):
+    scope = models.CharField(max_length=64, unique=True)
+    customers = models.PositiveIntegerField(default=0)
+    contracts = models.PositiveIntegerField(default=0)
+    unsigned_contracts = models.PositiveIntegerField(default=0)
+    unpaid_contracts = models.PositiveIntegerField(default=0)
+    contracts_ready_for_event = models.PositiveIntegerField(default=0)
+    events = models.PositiveIntegerField(default=0)
+    events_without_support = models.PositiveIntegerField(default=0)
+
+    objects = CounterQuerySet.as_manager()
+
+    fields = (
+        "customers",
+        "contracts",
+        "unsigned_contracts",
+        "unpaid_contracts",
+        "contracts_ready_for_event",
+        "events",
+        "events_without_support",
+    )
+
+    def __str__(self) -> str:
+        return self.scope
+
+
+def compute_counters(collaborator_id: int = None) -> dict:
+    """counts of one scope, with one aggregate query per table"""
+
+    from .contract_event import Contract, Event
+    from .customer import Customer
+
+    customers = Customer.objects.all()
+    contracts = Contract.objects.with_event_flag()
+    events = Event.objects.all()
+    if collaborator_id is not None:
+        customers = customers.filter(commercial_id=collaborator_id)
+        contracts = contracts.filter(customer__commercial_id=collaborator_id)
+        events = events.filter(support_id=collaborator_id)
+
+    return {
+        "customers": customers.count(),
+        **contracts.order_by().aggregate(
+            contracts=Count("pk"),
+            unsigned_contracts=Count("pk", filter=Q(is_signed=False)),
+            unpaid_contracts=Count("pk", filter=Q(is_paid=False)),
+            contracts_ready_for_event=Count(
+                "pk", filter=Q(is_signed=True, has_event=False)
+            ),
+        ),
+        **events.order_by().aggregate(
+            events=Count("pk"),
+            events_without_support=Count("pk", filter=Q(support__isnull=True)),
+        ),
+    }
+
+
+def refresh_counters(collaborator_ids: set) -> list[Counter]:
+    """recomputes the global counters and the counters of the collaborators"""
+
+    counters = []
+    for collaborator_id in [None, *sorted(collaborator_ids - {None})]:
+        counter, created = Counter.objects.update_or_create(
+            scope=scope_name(collaborator_id),
+            defaults=compute_counters(collaborator_id),
+        )
+        counters.append(counter)
+
+    return counters
+
+
+# kinds of the rows counted, keys of the ids read by counts()
+counted_kinds = ("customers", "contracts", "events")
+
+
+def counted_ids(instance: models.Model) -> dict:
+    """{kind : ids} of the rows whose counts the write of the instance changes,
+    read through instance.counter_lookups, (kind, lookup) : the related rows
+    in the table, and the rows named by the fields of the instance"""
+
+    ids = {kind: set() for kind in counted_kinds}
+    lookups = instance.counter_lookups
+    if instance.pk is not None:
+        rows = (
+            type(instance)
+            .objects.filter(pk=instance.pk)
+            .values_list(*[lookup for _, lookup in lookups])
+        )
+        for row in rows:
+            for (kind, _), id in zip(lookups, row):
+                ids[kind].add(id)
+    for kind, lookup in lookups:
+        if "__" not in lookup:
+            ids[kind].add(getattr(instance, lookup))
+
+    return {kind: kind_ids - {None} for kind, kind_ids in ids.items()}
+
+
+def counts(customers=(), contracts=(), events=()) -> dict:
+    """{(collaborator id, field) : number} of the rows of the ids, the
+    collaborator id None for the global scope"""
+
+    from .contract_event import Contract, Event
+    from .customer import Customer
+
+    numbers = defaultdict(int)
+
+    def count(collaborator_id: int, **fields):
+        for scope in {None, collaborator_id}:
+            for field, number in fields.items():
+                numbers[(scope, field)] += number
+
+    if customers:
+        rows = Customer.objects.filter(id__in=customers).values_list("commercial_id")
+        for (commercial_id,) in rows:
+            count(commercial_id, customers=1)
+    if contracts:
+        rows = (
+            Contract.objects.with_event_flag()
+            .filter(id__in=contracts)
+            .values_list("customer__commercial_id", "is_signed", "is_paid", "has_event")
+        )
+        for commercial_id, is_signed, is_paid, has_event in rows:
+            count(
+                commercial_id,
+                contracts=1,
+                unsigned_contracts=int(not is_signed),
+                unpaid_contracts=int(not is_paid),
+                contracts_ready_for_event=int(is_signed and not has_event),
+            )
+    if events:
+        rows = Event.objects.filter(id__in=events).values_list("support_id")
+        for (support_id,) in rows:
+            count(support_id, events=1)
+            if support_id is None:
+                count(None, events_without_support=1)
+
+    return numbers
+
+
+def add_differences(collaborator_id: int, differences: dict) -> int:
+    """adds the {field : difference} to the row of the scope, number of rows
+    updated"""
+
+    return Counter.objects.filter(scope=scope_name(collaborator_id)).update(
+        **{
+            # a counter drifted by a bulk update stays positive until it is
+            # reconciled
+            field: Greatest(F(field) + difference, Value(0))
+            for field, difference in differences.items()
+        }
+    )
+
+
+def update_counters(before: dict, after: dict):
+    """adds the differences between the counts to the counter rows, the
+    missing rows of the scopes still counting rows are computed"""
+
+    differences = defaultdict(dict)
+    for scope, field in before.keys() | after.keys():
+        difference = after.get((scope, field), 0) - before.get((scope, field), 0)
+        if difference:
+            differences[scope][field] = difference
+
+    # the global row first : the concurrent writes lock the rows in the same
+    # order
+    for collaborator_id in sorted(differences, key=lambda id: (id is not None, id)):
+        if add_differences(collaborator_id, differences[collaborator_id]):
+            continue
+        if not any(after.get((collaborator_id, field)) for field in Counter.fields):
+            continue
+        try:
+            with transaction.atomic():
+                Counter.objects.create(
+                    scope=scope_name(collaborator_id),
+                    **compute_counters(collaborator_id),
+                )
+        except IntegrityError:
+            # created meanwhile, without the rows of this transaction
+            add_differences(collaborator_id, differences[collaborator_id])
+
+
+def refreshes_counters(method):
+    """decorates save() and delete() : the rows counted by the counters that
+    the write changes are counted before and after it, and the differences
+    added to the counters in the same transaction"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with transaction.atomic():
+            ids = counted_ids(self)
+            before = counts(**ids)
+            result = method(self, *args, **kwargs)
+            for kind, kind_ids in counted_ids(self).items():
+                ids[kind] |= kind_ids
+            update_counters(before, counts(**ids))
+
+        return result
+
+    return wrapper
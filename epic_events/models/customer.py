@@ -1,15 +1,67 @@
 from django.db import models
+from django.db.models import OuterRef
+from django.utils.text import slugify
 
 from .collaborator import Collaborator
 from .company import Company
-from .mixins import UserMixin
+from .counter import refreshes_counters
+from .indexes import list_index
+from .mixins import RowQuerySetMixin, UserMixin
+from .rows import CustomerRowIterable, user_name
 from .str_template import unfilled
 
 
+class CustomerQuerySet(RowQuerySetMixin, models.QuerySet):
+    row_iterable = CustomerRowIterable
+
+    def for_list(self) -> models.QuerySet:
+        """joins the relations displayed in 'customer/list.html'"""
+
+        return self.select_related("company", "commercial")
+
+    def with_stats(self) -> models.QuerySet:
+        """annotates the aggregates displayed in 'customer/detail.html'"""
+
+        from .contract_event import contract_stats, event_stats
+
+        return self.select_related("company", "commercial").annotate(
+            **contract_stats(customer=OuterRef("pk")),
+            **event_stats(contract__customer=OuterRef("pk")),
+        )
+
+
 class Customer(UserMixin):
     company = models.ForeignKey(to=Company, on_delete=models.SET_NULL, null=True)
+    # indexed by customer_commercial_list_idx
     commercial = models.ForeignKey(
-        to=Collaborator, on_delete=models.SET_NULL, null=True, related_name="commercial"
+        to=Collaborator,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="commercial",
+        db_index=False,
+    )
+
+    class Meta(UserMixin.Meta):
+        # '/my_customers/', in the order of the list
+        indexes = UserMixin.Meta.indexes + [
+            list_index("commercial", name="customer_commercial_list_idx"),
+        ]
+
+    objects = CustomerQuerySet.as_manager()
+
+    # rows counted by the counters changed by a write : its contracts are
+    # counted for its commercial, and deleted with it with their events
+    counter_lookups = (
+        ("customers", "id"),
+        ("contracts", "contract__id"),
+        ("events", "contract__event__id"),
+    )
+
+    slug_lookups = (
+        "company__name",
+        "commercial__id",
+        "commercial__first_name",
+        "commercial__last_name",
     )
 
     @property
@@ -24,6 +76,15 @@ class Customer(UserMixin):
             return self.commercial.name
         return unfilled
 
+    def slug_foreign_key(self, values: dict) -> str:
+        if values["company__name"]:
+            company_name = values["company__name"].capitalize()
+        else:
+            company_name = unfilled
+        commercial_name = user_name(values, "commercial__")
+
+        return f"{slugify(company_name)} {slugify(commercial_name)}"
+
     @classmethod
     def french_name(self) -> str:
         """used in flash messages"""
@@ -35,3 +96,11 @@ class Customer(UserMixin):
         """used as title in template 'list'"""
 
         return f"{self.french_name()}s"
+
+    @refreshes_counters
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+    @refreshes_counters
+    def delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Deletion(models.Model):
+    """id of a row deleted, read by the typeahead indexes of the processes
+    syncing with the changes, see epic_events/typeahead.py. Written in the
+    transaction of the delete, it is rolled back with it"""
+
+    # label_lower of the model
+    model = models.CharField(max_length=64)
+    row_id = models.BigIntegerField()
+    time = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # the deletions of a model since the last sync of an index
+        indexes = [
+            models.Index(fields=["model", "time"], name="deletion_model_time_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} {self.row_id}"
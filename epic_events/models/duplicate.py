@@ -0,0 +1,37 @@
+from django.db import models
+
+from .customer import Customer
+
+
+class DuplicateCustomer(models.Model):
+    """pair of customers found by the 'find_duplicate_customers' command, see
+    epic_events/duplicates.py, the customer is the oldest of the pair"""
+
+    # indexed by duplicate_customer_pair
+    customer = models.ForeignKey(
+        to=Customer, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    duplicate = models.ForeignKey(
+        to=Customer, on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+    # shared keys of the pair, ex : "téléphone, entreprise"
+    reasons = models.CharField(max_length=128, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer", "duplicate"], name="duplicate_customer_pair"
+            ),
+        ]
+        # 'customer/duplicates.html', the best pairs first
+        indexes = [models.Index(fields=["-score", "id"], name="duplicate_score_idx")]
+
+    @property
+    def customers(self) -> tuple:
+        """used in 'customer/duplicates.html'"""
+
+        return self.customer, self.duplicate
+
+    def __str__(self) -> str:
+        return f"{self.customer_id} ~ {self.duplicate_id}"
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class ListIndex(models.Index):
+    """index in the order of the lists, '-edition_time' then '-id' : the nullable
+    DESC columns are NULLS LAST on PostgreSQL, as in the ORDER BY of
+    views/paginator.py, where they are NULLS FIRST by default and the index could
+    not serve the order. SQLite sorts the nulls last in DESC order anyway."""
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().create_sql(model, schema_editor, using, **kwargs)
+
+        index = self.clone()
+        index.fields_orders = [
+            (
+                name,
+                (
+                    f"{order} NULLS LAST"
+                    if order and model._meta.get_field(name).null
+                    else order
+                ),
+            )
+            for name, order in self.fields_orders
+        ]
+        return super(ListIndex, index).create_sql(model, schema_editor, using, **kwargs)
+
+
+def list_index(*fields: str, name: str) -> ListIndex:
+    """index of the lists filtered by the fields, ex : '/contracts/?signed=1'
+    reads the rows of one is_signed value in the order of the list"""
+
+    return ListIndex(fields=[*fields, "-edition_time", "-id"], name=name)
@@ -1,10 +1,20 @@
 from django.db import models
+from django.db.models import OuterRef
 from django.utils.text import slugify
 
 from .mixins import TimeFieldMixin
 from .str_template import unfilled
 
 
+class LocationQuerySet(models.QuerySet):
+    def with_stats(self) -> models.QuerySet:
+        """annotates the aggregates displayed in 'location/detail.html'"""
+
+        from .contract_event import event_stats
+
+        return self.annotate(**event_stats(location=OuterRef("pk")))
+
+
 class Location(TimeFieldMixin):
     STREET_TYPE = [
         ("", ""),
@@ -43,14 +53,36 @@ class Location(TimeFieldMixin):
         max_length=6,
         verbose_name="Code postal",
     )
-    slug_form = models.SlugField(null=True, max_length=255)
+    # normalized address, unique key of the rows, see epic_events/upserts.py
+    slug_form = models.SlugField(null=True, max_length=255, unique=True)
+    # display address, stored for the templates
+    address = models.CharField(max_length=512, null=True, blank=True, editable=False)
+    # normalized city, filtered by 'city:lyon', see epic_events/queries.py
+    city_slug = models.SlugField(
+        max_length=100, null=True, blank=True, editable=False, db_index=False
+    )
+
+    class Meta(TimeFieldMixin.Meta):
+        # the locations near a postal code, see epic_events/gazetteer.py
+        indexes = TimeFieldMixin.Meta.indexes + [
+            models.Index(fields=["zip"], name="location_zip_idx"),
+            models.Index(fields=["city_slug"], name="location_city_slug_idx"),
+        ]
+
+    objects = LocationQuerySet.as_manager()
 
     def __str__(self, name=True) -> str:
-        if self.name and name:
-            name = f"{self.name.title()}, "
+        # stored by compute_columns(), built for the unsaved or not backfilled rows
+        if self.address is not None:
+            address = self.address
         else:
-            name = ""
+            address = self.build_address()
+
+        if self.name and name:
+            return f"{self.name.title()}, {address}"
+        return address
 
+    def build_address(self) -> str:
         if self.number:
             number = f"{self.number.upper()} "
         else:
@@ -76,7 +108,7 @@ class Location(TimeFieldMixin):
         else:
             city = ""
 
-        return f"{name}{number}{street_type}{street_name}{zip}{city}"
+        return f"{number}{street_type}{street_name}{zip}{city}"
 
     @property
     def formatted_name(self) -> str:
@@ -101,9 +133,15 @@ class Location(TimeFieldMixin):
 
         return f"{self.french_name()}x"
 
-    def save(self, *args, **kwargs):
-        self.slug_form = slugify(str(self))
-        # get self.id
-        super().save(*args, **kwargs)
-        self.slug = f"{self.id} {slugify(str(self))}"
-        super().save(*args, **kwargs)
+    def build_slug(self, values: dict) -> str:
+        return f"{self.id} {slugify(str(self))}"
+
+    def build_slug_form(self) -> str:
+        return slugify(f"{self.name or ''} {self.build_address()}")
+
+    computed_fields = ("address", "slug_form", "city_slug")
+
+    def compute_columns(self):
+        self.address = self.build_address()
+        self.slug_form = self.build_slug_form()
+        self.city_slug = slugify(self.city)
@@ -1,10 +1,34 @@
 import phonenumbers
-from django.db import models
+from django.db import models, router, transaction
 from django.utils import timezone
 from django.utils.text import slugify
 from phonenumber_field.modelfields import PhoneNumberField
 
-from .str_template import unfilled
+from .indexes import list_index
+from .slugs import refresh_dependent_slugs
+from .str_template import formatted_name, unfilled
+
+
+class RowQuerySetMixin:
+    """rows() of the querysets listed by the list templates, see rows.py"""
+
+    # RowIterable subclass building the rows
+    row_iterable = None
+
+    def for_rows(self) -> models.QuerySet:
+        """the queryset projected by rows(), annotated with the values the
+        rows read"""
+
+        return self
+
+    def rows(self) -> models.QuerySet:
+        """projects the queryset on row_iterable.row_class instances"""
+
+        qs = self.for_rows().values(*self.row_iterable.row_class.fields)
+        # same mechanism as values_list(named=True)
+        qs._iterable_class = self.row_iterable
+
+        return qs
 
 
 class TimeFieldMixin(models.Model):
@@ -14,6 +38,8 @@ class TimeFieldMixin(models.Model):
 
     class Meta:
         abstract = True
+        # order of the lists and key of views/paginator.py
+        indexes = [list_index(name="%(class)s_list_idx")]
 
     @classmethod
     def singular_name(self) -> str:
@@ -61,15 +87,65 @@ class TimeFieldMixin(models.Model):
     def search_url_name(self) -> str:
         return f"search_{self.singular_name()}"
 
+    # related values read by build_slug(), ex : ("department__name",)
+    slug_lookups = ()
+
+    def build_slug(self, values: dict) -> str:
+        """slug of the saved row, values holds the slug_lookups of the row. The
+        id by default, the models add the names their search matches"""
+
+        return str(self.id)
+
+    # columns stored by compute_columns()
+    computed_fields = ()
+
+    def compute_columns(self):
+        """stores the columns computed from the fields, before each write and
+        before the bulk writes of epic_events/upserts.py"""
+
     def save(self, *args, **kwargs):
+        """one write of the row, followed by one targeted UPDATE of the slug
+        when it depends on the new id or on the related rows and has changed,
+        and by the refresh of the slugs built from the row"""
+
         self.edition_time = timezone.now()
-        super().save(*args, **kwargs)
+        self.compute_columns()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], *self.computed_fields}
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using, savepoint=False):
+            created = self.pk is None
+            previous_slug = self.slug
+
+            if not created and not self.slug_lookups:
+                self.slug = self.build_slug({})
+                if kwargs.get("update_fields") is not None:
+                    kwargs["update_fields"] = {*kwargs["update_fields"], "slug"}
+                super().save(*args, **kwargs)
+            else:
+                super().save(*args, **kwargs)
+
+                row = type(self)._base_manager.using(using).filter(pk=self.pk)
+                values = (
+                    row.values(*self.slug_lookups).get() if self.slug_lookups else {}
+                )
+                slug = self.build_slug(values)
+                if slug != self.slug:
+                    self.slug = slug
+                    row.update(slug=slug)
+
+            # the slugs built from the row hold the names of its slug
+            if not created and self.slug != previous_slug:
+                refresh_dependent_slugs(self)
 
 
 class NameFieldMixin(TimeFieldMixin):
     name = models.CharField(max_length=128)
+    # normalized name, unique key of the rows, see epic_events/upserts.py
+    slug_form = models.SlugField(max_length=255, null=True, unique=True)
 
-    class Meta:
+    class Meta(TimeFieldMixin.Meta):
         abstract = True
 
     def __str__(self) -> str:
@@ -77,13 +153,16 @@ class NameFieldMixin(TimeFieldMixin):
             return f"{self.name.capitalize()}"
         return unfilled
 
-    def save(self, *args, **kwargs):
-        # first save to generate self.id
-        super().save(*args, **kwargs)
+    def build_slug_form(self) -> str:
+        return slugify(self.name)
 
-        self.slug = f"{self.id} {slugify(self.name)}"
+    def build_slug(self, values: dict) -> str:
+        return f"{self.id} {slugify(self.name)}"
 
-        super().save(*args, **kwargs)
+    computed_fields = ("slug_form",)
+
+    def compute_columns(self):
+        self.slug_form = self.build_slug_form()
 
 
 class UserMixin(TimeFieldMixin):
@@ -91,51 +170,64 @@ class UserMixin(TimeFieldMixin):
     last_name = models.CharField(max_length=150, verbose_name="Nom")
     email = models.EmailField(unique=True)
     phone = PhoneNumberField(null=True, blank=True)
+    # formats of the phone, stored for the templates
+    phone_international = models.CharField(
+        max_length=32, null=True, blank=True, editable=False
+    )
+    phone_e164 = models.CharField(max_length=16, null=True, blank=True, editable=False)
 
-    class Meta:
+    class Meta(TimeFieldMixin.Meta):
         abstract = True
+        # the global search of a phone number, see epic_events/search.py
+        indexes = TimeFieldMixin.Meta.indexes + [
+            models.Index(fields=["phone_e164"], name="%(class)s_phone_idx"),
+        ]
 
     def __str__(self) -> str:
-        if self.first_name:
-            first_name = self.first_name.capitalize()
-        else:
-            first_name = unfilled
-
-        if self.last_name:
-            last_name = self.last_name.capitalize()
-        else:
-            last_name = unfilled
-
-        return f"{first_name} {last_name}"
+        return formatted_name(self.first_name, self.last_name)
 
     @property
     def name(self) -> str:
         return str(self)
 
+    def build_phones(self) -> tuple:
+        """(international, E.164) formats of the phone"""
+
+        if self.phone:
+            return (
+                phonenumbers.format_number(
+                    self.phone, phonenumbers.PhoneNumberFormat.INTERNATIONAL
+                ),
+                phonenumbers.format_number(
+                    self.phone, phonenumbers.PhoneNumberFormat.E164
+                ),
+            )
+        return None, None
+
     @property
     def formatted_phone(self):
+        # stored, formatted for the unsaved or not backfilled rows
+        if self.phone_international:
+            return self.phone_international
         if self.phone:
-            return phonenumbers.format_number(
-                self.phone, phonenumbers.PhoneNumberFormat.INTERNATIONAL
-            )
+            return self.build_phones()[0]
         return unfilled
 
-    def save(self, *args, **kwargs):
-        # first save to generate self.id
-        super().save(*args, **kwargs)
+    def slug_foreign_key(self, values: dict) -> str:
+        """names of the related rows ending the slug, read from the
+        slug_lookups in values, none by default"""
+
+        return ""
 
-        # building the slug field
+    def build_slug(self, values: dict) -> str:
         slug_first_name = slugify(self.first_name)
         slug_last_name = slugify(self.last_name)
         slug_email = slugify(self.email)
+        slug_foreign_key = self.slug_foreign_key(values)
 
-        if self.singular_name() == "collaborator":
-            slug_foreign_key = slugify(self.role)
+        return f"{self.id} {slug_first_name} {slug_last_name} {slug_email} {slug_foreign_key}".rstrip()
 
-        if self.singular_name() == "customer":
-            slug_foreign_key = (
-                f"{slugify(self.company_name)} {slugify(self.commercial_name)}"
-            )
+    computed_fields = ("phone_international", "phone_e164")
 
-        self.slug = f"{self.id} {slug_first_name} {slug_last_name} {slug_email} {slug_foreign_key}"
-        super().save(*args, **kwargs)
+    def compute_columns(self):
+        self.phone_international, self.phone_e164 = self.build_phones()
@@ -0,0 +1,177 @@
+"""Read-only rows rendered by the list templates.
+
+A list page only displays a handful of columns : the rows are built from a
+.values() projection, so neither Event().note nor the property chains of
+Contract() and Event() are loaded, and the display fields are computed once
+per row."""
+
+from django.db.models.query import ValuesIterable
+
+from .str_template import formatted_name, formatted_number, unfilled
+
+
+def user_name(values: dict, prefix: str) -> str:
+    if values[f"{prefix}id"] is None:
+        return unfilled
+    return formatted_name(values[f"{prefix}first_name"], values[f"{prefix}last_name"])
+
+
+class ContractRow:
+    """used in 'contract/list.html'"""
+
+    __slots__ = (
+        "id",
+        "edition_time",
+        "is_signed",
+        "is_paid",
+        "is_ready_for_event",
+        "formatted_total_amount",
+        "formatted_amount_paid",
+        "customer_id",
+        "customer_name",
+        "commercial_id",
+        "commercial_name",
+        "has_commercial",
+    )
+
+    fields = (
+        "id",
+        "edition_time",
+        "is_signed",
+        "is_paid",
+        "has_event",
+        "total_amount",
+        "amount_paid",
+        "customer__id",
+        "customer__first_name",
+        "customer__last_name",
+        "customer__commercial__id",
+        "customer__commercial__first_name",
+        "customer__commercial__last_name",
+    )
+
+    def __init__(self, values: dict):
+        self.id = values["id"]
+        self.edition_time = values["edition_time"]
+        self.is_signed = values["is_signed"]
+        self.is_paid = values["is_paid"]
+        self.is_ready_for_event = values["is_signed"] and not values["has_event"]
+        self.formatted_total_amount = formatted_number(values["total_amount"])
+        self.formatted_amount_paid = formatted_number(values["amount_paid"])
+        self.customer_id = values["customer__id"]
+        self.customer_name = user_name(values, "customer__")
+        self.has_commercial = values["customer__commercial__id"] is not None
+        # str like Contract().commercial_id, compared to user.str_id
+        if self.has_commercial:
+            self.commercial_id = str(values["customer__commercial__id"])
+        else:
+            self.commercial_id = unfilled
+        self.commercial_name = user_name(values, "customer__commercial__")
+
+
+class EventRow:
+    """used in 'event/list.html'"""
+
+    __slots__ = (
+        "id",
+        "edition_time",
+        "contract_id",
+        "location_id",
+        "commercial_id",
+        "commercial_name",
+        "has_commercial",
+        "support_id",
+        "support_name",
+    )
+
+    fields = (
+        "id",
+        "edition_time",
+        "contract_id",
+        "location_id",
+        "contract__customer__commercial__id",
+        "contract__customer__commercial__first_name",
+        "contract__customer__commercial__last_name",
+        "support__id",
+        "support__first_name",
+        "support__last_name",
+    )
+
+    def __init__(self, values: dict):
+        self.id = values["id"]
+        self.edition_time = values["edition_time"]
+        self.contract_id = values["contract_id"]
+        self.location_id = values["location_id"]
+        self.has_commercial = values["contract__customer__commercial__id"] is not None
+        # str like Event().commercial_id, compared to user.str_id
+        if self.has_commercial:
+            self.commercial_id = str(values["contract__customer__commercial__id"])
+        else:
+            self.commercial_id = unfilled
+        self.commercial_name = user_name(values, "contract__customer__commercial__")
+        self.support_id = values["support__id"]
+        self.support_name = user_name(values, "support__")
+
+
+class CustomerRow:
+    """used in 'customer/list.html'"""
+
+    __slots__ = (
+        "id",
+        "edition_time",
+        "name",
+        "company_id",
+        "company_name",
+        "commercial_id",
+        "commercial_name",
+    )
+
+    fields = (
+        "id",
+        "edition_time",
+        "first_name",
+        "last_name",
+        "company__id",
+        "company__name",
+        "commercial__id",
+        "commercial__first_name",
+        "commercial__last_name",
+    )
+
+    def __init__(self, values: dict):
+        self.id = values["id"]
+        self.edition_time = values["edition_time"]
+        self.name = formatted_name(values["first_name"], values["last_name"])
+        self.company_id = values["company__id"]
+        if values["company__name"]:
+            self.company_name = values["company__name"].capitalize()
+        else:
+            self.company_name = unfilled
+        self.commercial_id = values["commercial__id"]
+        self.commercial_name = user_name(values, "commercial__")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RowIterable(ValuesIterable):
+    """yields a row_class instance for each row of a .values() queryset"""
+
+    row_class = None
+
+    def __iter__(self):
+        row_class = self.row_class
+        for values in super().__iter__():
+            yield row_class(values)
+
+
+class ContractRowIterable(RowIterable):
+    row_class = ContractRow
+
+
+class EventRowIterable(RowIterable):
+    row_class = EventRow
+
+
+class CustomerRowIterable(RowIterable):
+    row_class = CustomerRow
@@ -0,0 +1,121 @@
+"""Refresh of the search slugs built from the names of related rows.
+
+The slug of a customer holds the names of its company and commercial, the slug
+of an event the names of its customer, commercial and support... The
+slug_lookups of each model tell which related rows its slug is built from : when
+the slug of a saved row changes, the rows built from it are found with indexed
+foreign key queries and rewritten with bulk_update(), see TimeFieldMixin.save().
+The 'rebuild_slugs' command rebuilds every slug of the tables."""
+
+from functools import cache
+from itertools import islice
+
+from django.apps import apps
+from django.db import models
+
+batch_size = 500
+
+
+def slug_models() -> list:
+    from .mixins import TimeFieldMixin
+
+    return [
+        model
+        for model in apps.get_app_config("epic_events").get_models()
+        if issubclass(model, TimeFieldMixin)
+    ]
+
+
+def relation_paths(model) -> dict:
+    """{path : related model} of the relations crossed by the slug_lookups,
+    ex : {"contract": Contract, "contract__customer": Customer, ...}"""
+
+    paths = {}
+    for lookup in model.slug_lookups:
+        related_model = model
+        names = lookup.split("__")[:-1]
+        for i, name in enumerate(names):
+            related_model = related_model._meta.get_field(name).related_model
+            paths["__".join(names[: i + 1])] = related_model
+
+    return paths
+
+
+@cache
+def slug_dependents(model) -> list:
+    """(dependent model, path) of the slugs built from the rows of the model"""
+
+    return [
+        (dependent, path)
+        for dependent in slug_models()
+        for path, related_model in relation_paths(dependent).items()
+        if related_model is model
+    ]
+
+
+def slug_fields(model) -> list:
+    """columns of the rows and related values read by build_slug()"""
+
+    return [field.attname for field in model._meta.concrete_fields] + list(
+        model.slug_lookups
+    )
+
+
+def built_slugs(model, rows: list) -> list:
+    """(id, slug) of the rows whose slug changed, rows are values() of the
+    slug_fields(), no query"""
+
+    attnames = [field.attname for field in model._meta.concrete_fields]
+
+    slugs = []
+    for row in rows:
+        obj = model(**{attname: row[attname] for attname in attnames})
+        slug = obj.build_slug(row)
+        if slug != row["slug"]:
+            slugs.append((obj.pk, slug))
+
+    return slugs
+
+
+def build_chunk(label: str, rows: list) -> list:
+    """built_slugs() run in the process pool of the 'rebuild_slugs' command"""
+
+    return built_slugs(apps.get_model(label), rows)
+
+
+def chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def write_slugs(model, slugs: list) -> int:
+    model._base_manager.bulk_update(
+        [model(pk=pk, slug=slug) for pk, slug in slugs], ["slug"], batch_size=batch_size
+    )
+
+    return len(slugs)
+
+
+def refresh_slugs(qs: models.QuerySet) -> int:
+    """rewrites the stale slugs of the qs, number of rewritten slugs"""
+
+    rows = qs.order_by("pk").values(*slug_fields(qs.model))
+
+    return sum(
+        write_slugs(qs.model, built_slugs(qs.model, chunk))
+        for chunk in chunks(rows.iterator(chunk_size=batch_size), batch_size)
+    )
+
+
+def refresh_dependent_slugs(instance: models.Model) -> int:
+    """rewrites the slugs built from the names of the instance"""
+
+    return sum(
+        refresh_slugs(
+            dependent._base_manager.using(instance._state.db).filter(
+                **{path: instance.pk}
+            )
+        )
+        for dependent, path in slug_dependents(type(instance))
+    )
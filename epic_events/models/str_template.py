@@ -1,3 +1,31 @@
 unfilled = "(Non renseigné)"
 yes = "Oui ✅"
 no = "Non ❌"
+
+
+def formatted_bool(bool: bool) -> str:
+    if bool:
+        return yes
+    return no
+
+
+def formatted_number(number: float) -> str:
+    if number or number == 0:
+        return "{:,}".format(number).replace(",", " ")
+    return unfilled
+
+
+def formatted_name(first_name: str, last_name: str) -> str:
+    """'John Doe', used by UserMixin.__str__() and by the list rows"""
+
+    if first_name:
+        first_name = first_name.capitalize()
+    else:
+        first_name = unfilled
+
+    if last_name:
+        last_name = last_name.capitalize()
+    else:
+        last_name = unfilled
+
+    return f"{first_name} {last_name}"
@@ -0,0 +1,37 @@
+"""Correlated aggregates used by the with_stats() querysets.
+
+Counting or summing through several reverse relations with joins multiplies
+the rows, so each aggregate is computed in its own subquery and the detail
+page still runs one single query."""
+
+from django.db import models
+from django.db.models import Subquery
+
+
+class SubqueryCount(Subquery):
+    """number of rows of a queryset filtered on OuterRef()"""
+
+    template = "(SELECT COUNT(*) FROM (%(subquery)s) _count)"
+    output_field = models.IntegerField()
+
+    def __init__(self, queryset: models.QuerySet, **kwargs):
+        super().__init__(queryset.order_by().values("pk"), **kwargs)
+
+
+class SubquerySum(Subquery):
+    """sum of an expression over a queryset filtered on OuterRef(), 0 if empty"""
+
+    template = '(SELECT COALESCE(SUM("amount"), 0) FROM (%(subquery)s) _sum)'
+    output_field = models.IntegerField()
+
+    def __init__(self, queryset: models.QuerySet, expression, **kwargs):
+        queryset = queryset.order_by().annotate(amount=expression).values("amount")
+        super().__init__(queryset, **kwargs)
+
+
+class SubqueryMin(Subquery):
+    """smallest value of a field over a queryset filtered on OuterRef()"""
+
+    def __init__(self, queryset: models.QuerySet, field: str, **kwargs):
+        queryset = queryset.filter(**{f"{field}__isnull": False})
+        super().__init__(queryset.order_by(field).values(field)[:1], **kwargs)
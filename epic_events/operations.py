@@ -0,0 +1,66 @@
+"""Migration operations building the indexes without locking the tables.
+
+On PostgreSQL, CREATE INDEX blocks the writes on the table until the index is
+built : AddIndexOnline and RemoveIndexOnline run CREATE / DROP INDEX
+CONCURRENTLY instead, through the operations of django.contrib.postgres, which
+cannot run in a transaction, so their migrations declare atomic = False. Other
+databases, SQLite in development and tests, build the indexes as usual."""
+
+from django.db import migrations
+
+
+def is_postgresql(schema_editor) -> bool:
+    return schema_editor.connection.vendor == "postgresql"
+
+
+class AddIndexOnline(migrations.AddIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgresql(schema_editor):
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+        # psycopg is only installed with PostgreSQL
+        from django.contrib.postgres.operations import AddIndexConcurrently
+
+        AddIndexConcurrently(self.model_name, self.index).database_forwards(
+            app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgresql(schema_editor):
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+        from django.contrib.postgres.operations import AddIndexConcurrently
+
+        AddIndexConcurrently(self.model_name, self.index).database_backwards(
+            app_label, schema_editor, from_state, to_state
+        )
+
+
+class RemoveIndexOnline(migrations.RemoveIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgresql(schema_editor):
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+        from django.contrib.postgres.operations import RemoveIndexConcurrently
+
+        RemoveIndexConcurrently(self.model_name, self.name).database_forwards(
+            app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_postgresql(schema_editor):
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+        from django.contrib.postgres.operations import RemoveIndexConcurrently
+
+        RemoveIndexConcurrently(self.model_name, self.name).database_backwards(
+            app_label, schema_editor, from_state, to_state
+        )
@@ -48,7 +48,10 @@ class CommercialEventRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
         """permission"""
 
         id = self.request.path.replace("/contracts/", "").replace("/events/create/", "")
-        contract = get_object_or_404(Contract, id=int(id))
+        contract = get_object_or_404(
+            Contract.objects.with_event_flag().select_related("customer__commercial"),
+            id=int(id),
+        )
 
         return (
             contract.is_ready_for_event
@@ -0,0 +1,237 @@
+"""Query language of the search boxes.
+
+'commercial:dupont signed:non amount>10000 city:lyon' is split into
+qualifiers and free text : each qualifier filters an indexed column, the
+foreign keys through the ids of the rows named by the value, found by the text
+index of their table, and the free text is matched by epic_events/search.py.
+The qualifiers of each model are whitelisted, a value in quotes may hold
+spaces : 'customer:"jean dupont"'."""
+
+import re
+import shlex
+from datetime import timedelta
+
+from django.db.models import Q, QuerySet
+from django.utils.text import slugify
+
+from .filters import FilterError, parse_bool, parse_datetime_value
+from .models.collaborator import Collaborator
+from .models.company import Company
+from .models.contract_event import Contract, Event
+from .models.customer import Customer
+from .models.department import Department
+from .models.location import Location
+from .search import search
+
+qualifier_pattern = re.compile(
+    r"^(?P<name>[a-z_]+)(?P<operator>:|>=|<=|>|<)(?P<value>.+)$", re.IGNORECASE
+)
+
+# operator : lookup suffix
+comparisons = {":": "", ">": "__gt", ">=": "__gte", "<": "__lt", "<=": "__lte"}
+
+flags = {"oui": "1", "yes": "1", "non": "0", "no": "0"}
+
+
+def parse_flag(value: str) -> bool:
+    return parse_bool(flags.get(value.lower(), value.lower()))
+
+
+def parse_number(value: str) -> int:
+    # 10k, 10 000 €
+    number = value.lower().replace(" ", "").replace("€", "")
+    if number.endswith("k") and number[:-1].isdigit():
+        return int(number[:-1]) * 1000
+    if number.isdigit():
+        return int(number)
+    raise FilterError(f"'{value}' n'est pas un nombre")
+
+
+class Qualifier:
+    """filter of one 'name:value' of the query"""
+
+    operators = (":",)
+    # operator shown in the title of the search box
+    hint = ":"
+
+    def __init__(self, lookup: str):
+        self.lookup = lookup
+
+    def q(self, operator: str, value: str) -> Q:
+        raise NotImplementedError
+
+
+class FlagQualifier(Qualifier):
+    """'signed:non'"""
+
+    def q(self, operator: str, value: str) -> Q:
+        return Q(**{self.lookup: parse_flag(value)})
+
+
+class NumberQualifier(Qualifier):
+    """'amount>10000', 'attendees:50'"""
+
+    operators = tuple(comparisons)
+    hint = ">"
+
+    def q(self, operator: str, value: str) -> Q:
+        return Q(**{f"{self.lookup}{comparisons[operator]}": parse_number(value)})
+
+
+class DateQualifier(Qualifier):
+    """'start>=2026-06-01', 'start:2026-06-01' is the whole day"""
+
+    operators = tuple(comparisons)
+    hint = ">"
+
+    def q(self, operator: str, value: str) -> Q:
+        date = parse_datetime_value(value)
+        if operator == ":":
+            return Q(
+                **{
+                    f"{self.lookup}__gte": date,
+                    f"{self.lookup}__lt": date + timedelta(days=1),
+                }
+            )
+        return Q(**{f"{self.lookup}{comparisons[operator]}": date})
+
+
+class NameQualifier(Qualifier):
+    """'commercial:dupont' : the rows related to the rows of the model matching
+    the value in the text index, 'commercial:aucun' the rows without relation"""
+
+    def __init__(self, lookup: str, model):
+        super().__init__(lookup)
+        self.model = model
+
+    def q(self, operator: str, value: str) -> Q:
+        if value.lower() in ("aucun", "none"):
+            return Q(**{f"{self.lookup}__isnull": True})
+        rows = search(self.model, value, ranked=False)
+        return Q(**{f"{self.lookup}__in": rows.values("id")})
+
+
+class CityQualifier(Qualifier):
+    """'city:lyon' : the locations of this city, read through the index of
+    their normalized city, not the ones of a 'rue de Lyon'"""
+
+    def q(self, operator: str, value: str) -> Q:
+        locations = Location.objects.filter(city_slug=slugify(value))
+        return Q(**{f"{self.lookup}__in": locations.values("id")})
+
+
+class SearchQuery:
+    """parses the query of the search box of one model and applies it"""
+
+    # name : Qualifier
+    qualifiers = {}
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @classmethod
+    def syntax(cls) -> str:
+        """qualifiers listed in the title of the search box, and the order of
+        the matches : the search views list them newest first, not ranked"""
+
+        hints = [
+            f"{name}{qualifier.hint}…" for name, qualifier in cls.qualifiers.items()
+        ]
+
+        return " ".join([*hints, "(les plus récents d'abord)"])
+
+    def parse(self) -> tuple:
+        """(conditions, free text) of the query"""
+
+        try:
+            words = shlex.split(self.text)
+        except ValueError:
+            raise FilterError("un guillemet n'est pas fermé")
+
+        conditions = []
+        free_words = []
+        for word in words:
+            match = qualifier_pattern.match(word)
+            if match is None:
+                free_words.append(word)
+                continue
+
+            name, operator, value = match.group("name", "operator", "value")
+            name = name.lower()
+            if name not in self.qualifiers:
+                raise FilterError(f"le critère '{name}' n'existe pas")
+            qualifier = self.qualifiers[name]
+            if operator not in qualifier.operators:
+                raise FilterError(f"le critère '{name}' n'accepte pas '{operator}'")
+            conditions.append(qualifier.q(operator, value))
+
+        return conditions, " ".join(free_words)
+
+    def filter(self, model, qs: QuerySet) -> QuerySet:
+        conditions, free_text = self.parse()
+
+        return search(model, free_text, qs.filter(*conditions), ranked=False)
+
+
+class CollaboratorQuery(SearchQuery):
+    qualifiers = {"department": NameQualifier("department", Department)}
+
+
+class CustomerQuery(SearchQuery):
+    qualifiers = {
+        "commercial": NameQualifier("commercial", Collaborator),
+        "company": NameQualifier("company", Company),
+    }
+
+
+class ContractQuery(SearchQuery):
+    qualifiers = {
+        "commercial": NameQualifier("customer__commercial", Collaborator),
+        "customer": NameQualifier("customer", Customer),
+        "support": NameQualifier("event__support", Collaborator),
+        "city": CityQualifier("event__location"),
+        "signed": FlagQualifier("is_signed"),
+        "paid": FlagQualifier("is_paid"),
+        "amount": NumberQualifier("total_amount"),
+        "paid_amount": NumberQualifier("amount_paid"),
+    }
+
+
+class EventQuery(SearchQuery):
+    qualifiers = {
+        "commercial": NameQualifier("contract__customer__commercial", Collaborator),
+        "customer": NameQualifier("contract__customer", Customer),
+        "support": NameQualifier("support", Collaborator),
+        "location": NameQualifier("location", Location),
+        "city": CityQualifier("location"),
+        "start": DateQualifier("start_date"),
+        "end": DateQualifier("end_date"),
+        "attendees": NumberQualifier("attendees"),
+    }
+
+
+class LocationQuery(SearchQuery):
+    qualifiers = {"city": CityQualifier("id")}
+
+
+queries = {
+    Collaborator: CollaboratorQuery,
+    Customer: CustomerQuery,
+    Contract: ContractQuery,
+    Event: EventQuery,
+    Location: LocationQuery,
+}
+
+
+def search_syntax(model) -> str:
+    return queries.get(model, SearchQuery).syntax()
+
+
+def search_query(model, text: str, qs: QuerySet = None) -> QuerySet:
+    """rows of the model, or of the qs, matching the qualifiers and the free
+    text of the query, FilterError when it is invalid"""
+
+    if qs is None:
+        qs = model.objects.all()
+
+    return queries.get(model, SearchQuery)(text).filter(model, qs)
@@ -0,0 +1,205 @@
+"""Reminders of the events, sent to their support the day before they start.
+
+The command run_reminders is a long-running process holding a heap of the
+reminders due, (start_date - delay, event id), for the events starting within
+horizon : it sleeps until the next reminder, poll seconds at most, instead of
+scanning the events table on a cron.
+
+Each pass reads :
+
+- the events saved since the previous pass, through the index of
+  edition_time : a created or moved event is pushed again, the entry of its
+  old date is skipped when popped,
+- the start dates entering the horizon, through the index of start_date.
+
+The start date reminded is stored in Event.reminded_start : a restarted
+process does not send the reminders again, and a moved event is reminded of
+its new date. The reminders go through a sink, the mail backend of the
+settings or a log file."""
+
+import heapq
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.mail import send_mail
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .models.contract_event import Event
+
+# reminder sent this long before the start of the event
+reminder_delay = timedelta(days=1)
+# start dates held in the heap, after the reminders due
+horizon = timedelta(days=7)
+# longest sleep, the saved events are read once per poll
+poll_interval = 60
+# the events saved this long before a pass are read again : a row is
+# committed after its edition_time
+refresh_margin = timedelta(minutes=1)
+
+
+def reminder_message(event: Event) -> tuple:
+    """(subject, body) of the reminder"""
+
+    start = timezone.localtime(event.start_date)
+    subject = f"Rappel : événement n°{event.id} le {start:%d/%m/%Y à %H:%M}"
+    lines = [
+        f"Bonjour {event.support.first_name},",
+        "",
+        f"L'événement n°{event.id} commence le {start:%d/%m/%Y à %H:%M}.",
+        f"Client : {event.customer_name}",
+        f"Adresse : {event.address}",
+        f"Participants : {event.attendees}",
+    ]
+    if event.note:
+        lines.append(f"Note : {event.note}")
+
+    return subject, "\n".join(lines)
+
+
+class MailSink:
+    """sends the reminders with the EMAIL_BACKEND of the settings,
+    'django.core.mail.backends.filebased.EmailBackend' writes them in files"""
+
+    def send(self, event: Event):
+        subject, body = reminder_message(event)
+        send_mail(subject, body, None, [event.support.email])
+
+
+class LogSink:
+    """appends one line per reminder to a file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def send(self, event: Event):
+        subject, _ = reminder_message(event)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(
+                f"{timezone.now().isoformat()} {event.support.email} {subject}\n"
+            )
+
+
+sinks = {"mail": MailSink, "log": LogSink}
+
+
+class Scheduler:
+    """heap of the reminders, with the date of the reminder of each event
+    scheduled : an entry whose date is no longer the one of its event is
+    skipped when popped"""
+
+    def __init__(
+        self,
+        sink,
+        delay: timedelta = reminder_delay,
+        horizon: timedelta = horizon,
+        poll: float = poll_interval,
+    ):
+        self.sink = sink
+        self.delay = delay
+        self.horizon = horizon
+        self.poll = poll
+        self.heap = []
+        self.due = {}
+        # start dates read up to, edition times read from
+        self.loaded_until = None
+        self.checked = None
+
+    def __len__(self) -> int:
+        return len(self.due)
+
+    def pending(self) -> QuerySet:
+        """events of a support not reminded of their start date"""
+
+        return Event.objects.filter(
+            support__isnull=False, start_date__isnull=False
+        ).exclude(reminded_start=F("start_date"))
+
+    def schedule(self, id: int, start_date: datetime):
+        remind_at = start_date - self.delay
+        if self.due.get(id) != remind_at:
+            self.due[id] = remind_at
+            heapq.heappush(self.heap, (remind_at, id))
+
+    def load(self, now: datetime):
+        """schedules the events starting up to now + delay + horizon"""
+
+        until = now + self.delay + self.horizon
+        rows = (
+            self.pending()
+            .filter(start_date__gte=self.loaded_until or now, start_date__lt=until)
+            .values_list("id", "start_date")
+        )
+        for id, start_date in rows:
+            self.schedule(id, start_date)
+        self.loaded_until = until
+
+    def refresh(self, now: datetime):
+        """schedules again the events saved since the previous pass"""
+
+        rows = Event.objects.filter(
+            edition_time__gte=self.checked - refresh_margin
+        ).values_list("id", "start_date", "support_id", "reminded_start")
+        self.checked = now
+        for id, start_date, support_id, reminded_start in rows:
+            if (
+                support_id
+                and start_date
+                and now < start_date < self.loaded_until
+                and reminded_start != start_date
+            ):
+                self.schedule(id, start_date)
+            else:
+                self.due.pop(id, None)
+
+    def send_due(self, now: datetime) -> int:
+        """sends the reminders due, number sent"""
+
+        sent = 0
+        while self.heap and self.heap[0][0] <= now:
+            remind_at, id = heapq.heappop(self.heap)
+            if self.due.get(id) != remind_at:
+                continue
+            del self.due[id]
+
+            event = (
+                self.pending()
+                .filter(id=id, start_date__gt=now)
+                .select_related("support", "contract__customer", "location")
+                .first()
+            )
+            # deleted, reminded, started or moved since the last refresh
+            if event is None:
+                continue
+            if event.start_date - self.delay != remind_at:
+                self.schedule(id, event.start_date)
+                continue
+
+            self.sink.send(event)
+            # without changing edition_time, the event is not read again
+            Event.objects.filter(id=id).update(reminded_start=event.start_date)
+            sent += 1
+
+        return sent
+
+    def run_once(self, now: datetime = None) -> int:
+        """one pass, number of reminders sent"""
+
+        now = now or timezone.now()
+        if self.checked is None:
+            self.checked = now
+        else:
+            self.refresh(now)
+        self.load(now)
+
+        return self.send_due(now)
+
+    def sleep_time(self, now: datetime = None) -> float:
+        """seconds until the next reminder, poll at most"""
+
+        if not self.heap:
+            return self.poll
+        now = now or timezone.now()
+        seconds = (self.heap[0][0] - now).total_seconds()
+
+        return min(max(seconds, 0), self.poll)
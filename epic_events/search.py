@@ -0,0 +1,205 @@
+"""Text search of the rows, through an index of their slugs.
+
+The slug of a row holds its names and the names of its related rows, see
+models/slugs.py. A search matches the rows whose slug contains every word of
+the text, which a LIKE '%word%' could only find by reading the whole table :
+
+- SQLite : each table has an FTS5 table with the trigram tokenizer, indexing
+  the substrings of the slugs. It is an external content table, kept in sync by
+  triggers on the INSERT, UPDATE and DELETE of the rows, bulk writes included.
+- PostgreSQL : a GIN index of the trigrams of the slugs, pg_trgm, serves the
+  LIKE '%word%' of the slug__contains lookups.
+
+Both are created by the migration 0028_search_index. A word shorter than a
+trigram can not be read from the indexes and is matched by a scan of the rows
+selected by the other words. On SQLite, the planner ignores how many rows a
+MATCH selects : the common words are matched by a scan in the order of the
+list, which finds a page of their many rows as soon, see is_sparse().
+
+global_search() searches several models at once : the best matches of each
+model, ranked and limited by its own index, are read by one UNION ALL. The
+search views of each model list the matches newest first instead : their
+pages are read after a cursor of (edition_time, id), see
+epic_events/views/paginator.py, and a rank would be computed for nothing."""
+
+from math import isqrt
+
+import phonenumbers
+from django.db import connections, router
+from django.db.models import ExpressionWrapper, F, FloatField, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Length
+from django.utils.text import slugify
+
+# length of the trigrams, the shortest word read from the indexes
+trigram = 3
+# matches always read from the index, see is_sparse()
+sparse_limit = 100
+# rows ranked per model by global_search()
+global_candidates = 200
+
+
+def search_table(model) -> str:
+    """FTS5 table of the slugs of the model, on SQLite"""
+
+    return f"{model._meta.db_table}_search"
+
+
+def search_terms(text: str) -> list:
+    """slugified words of the text, ex : 'Jean Dupont' -> ['jean', 'dupont']"""
+
+    return [term for term in (slugify(word) for word in text.split()) if term]
+
+
+def fts_query(terms: list) -> str:
+    """FTS5 query matching the slugs containing every term, the terms are
+    slugs and hold no quote"""
+
+    return " AND ".join(f'"{term}"' for term in terms)
+
+
+def is_sparse(model, terms: list) -> bool:
+    """whether the rows matching the terms are few enough to be read from the
+    FTS5 index and sorted : above sqrt(2 x rows) of them, the scan in the order
+    of the list finds a page of them reading fewer rows. The index is probed up
+    to that number of matches."""
+
+    table = search_table(model)
+    with connections[router.db_for_read(model)].cursor() as cursor:
+        cursor.execute(f'SELECT max(id) FROM "{model._meta.db_table}"')
+        (rows,) = cursor.fetchone()
+        limit = max(sparse_limit, isqrt(2 * (rows or 0)))
+        cursor.execute(
+            f'SELECT count(*) FROM (SELECT rowid FROM "{table}" '
+            f'WHERE "{table}" MATCH %s LIMIT %s)',
+            [fts_query(terms), limit],
+        )
+        (matches,) = cursor.fetchone()
+
+    return matches < limit
+
+
+def search_rank(terms: list):
+    """share of the slug covered by the terms, the rows named by the text come
+    before the rows naming it among other names, computed on each matching row
+    without reading the index again"""
+
+    return ExpressionWrapper(
+        Value(float(sum(len(term) for term in terms))) / Length("slug"),
+        output_field=FloatField(),
+    )
+
+
+def search(
+    model, text: str, qs: QuerySet = None, candidates: int = None, ranked: bool = True
+) -> QuerySet:
+    """rows of the model, or of the qs, whose slug contains every word of the
+    text, annotated with their search_rank and ordered from the best match.
+    candidates bounds the rows ranked when the words are common : the most
+    recent ones, found by the scan in the order of the list. Not ranked, the
+    rows are only filtered, and ordered newest first."""
+
+    if qs is None:
+        qs = model.objects.all()
+    terms = search_terms(text)
+    if not terms:
+        if not ranked:
+            return qs.order_by("-edition_time")
+        return qs.annotate(search_rank=Value(0.0)).order_by("-edition_time")
+    rank = search_rank(terms)
+
+    vendor = connections[router.db_for_read(model)].vendor
+    indexed = [term for term in terms if len(term) >= trigram]
+    sparse = vendor == "sqlite" and indexed and is_sparse(model, indexed)
+    if sparse:
+        table = search_table(model)
+        # the ids matching the indexed terms are read once from the index
+        qs = qs.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM "{table}" WHERE "{table}" MATCH %s',
+                [fts_query(indexed)],
+            )
+        )
+        terms = [term for term in terms if len(term) < trigram]
+
+    # on PostgreSQL, the trigram index serves the LIKE '%term%'
+    for term in terms:
+        qs = qs.filter(slug__contains=term)
+    if candidates is not None and not sparse:
+        newest_first = qs.order_by(F("edition_time").desc(nulls_last=True), "-id")
+        qs = qs.filter(id__in=newest_first.values("id")[:candidates])
+    if not ranked:
+        return qs.order_by("-edition_time")
+
+    return qs.annotate(search_rank=rank).order_by("-search_rank", "-edition_time")
+
+
+def phone_number(text: str) -> str:
+    """E.164 format of the text when it is a phone number, else None"""
+
+    try:
+        number = phonenumbers.parse(text, "FR")
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(number):
+        return None
+
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def global_search(text: str, limits: dict, querysets: dict = None) -> dict:
+    """{model : [rows]} of the best matches of the text in each model, limits
+    {model : number of rows}, among the global_candidates most recent matches
+    of the common words. A phone number is looked up in the phones of the
+    customers and collaborators. The rows are read from the querysets
+    {model : qs}, of the models or given, in the order of their rank."""
+
+    querysets = querysets or {}
+    phone = phone_number(text)
+    if phone is not None:
+        limits = {
+            model: limit
+            for model, limit in limits.items()
+            if hasattr(model, "phone_e164")
+        }
+
+    if not limits:
+        return {}
+    models = list(limits)
+    using = router.db_for_read(models[0])
+    branches = []
+    branches_params = []
+    for i, (model, limit) in enumerate(limits.items()):
+        if phone is not None:
+            qs = (
+                model.objects.filter(phone_e164=phone)
+                .annotate(search_rank=Value(1.0))
+                .order_by("-edition_time")
+            )
+        else:
+            qs = search(model, text, candidates=global_candidates)
+        qs = qs.annotate(model_index=Value(i)).values(
+            "id", "model_index", "search_rank"
+        )[:limit]
+        sql, params = qs.query.get_compiler(using=using).as_sql()
+        # the subqueries keep the ORDER BY and LIMIT of each model
+        branches.append(f'SELECT * FROM ({sql}) AS "search_{i}"')
+        branches_params.extend(params)
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(" UNION ALL ".join(branches), branches_params)
+        # the columns of the annotations follow the columns of the fields
+        columns = [column[0] for column in cursor.description]
+        matches = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    ids = {model: [] for model in models}
+    # the union does not keep the order of the subqueries
+    for match in sorted(matches, key=lambda match: -match["search_rank"]):
+        ids[models[match["model_index"]]].append(match["id"])
+
+    results = {}
+    for model, model_ids in ids.items():
+        rows = querysets.get(model, model.objects.all()).in_bulk(model_ids)
+        results[model] = [rows[id] for id in model_ids if id in rows]
+
+    return results
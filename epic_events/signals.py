@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import facets, typeahead
+from .models.collaborator import Collaborator
+from .models.company import Company
+from .models.contract_event import Contract, Event
+from .models.counter import Counter
+from .models.customer import Customer
+from .models.deletion import Deletion
+from .views.paginator import counts_version_key
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Collaborator)
+def invalidate_facets(sender, **kwargs):
+    """the facets count the contracts and events, and the contracts of a commercial
+    through their customer. Deleting a collaborator sets the support of its
+    events and the commercial of its customers to NULL, without signal"""
+
+    facets.invalidate()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_counts(sender, **kwargs):
+    """the cached totals of the lists count the rows of every model of the app"""
+
+    if sender._meta.app_label == "epic_events" and sender not in (Counter, Deletion):
+        facets.invalidate(counts_version_key)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Collaborator)
+def update_typeahead(sender, instance, **kwargs):
+    """the index of the process is updated once the row is committed, a rolled
+    back save is not listed"""
+
+    transaction.on_commit(lambda: typeahead.saved(instance))
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Collaborator)
+def remove_from_typeahead(sender, instance, **kwargs):
+    """the deletion is recorded in the transaction of the delete, rolled back
+    with it"""
+
+    typeahead.deleted(sender, instance.id)
@@ -0,0 +1,267 @@
+"""Typeahead of the search boxes : the customers, companies and collaborators
+whose names or email start with the typed letters.
+
+Each process holds a PrefixIndex per model, a sorted list of the normalized
+keys of the rows : a keystroke bisects it to the first key starting with the
+prefix and reads the following ones, without a query.
+
+epic_events/signals.py changes the version of the model in the cache shared
+by the processes once a row is saved or deleted, and its transaction
+committed. The bulk writes, sending no signal, change it too, see upserts.py.
+A process reads the version at most once every version_check_interval
+seconds, the keystrokes in between read its index only, and a process holding
+an older one syncs its index with the changes instead of reading the whole
+table :
+
+- the rows saved since its last sync, read through the index of
+  edition_time,
+- the rows deleted since, read from the Deletion rows written by the deletes.
+
+The index is rebuilt when it was never built, when its last sync is older
+than the deletions kept, or when the changes outnumber max_changes."""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import facets
+from .models.collaborator import Collaborator
+from .models.company import Company
+from .models.customer import Customer
+from .models.deletion import Deletion
+from .models.str_template import formatted_name
+
+# role : {model : results listed}, the models missing from the role of the
+# user are not searched, the collaborators are listed to the managers only
+role_limits = {
+    "Gestion": {Customer: 5, Company: 5, Collaborator: 5},
+    "Commercial": {Customer: 8, Company: 5},
+    "Support": {Customer: 5, Company: 3},
+}
+# changes applied by a sync, above them the index is rebuilt
+max_changes = 1000
+# the rows saved this long before a sync are read again : a row is committed
+# after its edition_time
+sync_margin = timedelta(minutes=1)
+# the Deletion rows are kept this long, an index synced before is rebuilt
+deletions_retention = timedelta(days=1)
+# seconds a process lists the rows of its index before reading the version
+# again, the writes of the process itself are listed at once
+version_check_interval = 2
+
+
+def normalize(text: str) -> str:
+    """'Éric  Dupont' -> 'eric-dupont', the keys and the prefixes compare once
+    normalized"""
+
+    return slugify(text or "")
+
+
+def name_keys(name: str) -> set:
+    """the name from each of its words : 'jean-dupont', 'dupont'"""
+
+    words = normalize(name).split("-")
+
+    return {"-".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class PrefixIndex:
+    """sorted (key, id) of the rows of a model, and the (label, keys) of each id"""
+
+    fields = ("id", "name")
+
+    def __init__(self, model):
+        self.model = model
+        self.label_lower = model._meta.label_lower
+        self.version_key = f"typeahead_version:{self.label_lower}"
+        # version of the cache the index is synced with, None to rebuild it
+        self.version = None
+        # edition_time the rows are read from
+        self.synced = None
+        # time.monotonic() of the last read of the version
+        self.checked = None
+        # (items, rows) replaced as a whole by the syncs : the keystrokes
+        # read them without lock
+        self.entries = ([], {})
+        self.lock = threading.Lock()
+
+    def keys(self, values: dict) -> set:
+        return name_keys(values["name"])
+
+    def label(self, values: dict) -> str:
+        return values["name"].capitalize()
+
+    def add(self, items: list, rows: dict, values: dict):
+        keys = self.keys(values)
+        rows[values["id"]] = (self.label(values), keys)
+        for key in keys:
+            insort(items, (key, values["id"]))
+
+    def discard(self, items: list, rows: dict, id: int):
+        _, keys = rows.pop(id, (None, ()))
+        for key in keys:
+            del items[bisect_left(items, (key, id))]
+
+    def rebuild(self, version: str):
+        synced = timezone.now()
+        items = []
+        rows = {}
+        for values in self.model._base_manager.values(*self.fields).iterator():
+            keys = self.keys(values)
+            rows[values["id"]] = (self.label(values), keys)
+            items.extend((key, values["id"]) for key in keys)
+        items.sort()
+
+        self.entries = (items, rows)
+        self.version, self.synced = version, synced
+
+    def sync(self, version: str):
+        """applies the rows saved and deleted since the last sync, rebuilds the
+        index when they are unknown or too many"""
+
+        synced = timezone.now()
+        if self.version is None or self.synced < synced - deletions_retention:
+            return self.rebuild(version)
+
+        since = self.synced - sync_margin
+        deleted = list(
+            Deletion.objects.filter(
+                model=self.label_lower, time__gte=since
+            ).values_list("row_id", flat=True)[: max_changes + 1]
+        )
+        saved = list(
+            self.model._base_manager.filter(edition_time__gte=since).values(
+                *self.fields
+            )[: max_changes + 1]
+        )
+        # the bulk writes of many rows
+        if len(deleted) + len(saved) > max_changes:
+            return self.rebuild(version)
+
+        # the keystrokes read the previous entries meanwhile
+        items, rows = self.entries
+        items, rows = items.copy(), rows.copy()
+        for id in deleted:
+            self.discard(items, rows, id)
+        for values in saved:
+            self.discard(items, rows, values["id"])
+            self.add(items, rows, values)
+
+        self.entries = (items, rows)
+        self.version, self.synced = version, synced
+
+    def deleted(self, id: int):
+        """records the row deleted in the transaction of the delete, the
+        processes remove it on their next sync"""
+
+        now = timezone.now()
+        Deletion.objects.create(model=self.label_lower, row_id=id, time=now)
+        Deletion.objects.filter(
+            model=self.label_lower, time__lt=now - deletions_retention
+        ).delete()
+        transaction.on_commit(self.changed)
+
+    def changed(self):
+        """changes the version : the processes sync their index once they read
+        it, this one on its next keystroke"""
+
+        facets.invalidate(self.version_key)
+        self.checked = None
+
+    def refresh(self):
+        """syncs the index when the version changed, read by one of the
+        concurrent keystrokes while the others list the current index"""
+
+        if not self.lock.acquire(blocking=self.version is None):
+            return
+        try:
+            now = time.monotonic()
+            if self.checked is None or now - self.checked >= version_check_interval:
+                version = facets.version(self.version_key)
+                if version != self.version:
+                    self.sync(version)
+                self.checked = now
+        finally:
+            self.lock.release()
+
+    def search(self, prefix: str, limit: int) -> list:
+        """[(id, label)] of the first rows with a key starting with the prefix"""
+
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        checked = self.checked
+        if checked is None or time.monotonic() - checked >= version_check_interval:
+            self.refresh()
+
+        items, rows = self.entries
+        results = {}
+        i = bisect_left(items, (prefix,))
+        while i < len(items) and len(results) < limit:
+            key, id = items[i]
+            if not key.startswith(prefix):
+                break
+            results.setdefault(id, rows[id][0])
+            i += 1
+
+        return list(results.items())
+
+
+class UserPrefixIndex(PrefixIndex):
+    """the names, in both orders, and the email of the customers and
+    collaborators"""
+
+    fields = ("id", "first_name", "last_name", "email")
+
+    def keys(self, values: dict) -> set:
+        first_name, last_name = values["first_name"], values["last_name"]
+
+        return (
+            name_keys(f"{first_name} {last_name}")
+            | name_keys(f"{last_name} {first_name}")
+            | {normalize(values["email"])}
+        )
+
+    def label(self, values: dict) -> str:
+        name = formatted_name(values["first_name"], values["last_name"])
+
+        return f"{name} <{values['email']}>"
+
+
+indexes = {
+    Customer: UserPrefixIndex(Customer),
+    Company: PrefixIndex(Company),
+    Collaborator: UserPrefixIndex(Collaborator),
+}
+
+
+def saved(obj):
+    indexes[type(obj)].changed()
+
+
+def deleted(model, id: int):
+    indexes[model].deleted(id)
+
+
+def invalidate(model):
+    """the rows of the model were written without signal, with a new
+    edition_time : every process syncs its index"""
+
+    if model in indexes:
+        indexes[model].changed()
+
+
+def typeahead(role: str, prefix: str) -> dict:
+    """{model : [(id, label)]} of the rows starting with the prefix, as many as
+    the role of the user lists"""
+
+    return {
+        model: indexes[model].search(prefix, limit)
+        for model, limit in role_limits.get(role, {}).items()
+    }
@@ -0,0 +1,77 @@
+"""Deduplication of the departments, companies and locations.
+
+Their rows are unique by slug_form, the normalized name or address built by
+build_slug_form() : finding the existing row is one indexed lookup, and the
+unique index settles concurrent creations, the request losing the race
+reads the row of the winner instead of creating a duplicate."""
+
+from django.db import IntegrityError, models, transaction
+
+from . import typeahead
+from .models.slugs import refresh_slugs
+
+
+def normalized_key(model, **values) -> str:
+    return model(**values).build_slug_form()
+
+
+def get_or_create(model, **values) -> tuple:
+    """(row with the normalized key of the values, created), one indexed lookup
+    or one INSERT"""
+
+    return model.objects.get_or_create(
+        slug_form=normalized_key(model, **values), defaults=values
+    )
+
+
+def save_or_get(obj: models.Model) -> tuple:
+    """(obj, True) once saved, (existing row, False) when another row has its
+    normalized key"""
+
+    try:
+        with transaction.atomic():
+            obj.save()
+    except IntegrityError:
+        existing = (
+            type(obj)
+            .objects.filter(slug_form=obj.build_slug_form())
+            .exclude(pk=obj.pk)
+            .first()
+        )
+        if existing is None:
+            raise
+        return existing, False
+
+    return obj, True
+
+
+def upsert(model, rows: list, update_fields: list = None) -> int:
+    """inserts the rows, dicts of values, with one INSERT ... ON CONFLICT, the
+    rows whose key exists update their update_fields, number of rows"""
+
+    objs = []
+    for values in rows:
+        obj = model(**values)
+        obj.compute_columns()
+        objs.append(obj)
+
+    with transaction.atomic():
+        if update_fields:
+            model.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["slug_form"],
+                # the rows updated are read again by the typeahead indexes
+                update_fields=[*update_fields, "edition_time"],
+            )
+        else:
+            model.objects.bulk_create(objs, ignore_conflicts=True)
+
+        # the slugs hold the ids, unknown before the INSERT
+        refresh_slugs(
+            model.objects.filter(slug_form__in=[obj.slug_form for obj in objs])
+        )
+        # the bulk writes send no signal
+        transaction.on_commit(lambda: typeahead.invalidate(model))
+
+    return len(objs)
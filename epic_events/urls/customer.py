@@ -4,7 +4,9 @@ from ..views.customer import (
     CreateView,
     DeleteView,
     DetailView,
+    DuplicatesView,
     ListView,
+    MergeView,
     MyListView,
     SearchView,
     UpdateView,
@@ -43,4 +45,14 @@ urlpatterns = [
         DeleteView.as_view(),
         name=model.delete_url_name(),
     ),
+    path(
+        f"{model.plural_name()}/duplicates/",
+        DuplicatesView.as_view(),
+        name="customer_duplicates",
+    ),
+    path(
+        f"{model.plural_name()}/duplicates/<int:id>/merge/",
+        MergeView.as_view(),
+        name="merge_customers",
+    ),
 ]
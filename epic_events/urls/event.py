@@ -1,11 +1,14 @@
 from django.urls import path
 
 from ..views.event import (
+    AssignSupportsView,
+    CalendarView,
     ChangeSupportView,
+    ConflictsView,
     CreateView,
     DeleteView,
     DetailView,
-    ListEventsWithoutSupport,
+    FeedView,
     ListView,
     MyListView,
     SearchView,
@@ -21,9 +24,24 @@ urlpatterns = [
     ),
     path(f"{model.plural_name()}/", ListView.as_view(), name=model.plural_name()),
     path(
-        f"{model.plural_name()}/without_support/",
-        ListEventsWithoutSupport.as_view(),
-        name=f"{model.plural_name()}_without_support",
+        f"collaborators/<int:id>/{model.plural_name()}.ics",
+        FeedView.as_view(),
+        name="event_feed",
+    ),
+    path(
+        f"{model.plural_name()}/calendar/",
+        CalendarView.as_view(),
+        name="event_calendar",
+    ),
+    path(
+        f"{model.plural_name()}/assign_supports/",
+        AssignSupportsView.as_view(),
+        name="assign_supports",
+    ),
+    path(
+        f"{model.plural_name()}/conflicts/",
+        ConflictsView.as_view(),
+        name="event_conflicts",
     ),
     path(
         f"{model.plural_name()}/<str:search>/search/",
@@ -5,6 +5,7 @@ from ..views.location import (
     DeleteView,
     DetailView,
     ListView,
+    NearbyView,
     SearchView,
     UpdateView,
     model,
@@ -12,6 +13,11 @@ from ..views.location import (
 
 urlpatterns = [
     path(f"{model.plural_name()}/", ListView.as_view(), name=model.plural_name()),
+    path(
+        f"{model.plural_name()}/nearby/",
+        NearbyView.as_view(),
+        name=f"nearby_{model.plural_name()}",
+    ),
     path(
         f"{model.plural_name()}/<str:search>/search/",
         SearchView.as_view(),
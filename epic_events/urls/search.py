@@ -0,0 +1,7 @@
+from django.urls import path
+
+from ..views.search import GlobalSearchView
+
+urlpatterns = [
+    path("find/", GlobalSearchView.as_view(), name="global_search"),
+]
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from ..views.typeahead import TypeaheadView
+
+urlpatterns = [
+    path("typeahead/", TypeaheadView.as_view(), name="typeahead"),
+]
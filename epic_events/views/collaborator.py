@@ -2,9 +2,9 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model, login, logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
 from django.views import View
 
+from ..filters import FilterError
 from ..forms.collaborator import (
     ChangePasswordForm,
     CollaboratorForm,
@@ -14,18 +14,12 @@ from ..forms.collaborator import (
 )
 from ..forms.department import DepartmentForm
 from ..forms.search import SearchForm
-from ..models.contract_event import (
-    contracts,
-    contracts_ready_for_event,
-    events,
-    events_without_support,
-    unpaid_contracts,
-    unsigned_contracts,
-)
-from ..models.customer import Customer
+from ..models.counter import Counter
 from ..models.department import Department
 from ..permissions import ManagerRequiredMixin
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from ..upserts import get_or_create
+from .paginator import cached_count, paginator
 
 login_permission = LoginRequiredMixin
 change_password_permission = login_permission
@@ -141,26 +135,24 @@ class HomeView(login_permission, View):
     template_name = "collaborator/home.html"
 
     def get(self, request, *args, **kwargs):
+        counters, my_counters = Counter.objects.for_home(request.user.id)
+
         context = {
-            "all_customers": Customer.objects.all().count(),
-            "all_contracts": len(contracts()),
-            "all_events": len(events()),
+            "all_customers": counters.customers,
+            "all_contracts": counters.contracts,
+            "all_events": counters.events,
         }
 
         if request.user.role == "Commercial":
-            my_unsigned_contracts = len(unsigned_contracts(request.user))
-            my_unpaid_contracts = len(unpaid_contracts(request.user))
-            my_events_to_create = len(contracts_ready_for_event(request.user))
-
-            context["my_unsigned_contracts"] = my_unsigned_contracts
-            context["my_unpaid_contracts"] = my_unpaid_contracts
-            context["my_events_to_create"] = my_events_to_create
+            context["my_unsigned_contracts"] = my_counters.unsigned_contracts
+            context["my_unpaid_contracts"] = my_counters.unpaid_contracts
+            context["my_events_to_create"] = my_counters.contracts_ready_for_event
 
         if request.user.role == "Gestion":
-            context["events_without_support"] = len(events_without_support())
+            context["events_without_support"] = counters.events_without_support
 
         if request.user.role == "Support":
-            context["my_events"] = len(events(support=request.user))
+            context["my_events"] = my_counters.events
 
         return render(request, self.template_name, context)
 
@@ -170,7 +162,7 @@ class ListView(crud_permission, View):
     form = SearchForm
 
     def get(self, request, *args, **kwargs):
-        collaborators = get_user_model().objects.all().order_by("-edition_time")
+        collaborators = get_user_model().objects.for_list().order_by("-edition_time")
         page_obj = paginator(request, collaborators)
 
         return render(
@@ -178,7 +170,10 @@ class ListView(crud_permission, View):
             self.template_name,
             {
                 "page_obj": page_obj,
-                "form": self.form(placeholder="Rechercher collaborateur"),
+                "form": self.form(
+                    placeholder="Rechercher collaborateur",
+                    title=search_syntax(get_user_model()),
+                ),
             },
         )
 
@@ -195,25 +190,26 @@ class SearchView(crud_permission, View):
     form = SearchForm
 
     def get(self, request, search, *args, **kwargs):
-        collaborators = (
-            get_user_model()
-            .objects.filter(slug__contains=slugify(search))
-            .order_by("-edition_time")
-        )
-
-        if len(collaborators) < 2:
-            messages.info(request, f" ℹ️ {len(collaborators)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(collaborators)} résultats trouvés.")
+        try:
+            collaborators = search_query(
+                get_user_model(), search, get_user_model().objects.for_list()
+            )
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect("collaborators")
 
-        page_obj = paginator(request, collaborators)
+        page_obj = paginator(request, collaborators, count=cached_count)
+        messages.info(request, page_obj.total.results_message())
 
         return render(
             request,
             self.template_name,
             {
                 "page_obj": page_obj,
-                "form": self.form(placeholder="Rechercher collaborateur"),
+                "form": self.form(
+                    placeholder="Rechercher collaborateur",
+                    title=search_syntax(get_user_model()),
+                ),
             },
         )
 
@@ -229,19 +225,9 @@ class DetailView(login_permission, View):
     template_name = "collaborator/detail.html"
 
     def get(self, request, id, *args, **kwargs):
-        collaborator = get_object_or_404(get_user_model(), id=id)
-        my_customers = Customer.objects.filter(commercial=collaborator)
-        my_events = events(support=collaborator)
+        collaborator = get_object_or_404(get_user_model().objects.with_stats(), id=id)
 
-        return render(
-            request,
-            self.template_name,
-            {
-                "collaborator": collaborator,
-                "customers": my_customers,
-                "events": my_events,
-            },
-        )
+        return render(request, self.template_name, {"collaborator": collaborator})
 
 
 class CreateView(crud_permission, View):
@@ -266,15 +252,9 @@ class CreateView(crud_permission, View):
         if all([collaborator_form.is_valid(), department_form.is_valid()]):
             collaborator = collaborator_form.save(commit=False)
 
-            # check if department exists
-            qs = Department.objects.filter(name=department_form.cleaned_data["name"])
-            if qs:
-                department = qs[0]
-            else:
-                department = department_form.save()
-                department.save()
-
-            collaborator.department = department
+            collaborator.department, _ = get_or_create(
+                Department, name=department_form.cleaned_data["name"]
+            )
             collaborator.save()
 
             messages.success(
@@ -326,15 +306,9 @@ class UpdateView(crud_permission, View):
         if all([collaborator_form.is_valid(), department_form.is_valid()]):
             collaborator = collaborator_form.save(commit=False)
 
-            # check if department exists
-            qs = Department.objects.filter(name=department_form.cleaned_data["name"])
-            if qs:
-                department = qs[0]
-            else:
-                department = Department(name=department_form.cleaned_data["name"])
-                department.save()
-
-            collaborator.department = department
+            collaborator.department, _ = get_or_create(
+                Department, name=department_form.cleaned_data["name"]
+            )
             collaborator.save()
 
             messages.success(
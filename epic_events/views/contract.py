@@ -1,20 +1,21 @@
 from django.contrib import messages
-from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
 from django.views import View
 
+from ..facets import cached_facets
+from ..filters import ContractFilter, FilterError, FilterSet
 from ..forms.contract import ContractForm
 from ..forms.customer import CustomerForm
 from ..forms.search import SearchForm
-from ..models.contract_event import Contract, Event, contracts
+from ..models.contract_event import Contract, contract_facets, contracts
 from ..models.customer import Customer
 from ..permissions import (
     LoginRequiredMixin,
     ManagerOrCommercialContractRequiredMixin,
     ManagerRequiredMixin,
 )
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from .paginator import cached_count, paginator
 
 model = Contract
 model_form = ContractForm
@@ -37,9 +38,21 @@ context = {
     "create_url_name": model.create_url_name(),
     "update_url_name": model.update_url_name(),
     "delete_url_name": model.delete_url_name(),
-    "form": search_form(placeholder=f"Rechercher {model.french_name().lower()}"),
+    "form": search_form(
+        placeholder=f"Rechercher {model.french_name().lower()}",
+        title=search_syntax(model),
+    ),
 }
 
+# (facet, label, query string) of the filter menus
+filters = [
+    ("signed_paid", "signés et payés", "signed=1&paid=1"),
+    ("signed_unpaid", "signés et non payés", "signed=1&paid=0"),
+    ("unsigned_paid", "non signés et payés", "signed=0&paid=1"),
+    ("unsigned_unpaid", "non signés et non payés", "signed=0&paid=0"),
+    ("ready_for_event", "événements à créer", "ready_for_event=1"),
+]
+
 
 class SearchPostMixin(View):
     def post(self, request, *args, **kwargs):
@@ -50,46 +63,68 @@ class SearchPostMixin(View):
             return redirect(model.search_url_name(), search=form.cleaned_data["search"])
 
 
+def filter_menus(commercial_id: int):
+    """facet counts of all the contracts and of the user contracts"""
+
+    facets = cached_facets(contract_facets, commercial_id)
+    context["facets"] = facets
+    context["filters"] = [
+        (label, query, facets[facet], facets[f"my_{facet}"])
+        for facet, label, query in filters
+    ]
+
+
+def filtered_list(request, filterset: FilterSet):
+    """renders the contracts matching the query string, an invalid filter
+    redirects to the list without filter"""
+
+    try:
+        qs = filterset.filter(contracts())
+    except FilterError as error:
+        messages.error(request, f" ❌ Filtre invalide : {error}.")
+        return redirect(request.path)
+
+    filter_menus(request.user.id)
+    context["filter_query"] = filterset.urlencode()
+    # the filtered totals are counted exactly, once per version of the data
+    context["page_obj"] = paginator(request, qs.rows(), count=cached_count)
+
+    return render(request, model.template_name_list(), context)
+
+
 class MyListView(read_permission, SearchPostMixin):
     def get(self, request, id, *args, **kwargs):
-        obj = get_object_or_404(get_user_model(), id=id)
-        qs = contracts(commercial=obj)
-        context["page_obj"] = paginator(request, qs)
-
-        return render(request, model.template_name_list(), context)
+        return filtered_list(request, ContractFilter(request.GET, commercial=id))
 
 
 class ListView(read_permission, SearchPostMixin):
     def get(self, request, *args, **kwargs):
-        qs = contracts()
-        context["page_obj"] = paginator(request, qs)
-
-        return render(request, model.template_name_list(), context)
+        return filtered_list(request, ContractFilter(request.GET))
 
 
 class SearchView(read_permission, SearchPostMixin):
     def get(self, request, search, *args, **kwargs):
-        qs = model.objects.filter(slug__contains=slugify(search)).order_by(
-            "-edition_time"
-        )
-
-        if len(qs) < 2:
-            messages.info(request, f" ℹ️ {len(qs)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(qs)} résultats trouvés.")
+        try:
+            qs = search_query(model, search, model.objects.for_list())
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect(model.plural_name())
 
-        context["page_obj"] = paginator(request, qs)
+        filter_menus(request.user.id)
+        context["filter_query"] = ""
+        context["page_obj"] = paginator(request, qs.rows(), count=cached_count)
+        messages.info(request, context["page_obj"].total.results_message())
 
         return render(request, model.template_name_list(), context)
 
 
 class DetailView(read_permission, View):
     def get(self, request, id, *args, **kwargs):
-        context["obj"] = get_object_or_404(model, id=id)
-        qs = Event.objects.filter(contract=context["obj"])
-
-        if qs:
-            context["event"] = qs[0]
+        context["obj"] = get_object_or_404(
+            model.objects.with_event_flag().select_related("event"), id=id
+        )
+        # reverse one-to-one : AttributeError when the contract has no event
+        context["event"] = getattr(context["obj"], "event", None)
 
         return render(request, model.template_name_detail(), context)
 
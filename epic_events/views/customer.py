@@ -1,17 +1,21 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
 from django.views import View
 
+from ..duplicates import merge_customers
+from ..filters import FilterError
 from ..forms.company import CompanyForm
 from ..forms.customer import CustomerForm
 from ..forms.search import SearchForm
 from ..models.company import Company
 from ..models.contract_event import Contract
 from ..models.customer import Customer
+from ..models.duplicate import DuplicateCustomer
 from ..permissions import CommercialRequiredMixin, LoginRequiredMixin
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from ..upserts import get_or_create
+from .paginator import cached_count, paginator
 
 model = Customer
 model_form = CustomerForm
@@ -21,6 +25,11 @@ relation_form = CompanyForm
 
 search_form = SearchForm
 
+# number of contracts listed in 'customer/detail.html'
+preview_size = 10
+# number of pairs listed in 'customer/duplicates.html'
+duplicates_size = 50
+
 read_permission = LoginRequiredMixin
 crud_permission = CommercialRequiredMixin
 
@@ -32,7 +41,10 @@ context = {
     "create_url_name": model.create_url_name(),
     "update_url_name": model.update_url_name(),
     "delete_url_name": model.delete_url_name(),
-    "form": search_form(placeholder=f"Rechercher {model.french_name().lower()}"),
+    "form": search_form(
+        placeholder=f"Rechercher {model.french_name().lower()}",
+        title=search_syntax(model),
+    ),
 }
 
 
@@ -49,40 +61,40 @@ class SearchPostMixin(View):
 class MyListView(read_permission, SearchPostMixin):
     def get(self, request, id, *args, **kwargs):
         obj = get_object_or_404(get_user_model(), id=id)
-        qs = model.objects.filter(commercial=obj).order_by("-edition_time")
-        context["page_obj"] = paginator(request, qs)
+        qs = model.objects.for_list().filter(commercial=obj).order_by("-edition_time")
+        context["page_obj"] = paginator(request, qs.rows())
 
         return render(request, model.template_name_list(), context)
 
 
 class ListView(read_permission, SearchPostMixin):
     def get(self, request, *args, **kwargs):
-        qs = model.objects.all().order_by("-edition_time")
-        context["page_obj"] = paginator(request, qs)
+        qs = model.objects.for_list().order_by("-edition_time")
+        context["page_obj"] = paginator(request, qs.rows())
 
         return render(request, model.template_name_list(), context)
 
 
 class SearchView(read_permission, SearchPostMixin):
     def get(self, request, search, *args, **kwargs):
-        qs = model.objects.filter(slug__contains=slugify(search)).order_by(
-            "-edition_time"
-        )
-
-        if len(qs) < 2:
-            messages.info(request, f" ℹ️ {len(qs)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(qs)} résultats trouvés.")
+        try:
+            qs = search_query(model, search, model.objects.for_list())
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect(model.plural_name())
 
-        context["page_obj"] = paginator(request, qs)
+        context["page_obj"] = paginator(request, qs.rows(), count=cached_count)
+        messages.info(request, context["page_obj"].total.results_message())
 
         return render(request, model.template_name_list(), context)
 
 
 class DetailView(read_permission, View):
     def get(self, request, id, *args, **kwargs):
-        obj = get_object_or_404(model, id=id)
-        contracts = Contract.objects.filter(customer=obj).order_by("-edition_time")
+        obj = get_object_or_404(model.objects.with_stats(), id=id)
+        contracts = Contract.objects.filter(customer=obj).order_by("-edition_time")[
+            :preview_size
+        ]
 
         return render(
             request,
@@ -117,15 +129,9 @@ class CreateView(crud_permission, View):
             obj = form1.save(commit=False)
             obj.commercial = request.user
 
-            # check if customer company exists
-            qs = relation_model.objects.filter(
-                slug__contains=slugify(form2.cleaned_data["name"])
+            obj.company, _ = get_or_create(
+                relation_model, name=form2.cleaned_data["name"]
             )
-            if qs:
-                obj.company = qs[0]
-            else:
-                company = form2.save()
-                obj.company = company
 
             obj.save()
             messages.success(
@@ -173,14 +179,9 @@ class UpdateView(crud_permission, View):
             obj = form1.save(commit=False)
             obj.commercial = request.user
 
-            # check if customer company exists
-            qs = relation_model.objects.filter(
-                slug__contains=slugify(form2.cleaned_data["name"])
+            obj.company, _ = get_or_create(
+                relation_model, name=form2.cleaned_data["name"]
             )
-            if qs:
-                obj.company = qs[0]
-            else:
-                obj.company = form2.save()
 
             obj.save()
             messages.success(
@@ -229,3 +230,52 @@ class DeleteView(crud_permission, View):
         )
 
         return redirect(f"{model.plural_name()}")
+
+
+class DuplicatesView(crud_permission, View):
+    template_name = "customer/duplicates.html"
+
+    def get(self, request, *args, **kwargs):
+        """the best pairs found by the 'find_duplicate_customers' command"""
+
+        duplicates = DuplicateCustomer.objects.select_related(
+            "customer__company", "duplicate__company"
+        ).order_by("-score", "id")[:duplicates_size]
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "title": f"{model.french_plural_name()} en double",
+                "duplicates": duplicates,
+            },
+        )
+
+
+class MergeView(crud_permission, View):
+    def post(self, request, id, *args, **kwargs):
+        """merge of the pair into the customer kept"""
+
+        pair = get_object_or_404(
+            DuplicateCustomer.objects.select_related("customer", "duplicate"), id=id
+        )
+        customers = {
+            str(pair.customer.id): pair.customer,
+            str(pair.duplicate.id): pair.duplicate,
+        }
+        kept = customers.pop(request.POST.get("kept"), None)
+        if kept is None:
+            messages.error(request, " ❌ Choisissez le client à conserver.")
+            return redirect("customer_duplicates")
+
+        (duplicate,) = customers.values()
+        duplicate_id = duplicate.id
+        moved = merge_customers(kept, duplicate)
+        messages.success(
+            request,
+            f" ✅ {model.french_name()} identifiant n°{duplicate_id} a été fusionné avec "
+            f"{model.french_name().lower()} identifiant n°{kept.id}, "
+            f"{moved} contrat(s) déplacé(s) !",
+        )
+
+        return redirect("customer_duplicates")
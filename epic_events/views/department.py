@@ -1,14 +1,16 @@
 from django.contrib import messages
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
 from django.views import View
 
+from ..filters import FilterError
 from ..forms.department import DepartmentForm
 from ..forms.search import SearchForm
 from ..models.collaborator import Collaborator
 from ..models.department import Department
 from ..permissions import ManagerRequiredMixin
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from ..upserts import get_or_create, save_or_get
+from .paginator import cached_count, paginator
 
 model = Department
 model_form = DepartmentForm
@@ -23,7 +25,10 @@ context = {
     "create_url_name": model.create_url_name(),
     "update_url_name": model.update_url_name(),
     "delete_url_name": model.delete_url_name(),
-    "form": search_form(placeholder=f"Rechercher {model.french_name().lower()}"),
+    "form": search_form(
+        placeholder=f"Rechercher {model.french_name().lower()}",
+        title=search_syntax(model),
+    ),
 }
 
 
@@ -47,16 +52,14 @@ class ListView(crud_permission, SearchPostMixin):
 
 class SearchView(crud_permission, SearchPostMixin):
     def get(self, request, search, *args, **kwargs):
-        qs = model.objects.filter(slug__contains=slugify(search)).order_by(
-            "-edition_time"
-        )
-
-        if len(qs) < 2:
-            messages.info(request, f" ℹ️ {len(qs)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(qs)} résultats trouvés.")
+        try:
+            qs = search_query(model, search)
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect(model.plural_name())
 
-        context["page_obj"] = paginator(request, qs)
+        context["page_obj"] = paginator(request, qs, count=cached_count)
+        messages.info(request, context["page_obj"].total.results_message())
 
         return render(request, model.template_name_list(), context)
 
@@ -80,16 +83,13 @@ class CreateView(crud_permission, View):
         form = model_form(request.POST)
 
         if form.is_valid():
-            qs = model.objects.filter(slug__contains=slugify(form.cleaned_data["name"]))
-            if qs:
-                obj = qs[0]
+            obj, created = get_or_create(model, **form.cleaned_data)
+            if not created:
                 messages.info(
                     request,
                     f" ℹ️ {model.french_name()} identifiant n°{obj.id} existe déjà.",
                 )
             else:
-                obj = form.save()
-                obj.save()
                 messages.success(
                     request,
                     f" ✅ {model.french_name()} identifiant n°{obj.id} a été créé avec succès !",
@@ -124,16 +124,13 @@ class UpdateView(crud_permission, View):
         form = model_form(request.POST, instance=obj)
 
         if form.is_valid():
-            qs = model.objects.filter(slug__contains=slugify(form.cleaned_data["name"]))
-            if qs:
-                obj = qs[0]
+            obj, saved = save_or_get(form.save(commit=False))
+            if not saved:
                 messages.info(
                     request,
                     f" ℹ️ {model.french_name()} identifiant n°{obj.id} existe déjà.",
                 )
             else:
-                obj = form.save()
-                obj.save()
                 messages.success(
                     request,
                     f" ✅ {model.french_name()} identifiant n°{obj.id} a été modifié avec succès !",
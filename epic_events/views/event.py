@@ -1,14 +1,37 @@
+from datetime import timedelta
+
 from django.contrib import messages
-from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
 from django.views import View
 
+from ..agenda import (
+    calendar_days,
+    day_value,
+    events_between,
+    feed_events,
+    feed_lines,
+    feed_signature,
+    feed_state,
+    period,
+    periods,
+)
+from ..assignment import apply_assignments, propose_assignments
+from ..conflicts import quarter, support_conflicts
+from ..facets import cached_facets
+from ..filters import EventFilter, FilterError, FilterSet, parse_datetime_value
 from ..forms.contract import ContractForm
 from ..forms.event import ChangeSupportForm, EventForm
 from ..forms.location import LocationForm
 from ..forms.search import SearchForm
-from ..models.contract_event import Contract, Event, events, events_without_support
+from ..models.collaborator import Collaborator
+from ..models.contract_event import Contract, Event, event_facets, events
 from ..models.location import Location
 from ..permissions import (
     CommercialEventRequiredMixin,
@@ -16,7 +39,9 @@ from ..permissions import (
     LoginRequiredMixin,
     ManagerRequiredMixin,
 )
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from ..upserts import get_or_create
+from .paginator import cached_count, paginator
 
 model = Event
 model_form = EventForm
@@ -45,9 +70,15 @@ context = {
     "create_url_name": model.create_url_name(),
     "update_url_name": model.update_url_name(),
     "delete_url_name": model.delete_url_name(),
-    "form": search_form(placeholder=f"Rechercher {model.french_name().lower()}"),
+    "form": search_form(
+        placeholder=f"Rechercher {model.french_name().lower()}",
+        title=search_syntax(model),
+    ),
 }
 
+# (facet, label, query string) of the filter menus
+filters = [("without_support", "sans support", "support=none")]
+
 
 class SearchPostMixin(View):
     def post(self, request, *args, **kwargs):
@@ -58,43 +89,57 @@ class SearchPostMixin(View):
             return redirect(model.search_url_name(), search=form.cleaned_data["search"])
 
 
-class MyListView(read_permission, SearchPostMixin):
-    def get(self, request, id, *args, **kwargs):
-        obj = get_object_or_404(get_user_model(), id=id)
-        qs = events(support=obj)
-        context["page_obj"] = paginator(request, qs)
+def filter_menus(support_id: int):
+    """facet counts of all the events and of the user events"""
 
-        return render(request, model.template_name_list(), context)
+    facets = cached_facets(event_facets, support_id)
+    context["facets"] = facets
+    context["filters"] = [
+        (label, query, facets[facet], facets[f"my_{facet}"])
+        for facet, label, query in filters
+    ]
 
 
-class ListEventsWithoutSupport(read_permission, SearchPostMixin):
-    def get(self, request, *args, **kwargs):
-        qs = events_without_support()
-        context["page_obj"] = paginator(request, qs)
+def filtered_list(request, filterset: FilterSet):
+    """renders the events matching the query string, an invalid filter
+    redirects to the list without filter"""
 
-        return render(request, model.template_name_list(), context)
+    try:
+        qs = filterset.filter(events())
+    except FilterError as error:
+        messages.error(request, f" ❌ Filtre invalide : {error}.")
+        return redirect(request.path)
+
+    filter_menus(request.user.id)
+    context["filter_query"] = filterset.urlencode()
+    # the filtered totals are counted exactly, once per version of the data
+    context["page_obj"] = paginator(request, qs.rows(), count=cached_count)
+
+    return render(request, model.template_name_list(), context)
+
+
+class MyListView(read_permission, SearchPostMixin):
+    def get(self, request, id, *args, **kwargs):
+        return filtered_list(request, EventFilter(request.GET, support=id))
 
 
 class ListView(read_permission, SearchPostMixin):
     def get(self, request, *args, **kwargs):
-        qs = events()
-        context["page_obj"] = paginator(request, qs)
-
-        return render(request, model.template_name_list(), context)
+        return filtered_list(request, EventFilter(request.GET))
 
 
 class SearchView(read_permission, SearchPostMixin):
     def get(self, request, search, *args, **kwargs):
-        qs = model.objects.filter(slug__contains=slugify(search)).order_by(
-            "-edition_time"
-        )
-
-        if len(qs) < 2:
-            messages.info(request, f" ℹ️ {len(qs)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(qs)} résultats trouvés.")
+        try:
+            qs = search_query(model, search, model.objects.for_list())
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect(model.plural_name())
 
-        context["page_obj"] = paginator(request, qs)
+        filter_menus(request.user.id)
+        context["filter_query"] = ""
+        context["page_obj"] = paginator(request, qs.rows(), count=cached_count)
+        messages.info(request, context["page_obj"].total.results_message())
 
         return render(request, model.template_name_list(), context)
 
@@ -129,19 +174,8 @@ class CreateView(create_permission, View):
             obj1 = form1.save(commit=False)
             obj1.contract = get_object_or_404(relation1_model, id=id)
 
-            # check if location exists
-            qs = relation2_model.objects.filter(
-                slug_form=form2.cleaned_data["slug_form"]
-            )
-            if qs:
-                obj2 = qs[0]
-                obj1.location = obj2
-            else:
-                obj2 = form2.save()
-                obj1.location = obj2
-
+            obj1.location, _ = get_or_create(relation2_model, **form2.location_values())
             obj1.save()
-            obj2.save()
 
             messages.success(
                 request,
@@ -184,24 +218,7 @@ class UpdateView(update_permission, View):
         if all([form1.is_valid(), form2.is_valid()]):
             form1.save()
 
-            # check if location exists
-            qs = relation2_model.objects.filter(
-                slug_form=form2.cleaned_data["slug_form"]
-            )
-            if qs:
-                obj.location = qs[0]
-            else:
-                new_location = Location(
-                    name=form2.cleaned_data["name"],
-                    number=form2.cleaned_data["number"],
-                    street_type=form2.cleaned_data["street_type"],
-                    street_name=form2.cleaned_data["street_name"],
-                    city=form2.cleaned_data["city"],
-                    zip=form2.cleaned_data["zip"],
-                )
-                new_location.save()
-                obj.location = new_location
-
+            obj.location, _ = get_or_create(relation2_model, **form2.location_values())
             obj.save()
 
             messages.success(
@@ -249,6 +266,73 @@ class DeleteView(delete_permission, View):
         return redirect(f"{model.plural_name()}")
 
 
+class ConflictsView(change_support_permission, View):
+    def get(self, request, *args, **kwargs):
+        """events of a same support overlapping during the quarter, or between
+        '?start=2026-07-01&end=2026-10-01'"""
+
+        start, end = quarter()
+        try:
+            if request.GET.get("start"):
+                start = parse_datetime_value(request.GET["start"])
+            if request.GET.get("end"):
+                end = parse_datetime_value(request.GET["end"])
+        except FilterError as error:
+            messages.error(request, f" ❌ Filtre invalide : {error}.")
+            return redirect(request.path)
+
+        return render(
+            request,
+            "event/conflicts.html",
+            {
+                "title": "Conflits des supports",
+                "conflicts": support_conflicts(start, end),
+                "start": start,
+                "end": end,
+            },
+        )
+
+
+class AssignSupportsView(change_support_permission, View):
+    def get(self, request, *args, **kwargs):
+        """supports proposed to the upcoming events without support"""
+
+        proposals, unassigned = propose_assignments()
+
+        return render(
+            request,
+            "event/assignments.html",
+            {
+                "title": "Affectation des supports",
+                "proposals": proposals,
+                "unassigned": unassigned,
+            },
+        )
+
+    def post(self, request, *args, **kwargs):
+        """assigns the (event, support) pairs reviewed, 'assignment=12:3'"""
+
+        pairs = []
+        for value in request.POST.getlist("assignment"):
+            event_id, _, support_id = value.partition(":")
+            if not (event_id.isdigit() and support_id.isdigit()):
+                messages.error(request, f" ❌ Affectation invalide : '{value}'.")
+                return redirect(request.path)
+            pairs.append((int(event_id), int(support_id)))
+
+        assigned, skipped = apply_assignments(pairs)
+        messages.success(
+            request,
+            f" ✅ {assigned} événement(s) affecté(s) à un support avec succès !",
+        )
+        for event_id, _, reason in skipped:
+            messages.warning(
+                request, f" ⚠️ Événement n°{event_id} non affecté : {reason}."
+            )
+
+        return redirect(f"{reverse(model.plural_name())}?support=none")
+
+
 class ChangeSupportView(change_support_permission, View):
     def get(self, request, id, *args, **kwargs):
         obj = get_object_or_404(model, id=id)
@@ -286,3 +370,92 @@ class ChangeSupportView(change_support_permission, View):
                 "obj": obj,
             },
         )
+
+
+class CalendarView(read_permission, View):
+    def get(self, request, *args, **kwargs):
+        """events of the week or of the month of the day,
+        '?period=month&day=2026-10-17', this week by default"""
+
+        kind = request.GET.get("period", periods[0])
+        try:
+            if kind not in periods:
+                raise FilterError(f"'{kind}' n'est pas une période (week, month)")
+            day = timezone.now()
+            if request.GET.get("day"):
+                day = parse_datetime_value(request.GET["day"])
+        except FilterError as error:
+            messages.error(request, f" ❌ Filtre invalide : {error}.")
+            return redirect(request.path)
+
+        start, end = period(kind, day)
+        feed_url = None
+        if feed_events(request.user) is not None:
+            feed_url = request.build_absolute_uri(
+                reverse("event_feed", args=[request.user.id])
+                + f"?signature={feed_signature(request.user.id)}"
+            )
+
+        return render(
+            request,
+            "event/calendar.html",
+            {
+                "title": "Calendrier des événements",
+                "period": kind,
+                "day": day,
+                "weeks": calendar_days(start, end, events_between(start, end)),
+                # the days of the periods before and after this one
+                "previous_day": day_value(start - timedelta(days=1)),
+                "next_day": day_value(end),
+                "feed_url": feed_url,
+            },
+        )
+
+
+class FeedView(View):
+    def get(self, request, id, *args, **kwargs):
+        """ICS feed of the events of a support or of the customers of a
+        commercial, '?signature=...' for the calendar clients"""
+
+        collaborator = get_object_or_404(
+            Collaborator.objects.select_related("department"), id=id
+        )
+        signed = constant_time_compare(
+            request.GET.get("signature", ""), feed_signature(id)
+        )
+        user = request.user
+        # the collaborator logged in reads its own feed, a manager every feed
+        if not signed and not (
+            user.is_authenticated
+            and (user.id == collaborator.id or user.role == "Gestion")
+        ):
+            raise PermissionDenied
+        qs = feed_events(collaborator)
+        if qs is None:
+            raise Http404
+
+        etag, modified = feed_state(qs)
+        # the lines are only read when the response is sent, not for a 304
+        response = StreamingHttpResponse(
+            feed_lines(
+                f"Epic Events - {collaborator}",
+                qs,
+                lambda event: request.build_absolute_uri(
+                    reverse(model.singular_name(), args=[event.id])
+                ),
+            ),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response.headers["ETag"] = quote_etag(etag)
+        response.headers["Content-Disposition"] = f'inline; filename="events-{id}.ics"'
+        last_modified = None
+        if modified is not None:
+            last_modified = int(modified.timestamp())
+            response.headers["Last-Modified"] = http_date(last_modified)
+
+        return get_conditional_response(
+            request,
+            etag=quote_etag(etag),
+            last_modified=last_modified,
+            response=response,
+        )
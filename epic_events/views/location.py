@@ -1,13 +1,24 @@
 from django.contrib import messages
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
+from django.urls import reverse
 from django.views import View
 
+from ..filters import (
+    FilterError,
+    LocationFilter,
+    parse_id,
+    parse_postal_code,
+    parse_radius,
+)
 from ..forms.location import LocationForm
 from ..forms.search import SearchForm
+from ..gazetteer import gazetteer, nearby_locations
 from ..models.location import Location
 from ..permissions import CommercialRequiredMixin, LoginRequiredMixin
-from .paginator import paginator
+from ..queries import search_query, search_syntax
+from ..upserts import get_or_create, save_or_get
+from .paginator import cached_count, paginator
 
 model = Location
 model_form = LocationForm
@@ -23,7 +34,10 @@ context = {
     "create_url_name": model.create_url_name(),
     "update_url_name": model.update_url_name(),
     "delete_url_name": model.delete_url_name(),
-    "form": search_form(placeholder=f"Rechercher {model.french_name().lower()}"),
+    "form": search_form(
+        placeholder=f"Rechercher {model.french_name().lower()}",
+        title=search_syntax(model),
+    ),
 }
 
 
@@ -39,31 +53,76 @@ class SearchPostMixin(View):
 
 class ListView(permission1, SearchPostMixin):
     def get(self, request, *args, **kwargs):
-        qs = model.objects.all().order_by("-edition_time")
-        context["page_obj"] = paginator(request, qs)
+        """'?near=69003&radius=20' lists the locations near a postal code"""
+
+        filterset = LocationFilter(request.GET)
+        try:
+            qs = filterset.filter(model.objects.all())
+        except FilterError as error:
+            messages.error(request, f" ❌ Filtre invalide : {error}.")
+            return redirect(request.path)
+
+        context["filter_query"] = filterset.urlencode()
+        context["page_obj"] = paginator(request, qs.order_by("-edition_time"))
 
         return render(request, model.template_name_list(), context)
 
 
-class SearchView(permission1, SearchPostMixin):
-    def get(self, request, search, *args, **kwargs):
-        qs = model.objects.filter(slug__contains=slugify(search)).order_by(
-            "-edition_time"
+class NearbyView(permission1, View):
+    def get(self, request, *args, **kwargs):
+        """{'center', 'locations': [{'id', 'label', 'zip', 'distance', 'url'}]}
+        of the locations near a postal code, nearest first, 50 at most :
+        '?zip=69003&radius=20' within 20 km, '?zip=69003&k=5' the 5 nearest"""
+
+        try:
+            zip = parse_postal_code(request.GET.get("zip", ""))
+            radius = request.GET.get("radius")
+            radius = None if radius is None else parse_radius(radius)
+            k = request.GET.get("k")
+            k = None if k is None else parse_id(k)
+            if (radius is None) == (k is None):
+                raise FilterError("indiquer 'radius' ou 'k'")
+        except FilterError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        latitude, longitude = gazetteer().coordinates(zip)
+        locations = nearby_locations(zip, radius=radius, k=k)
+
+        return JsonResponse(
+            {
+                "center": {"zip": zip, "latitude": latitude, "longitude": longitude},
+                "locations": [
+                    {
+                        "id": location.id,
+                        "label": str(location),
+                        "zip": location.zip,
+                        "distance": round(distance, 1),
+                        "url": reverse(model.singular_name(), args=[location.id]),
+                    }
+                    for location, distance in locations
+                ],
+            }
         )
 
-        if len(qs) < 2:
-            messages.info(request, f" ℹ️ {len(qs)} résultat trouvé.")
-        else:
-            messages.info(request, f" ℹ️ {len(qs)} résultats trouvés.")
 
-        context["page_obj"] = paginator(request, qs)
+class SearchView(permission1, SearchPostMixin):
+    def get(self, request, search, *args, **kwargs):
+        try:
+            qs = search_query(model, search)
+        except FilterError as error:
+            messages.error(request, f" ❌ Recherche invalide : {error}.")
+            return redirect(model.plural_name())
+
+        context["filter_query"] = ""
+        context["page_obj"] = paginator(request, qs, count=cached_count)
+        messages.info(request, context["page_obj"].total.results_message())
 
         return render(request, model.template_name_list(), context)
 
 
 class DetailView(permission1, View):
     def get(self, request, id, *args, **kwargs):
-        obj = get_object_or_404(model, id=id)
+        obj = get_object_or_404(model.objects.with_stats(), id=id)
         context["obj"] = obj
 
         return render(request, model.template_name_detail(), context)
@@ -81,18 +140,13 @@ class CreateView(permission2, View):
         form = model_form(request.POST)
 
         if form.is_valid():
-            qs = model.objects.filter(slug_form=form.cleaned_data["slug_form"])
-            if qs:
-                obj = qs[0]
+            obj, created = get_or_create(model, **form.cleaned_data)
+            if not created:
                 messages.info(
                     request,
                     f" ℹ️ {model.french_name()} identifiant n°{obj.id} existe déjà.",
                 )
-
             else:
-                obj = form.save()
-                obj.save()
-
                 messages.success(
                     request,
                     f" ✅ {model.french_name()} identifiant n°{obj.id} a été créé avec succès !",
@@ -127,17 +181,13 @@ class UpdateView(permission2, View):
         form = model_form(request.POST, instance=obj)
 
         if form.is_valid():
-            qs = model.objects.filter(slug_form=form.cleaned_data["slug_form"])
-            if qs:
-                obj = qs[0]
+            obj, saved = save_or_get(form.save(commit=False))
+            if not saved:
                 messages.info(
                     request,
                     f" ℹ️ {model.french_name()} identifiant n°{obj.id} existe déjà.",
                 )
-
             else:
-                obj = form.save()
-                obj.save()
                 messages.success(
                     request,
                     f" ✅ {model.french_name()} identifiant n°{obj.id} a été modifié avec succès !",
@@ -1,10 +1,247 @@
-from django.core.paginator import Paginator
+"""Keyset pagination of the list, filter and search views.
 
+The rows are ordered by (edition_time, id), newest first, and a page starts
+after the last row of the previous one : the cursor replaces COUNT(*) and
+OFFSET, so the last page costs the same single query as the first one.
 
-def paginator(request, qs: list) -> Paginator:
-    """split the qs into 10 instances per page"""
+The total of the rows is given by a count strategy : exact_count(),
+cached_count() or estimated_count(). A single page is counted for free."""
 
-    paginator = Paginator(qs, 10)
-    page_number = request.GET.get("page")
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from hashlib import md5
 
-    return paginator.get_page(page_number)
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F, Max, Min, Q, QuerySet
+
+from ..facets import version
+
+per_page = 10
+
+# query string parameter of the cursor
+cursor_parameter = "cursor"
+# cursor of the oldest rows
+last_cursor = "last"
+
+# incremented by epic_events/signals.py when any row is saved or deleted
+counts_version_key = "counts_version"
+# the version invalidates the cached totals, the timeout bounds their age anyway
+counts_timeout = 5 * 60
+# below this total, the estimated_count() is exact
+exact_limit = 1000
+
+
+class Total:
+    """number of rows, 'environ N' when estimated"""
+
+    def __init__(self, value: int, exact: bool = True):
+        self.value = value
+        self.exact = exact
+
+    def __str__(self) -> str:
+        if self.exact:
+            return str(self.value)
+        # the estimate keeps two significant digits
+        return f"environ {round(self.value, 2 - len(str(self.value)))}"
+
+    def results_message(self) -> str:
+        if self.value < 2:
+            return f" ℹ️ {self} résultat trouvé."
+        return f" ℹ️ {self} résultats trouvés."
+
+
+def exact_count(qs: QuerySet) -> Total:
+    return Total(qs.count())
+
+
+def cached_count(qs: QuerySet) -> Total:
+    """exact count, computed once per version of the data"""
+
+    sql = str(qs.order_by().query)
+    key = f"counts:{version(counts_version_key)}:{md5(sql.encode()).hexdigest()}"
+
+    return Total(cache.get_or_set(key, qs.count, timeout=counts_timeout))
+
+
+def _planner_rows(qs: QuerySet) -> int:
+    """rows estimated by the PostgreSQL planner statistics"""
+
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _sampled_rows(qs: QuerySet) -> int:
+    """rows extrapolated from the density of the matching rows among the lowest
+    ids of the table"""
+
+    last_id = qs.order_by("id").values_list("id", flat=True)[exact_limit - 1]
+    table = qs.model._default_manager.using(qs.db)
+    # one aggregate per query, SQLite reads a MIN() or a MAX() alone from the
+    # ends of the index, both together from the whole index
+    ids = table.aggregate(Min("id")) | table.aggregate(Max("id"))
+    sample_size = last_id - ids["id__min"] + 1
+    table_size = ids["id__max"] - ids["id__min"] + 1
+
+    return exact_limit * table_size // sample_size
+
+
+def estimated_count(qs: QuerySet) -> Total:
+    """exact below exact_limit rows, estimated by the planner on PostgreSQL and
+    sampled on the other databases above"""
+
+    # COUNT(*) of a subquery limited to exact_limit rows
+    bounded = qs.order_by()[:exact_limit].count()
+    if bounded < exact_limit:
+        return Total(bounded)
+
+    if connections[qs.db].vendor == "postgresql":
+        rows = _planner_rows(qs)
+    else:
+        rows = _sampled_rows(qs)
+
+    return Total(max(rows, exact_limit), exact=False)
+
+
+class CursorPage:
+    """rows of one page, the cursors of its neighbours and the total of the rows,
+    used in 'partials/paginator.html'"""
+
+    def __init__(
+        self, object_list: list, next_cursor: str, previous_cursor: str, total: Total
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
+def encode_cursor(direction: str, obj) -> str:
+    """opaque cursor of the rows after ("n") or before ("p") obj"""
+
+    edition_time = obj.edition_time.isoformat() if obj.edition_time else ""
+    value = f"{direction}|{edition_time}|{obj.id}"
+
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(direction, edition_time, id), ValueError if the cursor is invalid"""
+
+    try:
+        direction, edition_time, id = (
+            urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+    except (TypeError, UnicodeError, ValueError):
+        raise ValueError(f"invalid cursor : {cursor}")
+
+    if direction not in ("n", "p"):
+        raise ValueError(f"invalid cursor : {cursor}")
+
+    return (
+        direction,
+        datetime.fromisoformat(edition_time) if edition_time else None,
+        int(id),
+    )
+
+
+def _after(edition_time: datetime, id: int) -> Q:
+    """rows after (edition_time, id) in the order, the null edition times last"""
+
+    if edition_time is None:
+        return Q(edition_time__isnull=True, id__lt=id)
+    return (
+        Q(edition_time__lt=edition_time)
+        | Q(edition_time=edition_time, id__lt=id)
+        | Q(edition_time__isnull=True)
+    )
+
+
+def _before(edition_time: datetime, id: int) -> Q:
+    """rows before (edition_time, id) in the order"""
+
+    if edition_time is None:
+        return Q(edition_time__isnull=False) | Q(edition_time__isnull=True, id__gt=id)
+    return Q(edition_time__gt=edition_time) | Q(edition_time=edition_time, id__gt=id)
+
+
+def paginator(request, qs: QuerySet, count=estimated_count) -> CursorPage:
+    """split the qs into pages of 10 rows, starting at the cursor of the
+    query string, the first page if the cursor is missing or invalid, and
+    count the rows with the count strategy"""
+
+    # the id breaks the ties of edition_time
+    newest_first = qs.order_by(F("edition_time").desc(nulls_last=True), "-id")
+    oldest_first = qs.order_by(F("edition_time").asc(nulls_first=True), "id")
+
+    cursor = request.GET.get(cursor_parameter)
+    try:
+        if cursor == last_cursor:
+            direction, rows = "p", list(oldest_first[: per_page + 1])
+        elif cursor:
+            direction, edition_time, id = decode_cursor(cursor)
+            if direction == "n":
+                rows = list(
+                    newest_first.filter(_after(edition_time, id))[: per_page + 1]
+                )
+            else:
+                rows = list(
+                    oldest_first.filter(_before(edition_time, id))[: per_page + 1]
+                )
+        else:
+            direction, rows = None, list(newest_first[: per_page + 1])
+    except ValueError:
+        direction, rows = None, list(newest_first[: per_page + 1])
+
+    # the extra row tells if there is one more page
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == "p":
+        rows.reverse()
+        has_next = cursor != last_cursor
+        has_previous = has_more
+    else:
+        has_next = has_more
+        has_previous = direction == "n"
+
+    if has_next or has_previous:
+        total = count(qs)
+    else:
+        # single page
+        total = Total(len(rows))
+
+    return CursorPage(
+        rows,
+        next_cursor=encode_cursor("n", rows[-1]) if rows and has_next else None,
+        previous_cursor=encode_cursor("p", rows[0]) if rows and has_previous else None,
+        total=total,
+    )
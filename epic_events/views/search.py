@@ -0,0 +1,64 @@
+from django.shortcuts import render
+from django.views import View
+
+from ..forms.search import SearchForm
+from ..models.collaborator import Collaborator
+from ..models.company import Company
+from ..models.contract_event import Contract, Event
+from ..models.customer import Customer
+from ..models.location import Location
+from ..permissions import LoginRequiredMixin
+from ..search import global_search
+
+search_form = SearchForm
+
+read_permission = LoginRequiredMixin
+
+# model : rows listed, the collaborators are listed to the managers only
+limits = {
+    Customer: 5,
+    Company: 3,
+    Contract: 5,
+    Event: 5,
+    Location: 3,
+    Collaborator: 5,
+}
+
+# joins the relations displayed in 'search/global.html'
+querysets = {
+    Contract: Contract.objects.select_related("customer"),
+    Event: Event.objects.select_related("contract__customer"),
+}
+
+
+class GlobalSearchView(read_permission, View):
+    template_name = "search/global.html"
+
+    def get(self, request, *args, **kwargs):
+        """the customers, contracts, events, companies, locations and
+        collaborators matching '?search=', in one query"""
+
+        form = search_form(request.GET)
+        context = {"title": "Recherche", "groups": []}
+        if not form.is_valid():
+            return render(request, self.template_name, context)
+
+        role_limits = {
+            model: limit
+            for model, limit in limits.items()
+            if model is not Collaborator or request.user.role == "Gestion"
+        }
+        results = global_search(form.cleaned_data["search"], role_limits, querysets)
+
+        context["search"] = form.cleaned_data["search"]
+        context["groups"] = [
+            {
+                "name": model.plural_name(),
+                "title": model.french_plural_name(),
+                "detail_url_name": model.singular_name(),
+                "rows": rows,
+            }
+            for model, rows in results.items()
+        ]
+
+        return render(request, self.template_name, context)
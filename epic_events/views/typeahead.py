@@ -0,0 +1,30 @@
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views import View
+
+from ..permissions import LoginRequiredMixin
+from ..typeahead import typeahead
+
+read_permission = LoginRequiredMixin
+
+
+class TypeaheadView(read_permission, View):
+    def get(self, request, *args, **kwargs):
+        """{'customers': [{'id', 'label', 'url'}], 'companies': …} of the rows
+        starting with the letters typed, '?q=dup'"""
+
+        results = typeahead(request.user.role, request.GET.get("q", ""))
+
+        return JsonResponse(
+            {
+                model.plural_name(): [
+                    {
+                        "id": id,
+                        "label": label,
+                        "url": reverse(model.singular_name(), args=[id]),
+                    }
+                    for id, label in rows
+                ]
+                for model, rows in results.items()
+            }
+        )
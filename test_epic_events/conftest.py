@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def memory_cache(settings):
+    """the cache of the process instead of the shared table of the settings :
+    the queries counted are the ones of the rows, not the ones of the cache"""
+
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
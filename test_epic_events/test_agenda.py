@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from epic_events.agenda import (
+    calendar_days,
+    events_between,
+    feed_lines,
+    feed_state,
+    folded,
+    period,
+)
+from epic_events.models import Event
+
+
+def aware(*args) -> datetime:
+    return timezone.make_aware(datetime(*args))
+
+
+class TestAgenda:
+    def create_event(self, start: datetime, hours: int, note: str = None) -> Event:
+        end = start + timedelta(hours=hours) if hours is not None else None
+        return Event.objects.create(start_date=start, end_date=end, note=note)
+
+    def test_period(self):
+        # saturday
+        day = aware(2026, 10, 17, 15)
+        assert period("week", day) == (aware(2026, 10, 12), aware(2026, 10, 19))
+        assert period("month", day) == (aware(2026, 9, 28), aware(2026, 11, 2))
+        assert period("month", aware(2026, 12, 3)) == (
+            aware(2026, 11, 30),
+            aware(2027, 1, 4),
+        )
+
+    def test_folded(self):
+        assert folded("SUMMARY:court") == "SUMMARY:court\r\n"
+        line = "DESCRIPTION:" + "é" * 100
+        lines = folded(line).split("\r\n")
+        assert lines[-1] == ""
+        assert all(len(part.encode()) <= 75 for part in lines)
+        assert all(part.startswith(" ") for part in lines[1:-1])
+        assert "".join(part[1:] for part in lines[1:]) == line.removeprefix(lines[0])
+
+    @pytest.mark.django_db
+    def test_events_between(self):
+        start, end = period("week", aware(2026, 10, 14))
+        # from the previous week, over 3 days
+        running = self.create_event(start - timedelta(days=2), 72)
+        monday = self.create_event(start, None)
+        sunday = self.create_event(end - timedelta(hours=1), 4)
+        # ended before the week, or starting after it
+        self.create_event(start - timedelta(days=3), 8)
+        self.create_event(start - timedelta(hours=1), None)
+        self.create_event(end, 1)
+
+        events = list(events_between(start, end))
+        assert events == [running, monday, sunday]
+
+        weeks = calendar_days(start, end, events)
+        assert [day for day, _ in weeks[0]][0] == date(2026, 10, 12)
+        assert [len(events) for _, events in weeks[0]] == [2, 0, 0, 0, 0, 0, 1]
+
+    @pytest.mark.django_db
+    def test_feed(self):
+        event = self.create_event(aware(2026, 10, 14, 9), 8, note="salle, étage 2")
+        self.create_event(aware(2026, 10, 15, 9), None)
+        qs = Event.objects.all()
+
+        etag, modified = feed_state(qs)
+        assert modified == event.edition_time or modified > event.edition_time
+        lines = "".join(feed_lines("Agenda", qs, lambda event: f"/events/{event.id}/"))
+        assert lines.startswith("BEGIN:VCALENDAR\r\n")
+        assert lines.endswith("END:VCALENDAR\r\n")
+        assert lines.count("BEGIN:VEVENT") == 2
+        assert "DTSTART:20261014T090000Z\r\nDTEND:20261014T170000Z" in lines
+        assert "DESCRIPTION:salle\\, étage 2" in lines
+
+        # a change of an event changes the state
+        assert feed_state(qs) == (etag, modified)
+        event.save()
+        assert feed_state(qs)[0] != etag
+        event.delete()
+        assert feed_state(qs)[0] != etag
@@ -0,0 +1,132 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from epic_events.assignment import apply_assignments, propose_assignments
+from epic_events.models import Collaborator, Counter, Department, Event, Location
+from epic_events.models.counter import scope_name
+from epic_events.upserts import get_or_create
+
+
+@pytest.mark.django_db
+class TestAssignment:
+    def create_support(self, last_name: str) -> Collaborator:
+        department, _ = Department.objects.get_or_create(name="Support")
+        support = Collaborator(
+            first_name="John",
+            last_name=last_name,
+            email=f"{last_name}@gmail.com",
+            birthdate=date(year=2000, month=1, day=1),
+            department=department,
+        )
+        support.save()
+        return support
+
+    def create_event(
+        self, start: datetime, hours: int, zip: str, support: Collaborator = None
+    ) -> Event:
+        location, _ = get_or_create(Location, zip=zip, city="Lyon")
+        event = Event(
+            start_date=start,
+            end_date=start + timedelta(hours=hours),
+            location=location,
+            support=support,
+        )
+        event.save()
+        return event
+
+    def test_propose_and_apply(self):
+        doe = self.create_support("Doe")
+        smith = self.create_support("Smith")
+        day = timezone.now().replace(hour=9, minute=0) + timedelta(days=7)
+        self.create_event(day, 8, "69003", doe)
+
+        busy_doe = self.create_event(day + timedelta(hours=1), 2, "69001")
+        near_doe = self.create_event(day + timedelta(days=1), 2, "69003")
+        # during the first two events
+        busy_both = self.create_event(day + timedelta(hours=2), 2, "69001")
+        # started
+        self.create_event(timezone.now() - timedelta(hours=1), 2, "69003")
+
+        proposals, unassigned = propose_assignments()
+        assert [(event, support) for event, support, _, _ in proposals] == [
+            (busy_doe, smith),
+            (near_doe, doe),
+        ]
+        assert proposals[1][2:] == (1, 0.0)
+        assert unassigned == [busy_both]
+
+        pairs = [(event.id, support.id) for event, support, _, _ in proposals]
+        # reviewed, then moved during the event of doe
+        Event.objects.filter(id=near_doe.id).update(
+            start_date=day + timedelta(hours=3), end_date=day + timedelta(hours=4)
+        )
+        assert apply_assignments(pairs) == (
+            1,
+            [(near_doe.id, doe.id, "support occupé sur ces dates")],
+        )
+        assert Event.objects.get(id=busy_doe.id).support == smith
+        assert Event.objects.get(id=near_doe.id).support is None
+        assert "smith" in Event.objects.get(id=busy_doe.id).slug
+        assert Counter.objects.get(scope=scope_name(smith.id)).events == 1
+        assert Counter.objects.get(scope=scope_name()).events_without_support == 3
+
+        # assigned since the review, two reviewed pairs overlapping, unknown
+        assigned, skipped = apply_assignments(
+            [(busy_doe.id, smith.id), (busy_both.id, smith.id), (near_doe.id, 0)]
+        )
+        assert assigned == 0
+        assert [reason for _, _, reason in skipped] == [
+            "déjà affecté ou supprimé",
+            "support occupé sur ces dates",
+            "support inconnu",
+        ]
+
+    def test_propose_without_support(self):
+        day = timezone.now() + timedelta(days=7)
+        event = self.create_event(day, 2, "69003")
+
+        assert propose_assignments() == ([], [event])
+
+        # a support busy on the dates of the only event
+        doe = self.create_support("Doe")
+        self.create_event(day - timedelta(hours=1), 4, "69003", doe)
+        assert propose_assignments() == ([], [event])
+
+    def test_propose_ties(self):
+        doe = self.create_support("Doe")
+        smith = self.create_support("Smith")
+        day = timezone.now() + timedelta(days=7)
+        # no event located nor assigned : the costs are equal
+        first = self.create_event(day, 2, "")
+        second = self.create_event(day + timedelta(days=1), 2, "")
+        # during first
+        third = self.create_event(day + timedelta(hours=1), 2, "")
+
+        proposals, unassigned = propose_assignments()
+        # the equal costs go to the lowest id : first to doe, third,
+        # overlapping it, to smith, then second to doe, both having one event
+        assert [(event, support) for event, support, _, _ in proposals] == [
+            (first, doe),
+            (second, doe),
+            (third, smith),
+        ]
+        assert [proposal[2:] for proposal in proposals] == [
+            (0, 100),
+            (1, 100),
+            (0, 100),
+        ]
+        assert unassigned == []
+
+    def test_assigned_event_not_proposed(self):
+        doe = self.create_support("Doe")
+        day = timezone.now() + timedelta(days=7)
+        assigned = self.create_event(day, 2, "69003", doe)
+
+        assert propose_assignments() == ([], [])
+        assert apply_assignments([(assigned.id, doe.id)]) == (
+            0,
+            [(assigned.id, doe.id, "déjà affecté ou supprimé")],
+        )
+        assert Event.objects.get(id=assigned.id).support == doe
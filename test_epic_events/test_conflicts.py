@@ -0,0 +1,86 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from epic_events.conflicts import IntervalTree, busy_error, quarter, support_conflicts
+from epic_events.models import Collaborator, Department, Event
+
+
+def aware(*args) -> datetime:
+    return timezone.make_aware(datetime(*args))
+
+
+class TestConflicts:
+    def create_support(self, last_name: str) -> Collaborator:
+        department, _ = Department.objects.get_or_create(name="Support")
+        support = Collaborator(
+            first_name="John",
+            last_name=last_name,
+            email=f"{last_name}@gmail.com",
+            birthdate=date(year=2000, month=1, day=1),
+            department=department,
+        )
+        support.save()
+        return support
+
+    def create_event(self, support: Collaborator, start: datetime, hours: int) -> Event:
+        end = start + timedelta(hours=hours) if hours is not None else None
+        return Event.objects.create(support=support, start_date=start, end_date=end)
+
+    def test_quarter(self):
+        assert quarter(aware(2026, 5, 17, 12)) == (aware(2026, 4, 1), aware(2026, 7, 1))
+        assert quarter(aware(2026, 11, 2)) == (aware(2026, 10, 1), aware(2027, 1, 1))
+
+    def test_interval_tree_matches_the_pairs(self):
+        rnd = random.Random(0)
+        intervals = []
+        for i in range(300):
+            start = rnd.uniform(0, 1000)
+            intervals.append((start, start + rnd.choice([0, rnd.uniform(0, 30)]), i))
+        tree = IntervalTree(intervals)
+
+        for _ in range(50):
+            start = rnd.uniform(0, 1000)
+            end = start + rnd.uniform(0, 50)
+            assert sorted(tree.overlapping(start, end)) == [
+                i for s, e, i in intervals if s < end and e > start
+            ]
+        assert IntervalTree([]).overlapping(0, 1) == []
+
+    @pytest.mark.django_db
+    def test_busy_error(self):
+        support = self.create_support("Doe")
+        monday = aware(2026, 5, 4, 9)
+        event = self.create_event(support, monday, 8)
+        new_event = Event(start_date=monday)
+
+        error = busy_error(support, new_event, monday + timedelta(hours=2), None)
+        assert f"n°{event.id}" in error
+        # ends when the other starts, or without support
+        assert (
+            busy_error(support, new_event, monday - timedelta(hours=1), monday) is None
+        )
+        assert busy_error(None, new_event, monday, None) is None
+        # the event itself is not a conflict
+        assert busy_error(support, event, monday, monday + timedelta(hours=8)) is None
+
+    @pytest.mark.django_db
+    def test_support_conflicts(self):
+        sam = self.create_support("Doe")
+        bob = self.create_support("Smith")
+        monday = aware(2026, 5, 4, 9)
+        first = self.create_event(sam, monday, 8)
+        second = self.create_event(sam, monday + timedelta(hours=4), 8)
+        # an instant inside the first two
+        third = self.create_event(sam, monday + timedelta(hours=5), None)
+        self.create_event(sam, monday + timedelta(days=1), 2)
+        self.create_event(bob, monday, 8)
+        self.create_event(bob, monday + timedelta(hours=8), 8)
+        Event.objects.create(start_date=monday)
+
+        assert support_conflicts(*quarter(monday)) == [
+            (sam, [(first, second), (first, third), (second, third)])
+        ]
+        assert support_conflicts(aware(2026, 7, 1), aware(2026, 10, 1)) == []
@@ -0,0 +1,129 @@
+from datetime import date
+
+import pytest
+
+from epic_events import duplicates as duplicates_module
+from epic_events.duplicates import (
+    find_duplicates,
+    merge_customers,
+    phonetic_key,
+    signature,
+    similarity,
+    store_duplicates,
+)
+from epic_events.models.collaborator import Collaborator
+from epic_events.models.company import Company
+from epic_events.models.contract_event import Contract
+from epic_events.models.counter import Counter, scope_name
+from epic_events.models.customer import Customer
+from epic_events.models.duplicate import DuplicateCustomer
+
+
+class TestDuplicates:
+    def create_customer(self, first_name, last_name, email, **fields) -> Customer:
+        customer = Customer(
+            first_name=first_name, last_name=last_name, email=email, **fields
+        )
+        customer.save()
+        return customer
+
+    def pairs(self, duplicates: list) -> set:
+        return {(pair.customer_id, pair.duplicate_id) for pair in duplicates}
+
+    def test_phonetic_key(self):
+        assert phonetic_key("Dupont") == phonetic_key("Dupond") == "dpn"
+        assert phonetic_key("Philippe") == phonetic_key("Filip")
+        assert phonetic_key("Céline") == phonetic_key("Seline")
+        assert phonetic_key("Dupont") != phonetic_key("Durand")
+        assert phonetic_key("") == ""
+
+    def test_similarity(self):
+        assert similarity(signature("jean dupont"), signature("jean dupont")) == 1
+        typo = similarity(signature("jean dupont"), signature("jean dupnot"))
+        other = similarity(signature("jean dupont"), signature("marie durand"))
+        assert 1 > typo > 0.4 > other
+
+    @pytest.mark.django_db
+    def test_find_duplicates(self):
+        epic = Company(name="Epic")
+        epic.save()
+        jean = self.create_customer("Jean", "Dupont", "jd@gmail.com", company=epic)
+        # a typo, another email at the same company
+        typo = self.create_customer("Jean", "Dupnot", "jean@epic.com", company=epic)
+        # the same phone, the names of both only sound alike the first one
+        phone = self.create_customer(
+            "Jean", "Dupond", "dupond@yahoo.fr", phone="+33612345678"
+        )
+        same_phone = self.create_customer(
+            "J.", "Dupond", "jdupond@gmail.com", phone="+33612345678"
+        )
+        # another person of the company
+        self.create_customer("Marie", "Durand", "md@epic.com", company=epic)
+
+        duplicates = find_duplicates()
+
+        reasons = {
+            (pair.customer_id, pair.duplicate_id): pair.reasons for pair in duplicates
+        }
+        assert reasons == {
+            (jean.id, typo.id): "entreprise, nom",
+            (phone.id, same_phone.id): "téléphone",
+        }
+
+        assert store_duplicates(duplicates) == 2
+        assert store_duplicates(duplicates[:1]) == 1
+        assert DuplicateCustomer.objects.count() == 1
+
+    @pytest.mark.django_db
+    def test_find_duplicates_in_large_blocks(self, monkeypatch):
+        monkeypatch.setattr(duplicates_module, "max_block", 3)
+        monkeypatch.setattr(duplicates_module, "window", 1)
+        epic = Company(name="Epic")
+        epic.save()
+        names = ["Anne Martin", "Jean Dupond", "Jean Dupont", "Zoé Petit"]
+        customers = [
+            self.create_customer(*name.split(), f"{i}@epic.com", company=epic)
+            for i, name in enumerate(names)
+        ]
+
+        # the neighbours once sorted by name
+        assert self.pairs(find_duplicates()) == {(customers[1].id, customers[2].id)}
+
+    @pytest.mark.django_db
+    def test_merge_customers(self, django_assert_max_num_queries):
+        commercial = Collaborator(
+            email="commercial@gmail.com",
+            first_name="Paul",
+            last_name="Durand",
+            birthdate=date(year=2000, month=1, day=1),
+        )
+        commercial.save()
+        kept = self.create_customer("Jean", "Dupont", "jd@gmail.com")
+        duplicate = self.create_customer(
+            "Jean",
+            "Dupnot",
+            "jean@epic.com",
+            phone="+33612345678",
+            commercial=commercial,
+        )
+        contracts = [Contract(customer=duplicate, total_amount=100) for _ in range(3)]
+        for contract in contracts:
+            contract.save()
+        store_duplicates(find_duplicates())
+
+        assert merge_customers(kept, duplicate) == 3
+
+        # the contracts moved, with the slugs holding the kept name
+        for contract in contracts:
+            contract.refresh_from_db()
+            assert contract.customer_id == kept.id
+            assert "dupont" in contract.slug
+        # the empty fields of the kept customer filled
+        kept.refresh_from_db()
+        assert str(kept.phone) == "+33612345678"
+        assert kept.commercial == commercial
+        assert not Customer.objects.filter(id=duplicate.id).exists()
+        assert not DuplicateCustomer.objects.exists()
+        # the counters of the commercial count the merged customer
+        counter = Counter.objects.get(scope=scope_name(commercial.id))
+        assert (counter.customers, counter.contracts) == (1, 3)
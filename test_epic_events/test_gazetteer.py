@@ -0,0 +1,223 @@
+import random
+
+import pytest
+from django.http import QueryDict
+
+from epic_events.filters import FilterError, LocationFilter
+from epic_events.gazetteer import KDTree, gazetteer, nearby_locations
+from epic_events.models.location import Location
+
+# department, or overseas territory : (south, west, north, east) of the
+# outlines of its communes (ADMIN EXPRESS, IGN), rounded outwards to 0.1°,
+# Corsica as one
+department_boxes = {
+    "01": (45.6, 4.7, 46.6, 6.2),
+    "02": (48.8, 2.9, 50.1, 4.3),
+    "03": (45.9, 2.2, 46.9, 4.1),
+    "04": (43.6, 5.4, 44.7, 7.0),
+    "05": (44.1, 5.4, 45.2, 7.1),
+    "06": (43.4, 6.6, 44.4, 7.8),
+    "07": (44.2, 3.8, 45.4, 4.9),
+    "08": (49.2, 4.0, 50.2, 5.4),
+    "09": (42.5, 0.8, 43.4, 2.2),
+    "10": (47.9, 3.3, 48.8, 4.9),
+    "11": (42.6, 1.6, 43.5, 3.3),
+    "12": (43.6, 1.8, 45.0, 3.5),
+    "13": (43.1, 4.2, 44.0, 5.9),
+    "14": (48.7, -1.2, 49.5, 0.5),
+    "15": (44.6, 2.0, 45.5, 3.4),
+    "16": (45.1, -0.5, 46.2, 1.0),
+    "17": (45.0, -1.6, 46.4, 0.1),
+    "18": (46.4, 1.7, 47.7, 3.1),
+    "19": (44.9, 1.2, 45.8, 2.6),
+    "20": (41.3, 8.5, 43.1, 9.6),
+    "21": (46.9, 4.0, 48.1, 5.6),
+    "22": (48.0, -3.7, 48.9, -1.9),
+    "23": (45.6, 1.3, 46.5, 2.7),
+    "24": (44.5, -0.1, 45.8, 1.5),
+    "25": (46.5, 5.6, 47.6, 7.1),
+    "26": (44.1, 4.6, 45.4, 5.9),
+    "27": (48.6, 0.2, 49.5, 1.9),
+    "28": (47.9, 0.7, 49.0, 2.0),
+    "29": (47.7, -5.2, 48.8, -3.3),
+    "30": (43.4, 3.2, 44.5, 4.9),
+    "31": (42.6, 0.4, 44.0, 2.1),
+    "32": (43.3, -0.3, 44.1, 1.3),
+    "33": (44.1, -1.3, 45.7, 0.4),
+    "34": (43.2, 2.5, 44.0, 4.2),
+    "35": (47.6, -2.3, 48.8, -1.0),
+    "36": (46.3, 0.8, 47.3, 2.3),
+    "37": (46.7, 0.0, 47.8, 1.4),
+    "38": (44.6, 4.7, 45.9, 6.4),
+    "39": (46.2, 5.2, 47.4, 6.3),
+    "40": (43.4, -1.6, 44.6, 0.2),
+    "41": (47.1, 0.5, 48.2, 2.3),
+    "42": (45.2, 3.6, 46.3, 4.8),
+    "43": (44.7, 3.0, 45.5, 4.5),
+    "44": (46.8, -2.7, 47.9, -0.9),
+    "45": (47.4, 1.5, 48.4, 3.2),
+    "46": (44.2, 0.9, 45.1, 2.3),
+    "47": (43.9, -0.2, 44.8, 1.1),
+    "48": (44.1, 2.9, 45.0, 4.0),
+    "49": (46.9, -1.3, 47.9, 0.3),
+    "50": (48.4, -2.0, 49.8, -0.7),
+    "51": (48.5, 3.3, 49.5, 5.1),
+    "52": (47.5, 4.6, 48.7, 5.9),
+    "53": (47.7, -1.3, 48.6, 0.0),
+    "54": (48.3, 5.4, 49.6, 7.2),
+    "55": (48.4, 4.8, 49.7, 5.9),
+    "56": (47.2, -3.8, 48.3, -2.0),
+    "57": (48.5, 5.8, 49.6, 7.7),
+    "58": (46.6, 2.8, 47.6, 4.3),
+    "59": (49.9, 2.0, 51.1, 4.3),
+    "60": (49.0, 1.6, 49.8, 3.2),
+    "61": (48.1, -0.9, 49.0, 1.0),
+    "62": (50.0, 1.5, 51.1, 3.2),
+    "63": (45.2, 2.3, 46.3, 4.0),
+    "64": (42.7, -1.8, 43.6, 0.1),
+    "65": (42.6, -0.4, 43.7, 0.7),
+    "66": (42.3, 1.7, 43.0, 3.2),
+    "67": (48.1, 6.9, 49.1, 8.3),
+    "68": (47.4, 6.8, 48.4, 7.7),
+    "69": (45.4, 4.2, 46.4, 5.2),
+    "70": (47.2, 5.3, 48.1, 6.9),
+    "71": (46.1, 3.6, 47.2, 5.5),
+    "72": (47.5, -0.5, 48.5, 1.0),
+    "73": (45.0, 5.6, 46.0, 7.2),
+    "74": (45.6, 5.8, 46.5, 7.1),
+    "75": (48.8, 2.2, 49.0, 2.5),
+    "76": (49.2, 0.0, 50.1, 1.8),
+    "77": (48.1, 2.3, 49.2, 3.6),
+    "78": (48.4, 1.4, 49.1, 2.3),
+    "79": (45.9, -1.0, 47.2, 0.3),
+    "80": (49.5, 1.3, 50.4, 3.3),
+    "81": (43.3, 1.5, 44.3, 3.0),
+    "82": (43.7, 0.7, 44.4, 2.1),
+    "83": (42.9, 5.6, 43.9, 7.0),
+    "84": (43.6, 4.6, 44.5, 5.8),
+    "85": (46.2, -2.5, 47.1, -0.5),
+    "86": (46.0, -0.2, 47.2, 1.3),
+    "87": (45.4, 0.6, 46.5, 2.0),
+    "88": (47.8, 5.3, 48.6, 7.2),
+    "89": (47.3, 2.8, 48.5, 4.4),
+    "90": (47.4, 6.7, 47.9, 7.2),
+    "91": (48.2, 1.9, 48.8, 2.6),
+    "92": (48.7, 2.1, 49.0, 2.4),
+    "93": (48.8, 2.2, 49.1, 2.7),
+    "94": (48.6, 2.3, 48.9, 2.7),
+    "95": (48.9, 1.6, 49.3, 2.6),
+    "971": (15.8, -61.9, 16.6, -61.0),
+    "972": (14.3, -61.3, 14.9, -60.8),
+    "973": (2.1, -54.7, 5.8, -51.6),
+    "974": (-21.4, 55.2, -20.8, 55.9),
+    "976": (-13.1, 45.0, -12.6, 45.3),
+}
+
+
+class TestGazetteer:
+    def create_location(self, zip: str, city: str, name: str = "") -> Location:
+        location = Location(name=name, street_name=name, zip=zip, city=city)
+        location.save()
+        return location
+
+    def test_coordinates(self):
+        assert gazetteer().coordinates("69003") == pytest.approx(
+            (45.76, 4.85), abs=0.02
+        )
+        assert gazetteer().coordinates("29200") == pytest.approx(
+            (48.39, -4.48), abs=0.02
+        )
+        assert gazetteer().coordinates("00000") is None
+        assert gazetteer().coordinates("lyon") is None
+
+    def test_codes_within_their_department(self):
+        places = gazetteer()
+        outside = []
+        for code, latitude, longitude in zip(
+            places.codes, places.latitudes, places.longitudes
+        ):
+            code = f"{code:05d}"
+            department = code[:3] if code.startswith(("97", "98")) else code[:2]
+            south, west, north, east = department_boxes[department]
+            if not (south <= latitude <= north and west <= longitude <= east):
+                outside.append(code)
+
+        assert len(places) > 6000
+        assert outside == []
+
+    def test_kd_tree_matches_the_distances(self):
+        rnd = random.Random(0)
+        points = [(rnd.random(), rnd.random(), rnd.random(), i) for i in range(500)]
+        tree = KDTree(points)
+
+        for _ in range(20):
+            point = (rnd.random(), rnd.random(), rnd.random())
+            distances = sorted(
+                sum((a - b) ** 2 for a, b in zip(point, other[:3])) for other in points
+            )
+            assert [d for d, _ in tree.nearest(point, 7)] == distances[:7]
+            assert len(tree.within(point, 0.2)) == len(
+                [d for d in distances if d <= 0.2**2]
+            )
+
+    def test_codes_near_a_code(self):
+        within = gazetteer().within("69003", 3)
+        assert within[0] == (0.0, "69003")
+        assert {"69001", "69006"} < {code for _, code in within}
+        assert [distance for distance, _ in within] == sorted(
+            distance for distance, _ in within
+        )
+        # Paris - Lyon, great-circle
+        ((distance, code),) = [
+            (distance, code)
+            for distance, code in gazetteer().within("75001", 400)
+            if code == "69003"
+        ]
+        assert distance == pytest.approx(392, abs=5)
+
+        assert [code for _, code in gazetteer().nearest("75001", 1)] == ["75001"]
+
+    @pytest.mark.django_db
+    def test_nearby_locations(self):
+        lyon = self.create_location("69003", "Lyon", "part dieu")
+        lyon_center = self.create_location("69001", "Lyon", "terreaux")
+        marseille = self.create_location("13008", "Marseille")
+        self.create_location("75001", "Paris")
+        # outside the gazetteer
+        self.create_location("99999", "Nulle part")
+
+        located = nearby_locations("69003", radius=10)
+        assert [location for location, _ in located] == [lyon, lyon_center]
+        assert located[0][1] == 0.0
+
+        located = nearby_locations("69002", k=3)
+        assert [location for location, _ in located] == [
+            lyon_center,
+            lyon,
+            marseille,
+        ]
+        # the locations of the qs
+        qs = Location.objects.exclude(id=lyon.id)
+        assert [location for location, _ in nearby_locations("69003", k=1, qs=qs)] == [
+            lyon_center
+        ]
+
+    @pytest.mark.django_db
+    def test_location_filter(self):
+        lyon = self.create_location("69003", "Lyon")
+        self.create_location("75001", "Paris")
+
+        def filtered(query: str) -> list:
+            return list(LocationFilter(QueryDict(query)).filter(Location.objects.all()))
+
+        assert filtered("near=69001") == [lyon]
+        assert len(filtered("near=69001&radius=200")) == 1
+        assert len(filtered("near=69001&radius=0.5")) == 0
+        for query in [
+            "radius=20",
+            "near=00000",
+            "near=69001&radius=0",
+            "near=69001&radius=400",
+        ]:
+            with pytest.raises(FilterError):
+                filtered(query)
@@ -162,6 +162,23 @@ class TestCollaborator:
         with pytest.raises(expected_exception=NumberParseException):
             collaborator.phone = parse("1234", None)
 
+    @pytest.mark.django_db
+    def test_save_phones(self):
+        collaborator = self.collaborator_instance()
+        collaborator.department.save()
+        collaborator.save()
+
+        # the formats are stored by save()
+        collaborator = Collaborator.objects.get(id=collaborator.id)
+        assert collaborator.phone_international == "+33 6 05 04 03 02"
+        assert collaborator.phone_e164 == "+33605040302"
+        assert collaborator.formatted_phone == collaborator.phone_international
+
+        collaborator.phone = None
+        collaborator.save()
+        assert collaborator.phone_international is collaborator.phone_e164 is None
+        assert collaborator.formatted_phone == unfilled
+
     @pytest.mark.django_db
     def test_save_slug(self):
         collaborator = self.collaborator_instance()
@@ -7,6 +7,7 @@ from django.utils.text import slugify
 
 from epic_events.models.company import Company
 from epic_events.models.str_template import unfilled
+from epic_events.upserts import get_or_create, save_or_get, upsert
 
 
 class TestCompany:
@@ -100,6 +101,57 @@ class TestCompany:
             company.name = None
             company.save()
 
+    @pytest.mark.django_db
+    def test_slug_form_unique_constraint(self):
+        company = self.company_instance()
+        company.save()
+
+        with pytest.raises(expected_exception=IntegrityError):
+            self.model(name="Entreprise ").save()
+
+    @pytest.mark.django_db
+    def test_get_or_create(self, django_assert_num_queries):
+        company, created = get_or_create(self.model, name="Epic Events")
+        assert created is True
+
+        # one indexed lookup of the normalized name
+        with django_assert_num_queries(1):
+            same_company, created = get_or_create(self.model, name=" epic  events")
+        assert (same_company, created) == (company, False)
+
+        # a part of the name is another company
+        other_company, created = get_or_create(self.model, name="Epic")
+        assert created is True
+        assert other_company != company
+
+    @pytest.mark.django_db
+    def test_save_or_get(self):
+        company1, _ = get_or_create(self.model, name="Epic Events")
+        company2, _ = get_or_create(self.model, name="Epic")
+
+        company2.name = "Epic Events"
+        obj, saved = save_or_get(company2)
+        assert (obj, saved) == (company1, False)
+        assert self.model.objects.get(id=company2.id).name == "Epic"
+
+        company2.name = "Legendary"
+        obj, saved = save_or_get(company2)
+        assert (obj, saved) == (company2, True)
+
+    @pytest.mark.django_db
+    def test_upsert(self):
+        assert upsert(self.model, [{"name": "Epic"}, {"name": "Legendary"}]) == 2
+
+        # the existing normalized names are skipped or updated
+        upsert(self.model, [{"name": "EPIC"}, {"name": "Events"}], ["name"])
+        assert sorted(self.model.objects.values_list("name", flat=True)) == [
+            "EPIC",
+            "Events",
+            "Legendary",
+        ]
+        for company in self.model.objects.all():
+            assert company.slug == f"{company.id} {slugify(company.name)}"
+
     # testing Company methods
     def test_french_name(self):
         assert self.model.french_name() == "Entreprise"
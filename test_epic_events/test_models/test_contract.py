@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 
 import pytest
+from django.db import transaction
 from django.db.models import F, Q
 from django.db.utils import IntegrityError
 from django.utils import timezone
@@ -11,6 +12,7 @@ from epic_events.models.collaborator import Collaborator
 from epic_events.models.contract_event import (
     Contract,
     Event,
+    contract_facets,
     contracts,
     contracts_ready_for_event,
     paid_contracts,
@@ -23,6 +25,7 @@ from epic_events.models.contract_event import (
     unsigned_unpaid_contracts,
 )
 from epic_events.models.customer import Customer
+from epic_events.models.rows import ContractRow
 from epic_events.models.str_template import no, unfilled, yes
 
 
@@ -147,6 +150,31 @@ class TestContract:
 
         assert contract.is_paid == (contract.total_amount - contract.amount_paid == 0)
 
+    @pytest.mark.django_db
+    def test_is_paid_stored(self):
+        contract = self.contract_instance()
+        contract.customer.commercial.save()
+        contract.customer.save()
+        contract.save()
+
+        assert Contract.objects.get().is_paid is False
+
+        contract.amount_paid = contract.total_amount
+        contract.save(update_fields=["amount_paid"])
+
+        assert contract.is_paid is True
+        assert Contract.objects.filter(is_paid=True).count() == 1
+
+        # the constraints reject the amounts disagreeing with is_paid
+        with pytest.raises(expected_exception=IntegrityError):
+            with transaction.atomic():
+                Contract.objects.update(amount_paid=0)
+
+        with pytest.raises(expected_exception=IntegrityError):
+            with transaction.atomic():
+                contract.amount_paid = contract.total_amount + 1
+                contract.save()
+
     def test_formatted_is_signed(self):
         contract = self.contract_instance()
 
@@ -317,6 +345,29 @@ class TestContract:
         assert len(qs) > 0
         assert contract.is_ready_for_event is False
 
+    @pytest.mark.django_db
+    def test_with_event_flag(self, django_assert_num_queries):
+        contract1 = self.contract_instance()
+        contract1.customer.commercial.save()
+        contract1.customer.save()
+        contract1.is_signed = True
+        contract1.save()
+        Event(contract=contract1).save()
+
+        contract2 = self.contract_instance()
+        contract2.customer = contract1.customer
+        contract2.is_signed = True
+        contract2.save()
+
+        # the flag is read from the annotation, without one query per contract
+        with django_assert_num_queries(1):
+            qs = Contract.objects.with_event_flag().order_by("id")
+            assert [contract.is_ready_for_event for contract in qs] == [False, True]
+
+        # one event per contract
+        with pytest.raises(expected_exception=IntegrityError):
+            Event(contract=contract1).save()
+
     def test_french_name(self):
         assert self.model.french_name() == "Contrat"
 
@@ -341,6 +392,39 @@ class TestContract:
         contract.save()
         assert contract.slug == f"{contract.id}{contract.total_amount}"
 
+    @pytest.mark.django_db
+    def test_rows(self):
+        contract1 = self.contract_instance()
+        contract1.customer.commercial.save()
+        contract1.customer.save()
+        contract1.is_signed = True
+        contract1.save()
+
+        contract2 = Contract(customer=None, total_amount=0)
+        contract2.save()
+
+        rows = list(contracts().rows())
+        qs = contracts()
+
+        assert [type(row) for row in rows] == [ContractRow, ContractRow]
+        # the rows display the same fields than the model instances
+        for row, contract in zip(rows, qs):
+            assert row.id == contract.id
+            assert row.customer_id == contract.customer_id
+            assert row.customer_name == contract.customer_name
+            assert row.commercial_id == contract.commercial_id
+            assert row.commercial_name == contract.commercial_name
+            assert row.has_commercial == contract.customer_has_commercial
+            assert row.is_signed == contract.is_signed
+            assert row.is_paid == contract.is_paid
+            assert row.is_ready_for_event == contract.is_ready_for_event
+            assert row.formatted_total_amount == contract.formatted_total_amount
+            assert row.formatted_amount_paid == contract.formatted_amount_paid
+
+        # the row has no __dict__
+        with pytest.raises(expected_exception=AttributeError):
+            rows[0].note = ""
+
     # test contract filters
     @pytest.mark.django_db
     def test_contracts(self):
@@ -429,6 +513,36 @@ class TestContract:
 
         assert list(qs1) == list(qs2)
 
+    @pytest.mark.django_db
+    def test_contract_facets(self, django_assert_num_queries):
+        contract1 = self.contract_instance()
+        contract1.customer.commercial.save()
+        contract1.customer.save()
+        contract1.save()
+
+        contract2 = self.contract_instance()
+        contract2.customer = contract1.customer
+        contract2.is_signed = True
+        contract2.amount_paid = contract2.total_amount
+        contract2.save()
+
+        # contract without customer
+        Contract(is_signed=True).save()
+
+        with django_assert_num_queries(1):
+            facets = contract_facets(contract1.customer.commercial.id)
+
+        assert facets["all"] == 3
+        assert facets["my_all"] == 2
+        assert facets["signed_paid"] == 2
+        assert facets["my_signed_paid"] == 1
+        assert facets["unsigned_unpaid"] == facets["my_unsigned_unpaid"] == 1
+        assert facets["signed_unpaid"] == facets["unsigned_paid"] == 0
+        assert facets["ready_for_event"] == 2
+        # the counts match the filters
+        commercial = contract1.customer.commercial
+        assert facets["my_ready_for_event"] == len(contracts_ready_for_event(commercial))
+
     @pytest.mark.django_db
     def test_contracts_ready_for_event(self):
         contract1 = self.contract_instance()
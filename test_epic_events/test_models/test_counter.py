@@ -0,0 +1,158 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from phonenumbers import parse
+
+from epic_events.models.collaborator import Collaborator
+from epic_events.models.contract_event import Contract, Event
+from epic_events.models.counter import Counter, compute_counters, scope_name
+from epic_events.models.customer import Customer
+
+
+class TestCounter:
+    model = Counter
+
+    def collaborator_instance(self, number: int) -> Collaborator:
+        return Collaborator(
+            first_name="John",
+            last_name="Doe",
+            email=f"johndoe{number}@gmail.com",
+            phone=parse("+33605040302", None),
+            birthdate=date(year=2000, month=1, day=1),
+        )
+
+    def customer_instance(self) -> Customer:
+        commercial = self.collaborator_instance(1)
+        commercial.save()
+
+        return Customer(
+            first_name="Jean",
+            last_name="Dupont",
+            email="JeanDupont@gmail.com",
+            phone=parse("+33605040302", None),
+            commercial=commercial,
+        )
+
+    def test_scope_name(self):
+        assert scope_name() == "global"
+        assert scope_name(1) == "collaborator-1"
+
+    @pytest.mark.django_db
+    def test_counters_follow_saves(self):
+        customer = self.customer_instance()
+        customer.save()
+        commercial = customer.commercial
+
+        global_counter = Counter.objects.get(scope=scope_name())
+        my_counter = Counter.objects.get(scope=scope_name(commercial.id))
+        assert global_counter.customers == my_counter.customers == 1
+
+        contract = Contract(customer=customer, total_amount=100)
+        contract.save()
+        my_counter.refresh_from_db()
+        assert my_counter.contracts == 1
+        assert my_counter.unsigned_contracts == my_counter.unpaid_contracts == 1
+
+        contract.is_signed = True
+        contract.amount_paid = 100
+        contract.save()
+        my_counter.refresh_from_db()
+        assert my_counter.unsigned_contracts == my_counter.unpaid_contracts == 0
+        assert my_counter.contracts_ready_for_event == 1
+
+        support = self.collaborator_instance(2)
+        support.save()
+        event = Event(contract=contract, support=support)
+        event.save()
+        my_counter.refresh_from_db()
+        assert my_counter.contracts_ready_for_event == 0
+        assert Counter.objects.get(scope=scope_name(support.id)).events == 1
+
+        # the deletion cascades to the contract and the event
+        customer.delete()
+        for counter in Counter.objects.all():
+            assert [getattr(counter, field) for field in Counter.fields] == [0] * 7
+
+    @pytest.mark.django_db
+    @pytest.mark.django_db
+    def test_counters_add_differences(self):
+        customer = self.customer_instance()
+        customer.save()
+        Counter.objects.filter(scope=scope_name()).update(customers=10)
+
+        # the counters are not recomputed, the differences are added
+        Customer(first_name="Marie", last_name="Durand", email="md@gmail.com").save()
+        assert Counter.objects.get(scope=scope_name()).customers == 11
+
+        # a write changing no count updates no counter
+        customer.first_name = "Jack"
+        with CaptureQueriesContext(connection) as context:
+            customer.save()
+        assert not [query for query in context if "counter" in query["sql"]]
+
+    @pytest.mark.django_db
+    def test_counters_follow_collaborator_delete(self):
+        customer = self.customer_instance()
+        customer.save()
+        contract = Contract(customer=customer)
+        contract.save()
+        support = self.collaborator_instance(2)
+        support.save()
+        Event(contract=contract, support=support).save()
+        assert Counter.objects.get(scope=scope_name()).events_without_support == 0
+
+        # SET_NULL : the events lose their support, the customers their
+        # commercial, and the counters of the collaborators are deleted
+        support.delete()
+        customer.commercial.delete()
+        counter = Counter.objects.get()
+        assert counter.scope == scope_name()
+        assert counter.events_without_support == 1
+        assert {
+            field: getattr(counter, field) for field in Counter.fields
+        } == compute_counters()
+
+    @pytest.mark.django_db
+    def test_for_home(self, django_assert_num_queries):
+        customer = self.customer_instance()
+        customer.save()
+        commercial = customer.commercial
+
+        with django_assert_num_queries(1):
+            counters, my_counters = Counter.objects.for_home(commercial.id)
+        assert counters.scope == scope_name()
+        assert my_counters.customers == 1
+
+        # the missing counters are computed
+        support = self.collaborator_instance(2)
+        support.save()
+        counters, my_counters = Counter.objects.for_home(support.id)
+        assert my_counters.scope == scope_name(support.id)
+        assert my_counters.events == 0
+
+    @pytest.mark.django_db
+    def test_reconcile_counters(self):
+        customer = self.customer_instance()
+        customer.save()
+        Contract(customer=customer).save()
+
+        # bulk updates do not refresh the counters
+        Contract.objects.update(is_signed=True)
+        Counter.objects.create(scope=scope_name(0))
+
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+
+        assert "2 counters reconciled, 2 drifted, 1 orphans deleted" in out.getvalue()
+        for counter in Counter.objects.all():
+            if counter.scope == scope_name():
+                expected = compute_counters()
+            else:
+                expected = compute_counters(customer.commercial.id)
+            assert {field: getattr(counter, field) for field in Counter.fields} == (
+                expected
+            )
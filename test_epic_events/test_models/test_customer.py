@@ -8,7 +8,9 @@ from phonenumbers import parse
 from phonenumbers.phonenumberutil import NumberParseException
 
 from epic_events.models.collaborator import Collaborator, Department
+from epic_events.models.contract_event import Contract, Event
 from epic_events.models.customer import Company, Customer
+from epic_events.models.rows import CustomerRow
 from epic_events.models.str_template import unfilled
 
 
@@ -239,6 +241,63 @@ class TestCustomer:
 
         assert customer.company_name == unfilled
 
+    @pytest.mark.django_db
+    def test_rows(self):
+        customer1 = self.customer_instance()
+        customer1.company.save()
+        customer1.commercial.department.save()
+        customer1.commercial.save()
+        customer1.save()
+
+        customer2 = self.customer_instance()
+        customer2.email = "2_jeandupont@gmail.com"
+        customer2.company = customer2.commercial = None
+        customer2.save()
+
+        rows = list(Customer.objects.order_by("-edition_time").rows())
+        qs = Customer.objects.order_by("-edition_time")
+
+        assert [type(row) for row in rows] == [CustomerRow, CustomerRow]
+        # the rows display the same fields than the model instances
+        for row, customer in zip(rows, qs):
+            assert row.id == customer.id
+            assert row.name == customer.name
+            assert row.company_id == customer.company_id
+            assert row.company_name == customer.company_name
+            assert row.commercial_id == customer.commercial_id
+            assert row.commercial_name == customer.commercial_name
+
+    @pytest.mark.django_db
+    def test_with_stats(self):
+        customer = self.customer_instance()
+        customer.company = customer.commercial = None
+        customer.save()
+
+        # test a Customer without contract
+        obj = Customer.objects.with_stats().get(id=customer.id)
+        assert obj.contracts_count == 0
+        assert obj.total_amount_sum == obj.remaining_amount_sum == 0
+        assert obj.next_event_date is None
+
+        # test a Customer with contracts and events
+        next_date = timezone.now() + timedelta(days=1)
+        Contract(customer=customer, total_amount=1000, amount_paid=1000).save()
+        contract = Contract(customer=customer, total_amount=500, is_signed=True)
+        contract.save()
+        Event(contract=contract, start_date=next_date).save()
+        past_contract = Contract(customer=customer, total_amount=100, is_signed=True)
+        past_contract.save()
+        Event(contract=past_contract, start_date=next_date - timedelta(days=7)).save()
+
+        obj = Customer.objects.with_stats().get(id=customer.id)
+        assert obj.contracts_count == 3
+        assert obj.signed_contracts_count == 2
+        assert obj.unpaid_contracts_count == 2
+        assert obj.total_amount_sum == 1600
+        assert obj.remaining_amount_sum == 600
+        assert obj.events_count == 2
+        assert obj.next_event_date == next_date
+
     def test_french_name(self):
         assert self.model.french_name() == "Client"
 
@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.utils.text import slugify
 from phonenumbers import parse
@@ -14,6 +16,7 @@ from epic_events.models.contract_event import (
     events_without_support,
 )
 from epic_events.models.customer import Customer
+from epic_events.models.rows import EventRow
 from epic_events.models.str_template import unfilled
 
 
@@ -295,6 +298,77 @@ class TestEvent:
         assert event.support is None
         assert event.slug == slug
 
+    @pytest.mark.django_db
+    def test_save_writes(self):
+        event = self.event_instance()
+        event.support.department.save()
+        event.support.save()
+        event.location.save()
+        event.contract.customer.commercial.department.save()
+        event.contract.customer.commercial.save()
+        event.contract.customer.save()
+        event.contract.save()
+
+        def event_writes(context) -> list:
+            return [
+                q["sql"].split()[0]
+                for q in context
+                if '"epic_events_event"' in q["sql"].split(" SET ")[0]
+                and q["sql"].startswith(("INSERT", "UPDATE"))
+            ]
+
+        # one INSERT, then one UPDATE of the slug built with the new id
+        with CaptureQueriesContext(connection) as context:
+            event.save()
+        assert event_writes(context) == ["INSERT", "UPDATE"]
+
+        # the slug is unchanged : one single UPDATE
+        with CaptureQueriesContext(connection) as context:
+            event.save()
+        assert event_writes(context) == ["UPDATE"]
+
+        # the removed support changes the slug : one more UPDATE
+        event.support = None
+        with CaptureQueriesContext(connection) as context:
+            event.save()
+        assert event_writes(context) == ["UPDATE", "UPDATE"]
+        assert event.slug.endswith(slugify(unfilled))
+        assert Event.objects.get(id=event.id).slug == event.slug
+
+    @pytest.mark.django_db
+    def test_rows(self):
+        event1 = self.event_instance()
+        event1.support.department.save()
+        event1.support.save()
+        event1.location.save()
+        event1.contract.customer.commercial.department.save()
+        event1.contract.customer.commercial.save()
+        event1.contract.customer.save()
+        event1.contract.save()
+        event1.note = "note"
+        event1.save()
+
+        event2 = self.event_instance()
+        event2.support = event2.location = event2.contract = None
+        event2.save()
+
+        rows = list(events().rows())
+        qs = events()
+
+        assert [type(row) for row in rows] == [EventRow, EventRow]
+        # the rows display the same fields than the model instances
+        for row, event in zip(rows, qs):
+            assert row.id == event.id
+            assert row.contract_id == event.contract_id
+            assert row.location_id == event.location_id
+            assert row.commercial_id == event.commercial_id
+            assert row.commercial_name == event.commercial_name
+            assert row.support_id == event.support_id
+            assert row.support_name == event.support_name
+
+        # the note is not loaded
+        assert not hasattr(rows[0], "note")
+
     """ test event filters """
 
     @pytest.mark.django_db
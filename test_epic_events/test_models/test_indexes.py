@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.http import QueryDict
+
+from epic_events.filters import ContractFilter, EventFilter
+from epic_events.models.contract_event import Contract, Event, contracts, events
+from epic_events.models.customer import Customer
+
+
+def query_plan(qs) -> str:
+    """EXPLAIN QUERY PLAN of the first page of the qs, in the order of the lists"""
+
+    qs = qs.order_by(F("edition_time").desc(nulls_last=True), "-id")[:11]
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return "\n".join(str(row) for row in cursor.fetchall())
+
+
+class TestIndexes:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "qs, index",
+        [
+            (Contract.objects.all(), "contract_list_idx"),
+            (Customer.objects.filter(commercial_id=1), "customer_commercial_list_idx"),
+            (Event.objects.filter(location_id=1), "event_location_list_idx"),
+        ],
+    )
+    def test_lists_read_the_indexes(self, qs, index: str):
+        plan = query_plan(qs)
+
+        assert index in plan
+        # the rows are read in the order of the index, without sort
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "filterset, index",
+        [
+            (ContractFilter(QueryDict("customer=1")), "contract_customer_list_idx"),
+            (
+                ContractFilter(QueryDict("signed=1&paid=0")),
+                "contract_signed_unpaid_idx",
+            ),
+            (
+                ContractFilter(QueryDict("signed=0&paid=0")),
+                "contract_unsigned_unpaid_idx",
+            ),
+            (
+                ContractFilter(QueryDict("signed=1"), commercial=1),
+                "customer_commercial_list_idx",
+            ),
+        ],
+    )
+    def test_contract_filters_read_the_indexes(self, filterset, index: str):
+        assert index in query_plan(filterset.filter(contracts()))
+
+    @pytest.mark.django_db
+    def test_event_filters_read_the_indexes(self):
+        plan = query_plan(EventFilter(QueryDict("support=1")).filter(events()))
+
+        assert "event_support_list_idx" in plan
+        assert "TEMP B-TREE" not in plan
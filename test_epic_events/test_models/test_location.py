@@ -1,10 +1,14 @@
-from datetime import timedelta
+from datetime import date, timedelta
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from django.utils.text import slugify
+from phonenumbers import parse
 
+from epic_events.models.collaborator import Collaborator
 from epic_events.models.location import Location
 from epic_events.models.str_template import unfilled
 
@@ -159,6 +163,51 @@ class TestLocation:
 
         assert location.__str__(name=False) == location.formatted_address
 
+    @pytest.mark.django_db
+    def test_save_address(self):
+        location = self.location_instance()
+        location.save()
+
+        # the address is stored by save() and read without formatting
+        location = Location.objects.get(id=location.id)
+        assert location.address == location.build_address()
+        assert location.formatted_address == "5 Avenue Anatole France, 75007 Paris."
+
+        # the next save() stores the new address
+        location.number = None
+        location.save()
+        assert location.formatted_address == "Avenue Anatole France, 75007 Paris."
+
+    @pytest.mark.django_db
+    def test_backfill_display_columns(self):
+        location = self.location_instance()
+        location.save()
+        collaborator = Collaborator(
+            first_name="John",
+            last_name="Doe",
+            email="johndoe@gmail.com",
+            phone=parse("+33605040302", None),
+            birthdate=date(year=2000, month=1, day=1),
+        )
+        collaborator.save()
+
+        # rows saved before the columns
+        Location.objects.update(address=None)
+        Collaborator.objects.update(phone_international=None, phone_e164=None)
+
+        out = StringIO()
+        call_command("backfill_display_columns", stdout=out)
+
+        assert "collaborators : 1 phones stored" in out.getvalue()
+        assert "locations : 1 addresses stored" in out.getvalue()
+        assert Location.objects.get().address == location.address
+        assert Collaborator.objects.get().phone_e164 == "+33605040302"
+
+        # the filled rows are skipped
+        out = StringIO()
+        call_command("backfill_display_columns", stdout=out)
+        assert "locations : 0 addresses stored" in out.getvalue()
+
     def test_french_name(self):
         assert self.model.french_name() == "Lieu"
 
@@ -172,6 +221,22 @@ class TestLocation:
 
         assert location.slug == f"{location.id} {slugify(str(location))}"
 
+    @pytest.mark.django_db
+    @pytest.mark.usefixtures("memory_cache")
+    def test_save_writes(self, django_assert_num_queries):
+        location = self.location_instance()
+
+        # the INSERT, then the UPDATE of the slug built with the new id
+        with django_assert_num_queries(2):
+            location.save()
+
+        # the slug is built before the single UPDATE
+        location.city = "Lyon"
+        with django_assert_num_queries(1):
+            location.save()
+        assert location.slug == f"{location.id} {slugify(str(location))}"
+        assert Location.objects.get(id=location.id).slug == location.slug
+
     @pytest.mark.django_db
     def test_save_slug_form(self):
         location = self.location_instance()
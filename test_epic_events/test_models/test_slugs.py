@@ -0,0 +1,122 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from epic_events.models.collaborator import Collaborator, Department
+from epic_events.models.company import Company
+from epic_events.models.contract_event import Contract, Event
+from epic_events.models.customer import Customer
+from epic_events.models.mixins import TimeFieldMixin, UserMixin
+from epic_events.models.slugs import slug_dependents
+
+
+class TestSlugs:
+    def collaborator_instance(self, number: int) -> Collaborator:
+        department = Department(name="Commercial")
+        department.save()
+
+        return Collaborator(
+            first_name="John",
+            last_name="Doe",
+            email=f"johndoe{number}@gmail.com",
+            birthdate=date(year=2000, month=1, day=1),
+            department=department,
+        )
+
+    def create_events(self, number: int) -> Collaborator:
+        """number contracts and events of one customer, with the same commercial
+        and support"""
+
+        commercial = self.collaborator_instance(1)
+        commercial.save()
+        company = Company(name="Epic")
+        company.save()
+        customer = Customer(
+            first_name="Jean",
+            last_name="Dupont",
+            email="JeanDupont@gmail.com",
+            company=company,
+            commercial=commercial,
+        )
+        customer.save()
+
+        for _ in range(number):
+            contract = Contract(customer=customer, total_amount=100)
+            contract.save()
+            Event(contract=contract, support=commercial).save()
+
+        return commercial
+
+    def slugs(self) -> dict:
+        return {
+            model: list(model.objects.order_by("id").values_list("slug", flat=True))
+            for model in [Department, Collaborator, Company, Customer, Contract, Event]
+        }
+
+    def test_slug_dependents(self):
+        assert set(slug_dependents(Collaborator)) == {
+            (Customer, "commercial"),
+            (Contract, "customer__commercial"),
+            (Event, "contract__customer__commercial"),
+            (Event, "support"),
+        }
+        assert slug_dependents(Company) == [(Customer, "company")]
+        assert slug_dependents(Department) == [(Collaborator, "department")]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("number", [1, 20])
+    @pytest.mark.usefixtures("memory_cache")
+    def test_rename_refreshes_dependent_slugs(self, number: int):
+        commercial = self.create_events(number)
+
+        # 1. rename the commercial
+        commercial.first_name = "Jack"
+        with CaptureQueriesContext(connection) as context:
+            commercial.save()
+        # the dependent rows are read and written by chunks
+        assert len(context) <= 10
+
+        for model in [Customer, Contract, Event]:
+            for slug in model.objects.values_list("slug", flat=True):
+                assert "jack" in slug
+
+        # 2. a save without new name does not refresh the slugs
+        with CaptureQueriesContext(connection) as context:
+            commercial.save()
+        assert len(context) == 2
+
+        # 3. rename the company
+        company = Company.objects.get()
+        company.name = "Legendary"
+        company.save()
+        assert "legendary" in Customer.objects.get().slug
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_rebuild_slugs(self, workers: int):
+        self.create_events(5)
+        slugs = self.slugs()
+
+        # bulk updates do not build the slugs
+        for model in slugs:
+            model.objects.update(slug="stale")
+
+        out = StringIO()
+        call_command("rebuild_slugs", workers=workers, chunk_size=2, stdout=out)
+
+        assert "events : 5 slugs rebuilt" in out.getvalue()
+        assert self.slugs() == slugs
+
+    def test_default_slug_hooks(self, monkeypatch):
+        customer = Customer(
+            id=3, first_name="Jean", last_name="Dupont", email="jd@gmail.com"
+        )
+
+        # a model not overriding the hooks : its id, and no related names
+        assert TimeFieldMixin.build_slug(customer, {}) == "3"
+        monkeypatch.setattr(Customer, "slug_foreign_key", UserMixin.slug_foreign_key)
+        assert customer.build_slug({}) == "3 jean dupont jdgmailcom"
@@ -0,0 +1,109 @@
+from datetime import date, datetime
+
+import pytest
+from django.utils import timezone
+
+from epic_events.filters import FilterError
+from epic_events.models.collaborator import Collaborator
+from epic_events.models.company import Company
+from epic_events.models.contract_event import Contract, Event
+from epic_events.models.customer import Customer
+from epic_events.models.location import Location
+from epic_events.queries import (
+    ContractQuery,
+    parse_number,
+    search_query,
+    search_syntax,
+)
+
+
+class TestQueries:
+    def create_contracts(self) -> list[Contract]:
+        """contracts of the customers of two commercials, the events of the
+        first two in Lyon and in a 'rue de Lyon' in Paris"""
+
+        contracts = []
+        for number, (last_name, city) in enumerate(
+            [("Dupont", "Lyon"), ("Dupont", "Paris"), ("Martin", None)]
+        ):
+            commercial = Collaborator(
+                first_name="Jean",
+                last_name=last_name,
+                email=f"commercial{number}@gmail.com",
+                birthdate=date(year=2000, month=1, day=1),
+            )
+            commercial.save()
+            company = Company(name=f"Company {number}")
+            company.save()
+            customer = Customer(
+                first_name="Client",
+                last_name=f"{number}",
+                email=f"client{number}@gmail.com",
+                company=company,
+                commercial=commercial,
+            )
+            customer.save()
+            contract = Contract(
+                customer=customer,
+                total_amount=(number + 1) * 10000,
+                is_signed=number != 0,
+            )
+            contract.save()
+            contracts.append(contract)
+
+            if city is not None:
+                location = Location(
+                    street_name="de Lyon", city=city, zip=f"6900{number}"
+                )
+                location.save()
+                Event(
+                    contract=contract,
+                    location=location,
+                    start_date=timezone.make_aware(datetime(2026, 6, number + 1, 20)),
+                ).save()
+
+        return contracts
+
+    def test_parse(self):
+        conditions, free_text = ContractQuery(
+            'signed:Non Amount>10k "jean dupont" paid_amount<=0'
+        ).parse()
+
+        assert len(conditions) == 3
+        assert free_text == "jean dupont"
+        assert parse_number("10 000 €") == 10000
+
+    def test_syntax(self):
+        syntax = search_syntax(Contract)
+
+        assert syntax.startswith("commercial:… customer:…")
+        # the search views list the matches newest first
+        assert syntax.endswith("(les plus récents d'abord)")
+        assert search_syntax(Company) == "(les plus récents d'abord)"
+
+    @pytest.mark.parametrize(
+        "query",
+        ["note:1", "signed:peut-être", "signed>1", "amount>beaucoup", 'customer:"jean'],
+    )
+    def test_invalid_query(self, query: str):
+        with pytest.raises(expected_exception=FilterError):
+            ContractQuery(query).parse()
+
+    @pytest.mark.django_db
+    def test_search_query(self):
+        first, second, third = self.create_contracts()
+
+        def found(model, query: str) -> set:
+            return set(search_query(model, query))
+
+        assert found(Contract, "commercial:dupont") == {first, second}
+        assert found(Contract, 'commercial:"jean martin"') == {third}
+        assert found(Contract, "commercial:dupont signed:non") == {first}
+        assert found(Contract, "amount>10000 amount<=20k") == {second}
+        assert found(Contract, "paid:no city:lyon") == {first}
+        assert found(Contract, "support:aucun client-2") == {third}
+        assert found(Event, "city:paris") == {second.event}
+        assert found(Location, "city:LYON") == {first.event.location}
+        assert found(Event, "start:2026-06-02") == {second.event}
+        assert found(Event, "start>2026-06-01T21:00") == {second.event}
+        assert found(Customer, "company:company-1") == {second.customer}
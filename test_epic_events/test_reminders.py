@@ -0,0 +1,108 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from epic_events.models import Collaborator, Department, Event
+from epic_events.reminders import MailSink, Scheduler
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def send(self, event: Event):
+        self.events.append(event.id)
+
+
+@pytest.mark.django_db
+class TestReminders:
+    def create_support(self) -> Collaborator:
+        support = Collaborator(
+            first_name="John",
+            last_name="Doe",
+            email="support@gmail.com",
+            birthdate=date(year=2000, month=1, day=1),
+            department=Department.objects.create(name="Support"),
+        )
+        support.save()
+        return support
+
+    def create_event(self, start: datetime, support: Collaborator) -> Event:
+        event = Event(start_date=start, support=support)
+        event.save()
+        return event
+
+    def test_due_reminders_sent_once(self):
+        support = self.create_support()
+        now = timezone.now()
+        tomorrow = self.create_event(now + timedelta(hours=20), support)
+        later = self.create_event(now + timedelta(days=3), support)
+        # without support, or started
+        self.create_event(now + timedelta(hours=2), None)
+        self.create_event(now - timedelta(hours=1), support)
+
+        sink = ListSink()
+        scheduler = Scheduler(sink)
+        assert scheduler.run_once(now) == 1
+        assert sink.events == [tomorrow.id]
+        assert len(scheduler) == 1
+        assert scheduler.sleep_time(now) == scheduler.poll
+
+        # the reminder of the later event is due 2 days after
+        assert scheduler.run_once(now + timedelta(days=2, minutes=1)) == 1
+        assert sink.events == [tomorrow.id, later.id]
+
+        # a restarted process
+        assert Scheduler(sink).run_once(now) == 0
+
+    def test_moved_and_deleted_events(self):
+        support = self.create_support()
+        now = timezone.now()
+        moved = self.create_event(now + timedelta(days=3), support)
+        deleted = self.create_event(now + timedelta(days=3), support)
+
+        sink = ListSink()
+        scheduler = Scheduler(sink)
+        assert scheduler.run_once(now) == 0
+        assert len(scheduler) == 2
+
+        moved.start_date = now + timedelta(hours=10)
+        moved.save()
+        deleted.delete()
+        assert scheduler.run_once(now + timedelta(minutes=1)) == 1
+        assert sink.events == [moved.id]
+
+        # moved again, reminded of the new date
+        moved.start_date = now + timedelta(days=4)
+        moved.save()
+        assert scheduler.run_once(now + timedelta(minutes=2)) == 0
+        # the first date of the moved event is skipped
+        assert scheduler.run_once(now + timedelta(days=2, minutes=1)) == 0
+        assert scheduler.run_once(now + timedelta(days=3, minutes=1)) == 1
+        assert sink.events == [moved.id, moved.id]
+
+    def test_mail_sink(self):
+        support = self.create_support()
+        event = self.create_event(timezone.now() + timedelta(hours=5), support)
+
+        assert Scheduler(MailSink()).run_once() == 1
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["support@gmail.com"]
+        assert f"n°{event.id}" in mail.outbox[0].subject
+
+    def test_command(self, tmp_path):
+        support = self.create_support()
+        event = self.create_event(timezone.now() + timedelta(hours=5), support)
+        log = tmp_path / "reminders.log"
+
+        out = StringIO()
+        call_command(
+            "run_reminders", "--once", "--sink=log", f"--log-file={log}", stdout=out
+        )
+
+        assert "1 reminders sent" in out.getvalue()
+        assert f"n°{event.id}" in log.read_text()
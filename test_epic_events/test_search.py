@@ -0,0 +1,154 @@
+import pytest
+from django.db import connection
+
+from epic_events import search as search_module
+from epic_events.models.company import Company
+from epic_events.models.customer import Customer
+from epic_events.search import (
+    global_search,
+    is_sparse,
+    phone_number,
+    search,
+    search_table,
+    search_terms,
+)
+
+
+class TestSearch:
+    def create_companies(self, *names: str) -> list[Company]:
+        companies = [Company(name=name) for name in names]
+        for company in companies:
+            company.save()
+        return companies
+
+    def test_search_terms(self):
+        assert search_terms(" Jean  Dupont! ") == ["jean", "dupont"]
+        assert search_terms("?!") == []
+
+    @pytest.fixture(params=[False, True], ids=["scan", "index"])
+    def sparse(self, request, monkeypatch):
+        """matches the words by a scan of the rows or through the index"""
+
+        monkeypatch.setattr(search_module, "is_sparse", lambda *args: request.param)
+
+    @pytest.mark.django_db
+    def test_search_matches_every_word(self, sparse):
+        epic, legendary, _ = self.create_companies(
+            "Epic Events", "Legendary Events", "Epic"
+        )
+
+        assert set(search(Company, "events")) == {epic, legendary}
+        # the words are matched in any order
+        assert list(search(Company, "events EPIC")) == [epic]
+        # the substrings of the names
+        assert list(search(Company, "gendar")) == [legendary]
+        # the words shorter than a trigram
+        assert list(search(Company, "ry ev")) == [legendary]
+        assert list(search(Company, "unknown")) == []
+
+    @pytest.mark.django_db
+    def test_search_rank(self):
+        self.create_companies("Epic Events and Concerts", "Epic")
+
+        rows = list(search(Company, "epic"))
+
+        # the best match names the company
+        assert [company.name for company in rows] == [
+            "Epic",
+            "Epic Events and Concerts",
+        ]
+        assert rows[0].search_rank > rows[1].search_rank
+
+    @pytest.mark.django_db
+    def test_search_not_ranked(self):
+        self.create_companies("Epic", "Epic Events and Concerts")
+
+        rows = list(search(Company, "epic", ranked=False))
+
+        # the search views list the matches newest first
+        assert [company.name for company in rows] == [
+            "Epic Events and Concerts",
+            "Epic",
+        ]
+        assert not hasattr(rows[0], "search_rank")
+
+    @pytest.mark.django_db
+    def test_index_follows_the_writes(self, sparse):
+        (company,) = self.create_companies("Epic")
+        customer = Customer(
+            first_name="Jean", last_name="Dupont", email="jd@gmail.com", company=company
+        )
+        customer.save()
+
+        assert list(search(Customer, "epic dupont")) == [customer]
+
+        # the slugs rewritten by the rename of the company, with bulk_update()
+        company.name = "Legendary"
+        company.save()
+
+        assert list(search(Customer, "epic")) == []
+        assert list(search(Customer, "legendary jean")) == [customer]
+
+        customer.delete()
+        assert list(search(Customer, "legendary")) == []
+
+    @pytest.mark.django_db
+    def test_search_candidates(self, monkeypatch):
+        monkeypatch.setattr(search_module, "is_sparse", lambda *args: False)
+        companies = self.create_companies("Epic", "Epic 1", "Epic 2", "Epic 3")
+
+        # the common words rank the most recent rows only
+        assert set(search(Company, "epic", candidates=2)) == set(companies[2:])
+        assert len(search(Company, "epic")) == 4
+
+    @pytest.mark.django_db
+    def test_is_sparse(self):
+        self.create_companies(*[f"Company {i}" for i in range(200)], "Epic")
+
+        assert is_sparse(Company, ["epic"])
+        assert is_sparse(Company, ["unknown"])
+        # the scan finds the first page of them sooner
+        assert not is_sparse(Company, ["company"])
+
+    @pytest.mark.django_db
+    def test_search_reads_the_index(self):
+        self.create_companies(*[f"Company {i}" for i in range(99)], "Epic")
+
+        sql, params = search(Company, "epic").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = str(cursor.fetchall())
+
+        assert search_table(Company) in plan
+        assert "SCAN epic_events_company " not in plan
+
+    @pytest.mark.django_db
+    def test_global_search(self, django_assert_max_num_queries):
+        epic, legendary = self.create_companies("Epic Events", "Legendary")
+        customers = []
+        for i, company in enumerate([epic, epic, legendary]):
+            customer = Customer(
+                first_name="Jean",
+                last_name=f"Epic {i}",
+                email=f"{i}_jd@gmail.com",
+                company=company,
+                phone="+33612345678" if i == 2 else None,
+            )
+            customer.save()
+            customers.append(customer)
+
+        # the probes of the indexes, one UNION ALL, one read per model
+        with django_assert_max_num_queries(2 * 2 + 1 + 2):
+            results = global_search("epic", {Company: 5, Customer: 1})
+
+        # the best matches of each model, as ranked by its search
+        assert results == {
+            Company: [epic],
+            Customer: list(search(Customer, "epic")[:1]),
+        }
+
+        # a phone number, in any format, is looked up in the phones
+        assert phone_number("06 12 34 56 78") == "+33612345678"
+        assert phone_number("epic") is None
+        results = global_search("06 12 34 56 78", {Company: 5, Customer: 5})
+        assert results == {Customer: [customers[2]]}
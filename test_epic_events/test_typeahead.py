@@ -0,0 +1,163 @@
+import pytest
+from django.core.cache import cache
+
+from epic_events import facets
+from epic_events import typeahead as typeahead_module
+from epic_events.models.collaborator import Collaborator
+from epic_events.models.company import Company
+from epic_events.models.customer import Customer
+from epic_events.models.deletion import Deletion
+from epic_events.typeahead import PrefixIndex, indexes, name_keys, typeahead
+from epic_events.upserts import upsert
+
+
+@pytest.fixture(autouse=True)
+def empty_indexes():
+    """the indexes of the process outlive the rows of the previous tests"""
+
+    cache.clear()
+    for index in indexes.values():
+        index.version = None
+        index.checked = None
+
+
+@pytest.mark.django_db
+class TestTypeahead:
+    def create_customer(self, first_name: str, last_name: str, email: str):
+        customer = Customer(first_name=first_name, last_name=last_name, email=email)
+        customer.save()
+        return customer
+
+    def test_name_keys(self):
+        assert name_keys("Jean  Dupont-Éric") == {
+            "jean-dupont-eric",
+            "dupont-eric",
+            "eric",
+        }
+
+    def test_typeahead_matches_the_prefixes(self):
+        jean = self.create_customer("Jean", "Dupont", "jd@gmail.com")
+        marie = self.create_customer("Marie", "Durand", "marie@epic.com")
+
+        def ids(prefix: str) -> list:
+            return [id for id, _ in indexes[Customer].search(prefix, 10)]
+
+        assert ids("du") == [jean.id, marie.id]
+        # the first name, the last name, in any order, and the email
+        assert ids("dupont j") == [jean.id]
+        assert ids("Jean Dup") == [jean.id]
+        assert ids("MARIE@") == [marie.id]
+        # a prefix only, not the substrings
+        assert ids("pont") == []
+        assert ids(" ") == []
+
+        # one result per row, as many as the limit
+        assert indexes[Customer].search("d", 1) == [
+            (jean.id, "Jean Dupont <jd@gmail.com>")
+        ]
+
+    def test_typeahead_limits_per_role(self):
+        for i in range(10):
+            self.create_customer("Jean", f"Dupont {i}", f"{i}_jd@gmail.com")
+
+        results = typeahead("Support", "jean")
+        assert list(results) == list(typeahead_module.role_limits["Support"])
+        assert len(results[Customer]) == 5
+        # the collaborators are listed to the managers
+        assert Collaborator not in typeahead("Commercial", "jean")
+        assert Collaborator in typeahead("Gestion", "jean")
+        assert typeahead("unknown", "jean") == {}
+
+    def test_typeahead_follows_the_writes(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        assert typeahead("Gestion", "epic")[Company] == []
+        index = indexes[Company]
+        # the index of another process, reading the version on each keystroke
+        monkeypatch.setattr(typeahead_module, "version_check_interval", 0)
+        other = PrefixIndex(Company)
+        other.search("epic", 5)
+
+        # the writes are synced from the rows saved and deleted, without
+        # reading the table again
+        def rebuild(*args):
+            raise AssertionError("rebuilt")
+
+        monkeypatch.setattr(index, "rebuild", rebuild)
+        monkeypatch.setattr(other, "rebuild", rebuild)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            company = Company(name="Epic Events")
+            company.save()
+        assert index.search("events", 5) == [(company.id, "Epic events")]
+        assert other.search("events", 5) == [(company.id, "Epic events")]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            company.name = "Legendary"
+            company.save()
+        assert index.search("epic", 5) == []
+        assert other.search("leg", 5) == [(company.id, "Legendary")]
+
+        id = company.id
+        with django_capture_on_commit_callbacks(execute=True):
+            company.delete()
+        assert Deletion.objects.filter(model="epic_events.company", row_id=id).exists()
+        assert index.search("leg", 5) == []
+        assert other.search("leg", 5) == []
+
+        # the bulk writes, sending no signal
+        with django_capture_on_commit_callbacks(execute=True):
+            upsert(Company, [{"name": "Epic"}])
+        assert index.version != facets.version(index.version_key)
+        assert [label for _, label in index.search("epic", 5)] == ["Epic"]
+        with django_capture_on_commit_callbacks(execute=True):
+            upsert(Company, [{"name": "EPIC"}], ["name"])
+        assert [label for _, label in other.search("epic", 5)] == ["Epic"]
+
+    def test_typeahead_reads_the_version_once_per_interval(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        index = indexes[Company]
+        other = PrefixIndex(Company)
+        other.search("epic", 5)
+
+        with django_assert_num_queries(0):
+            for prefix in ("e", "ep", "epi"):
+                assert other.search(prefix, 5) == []
+
+        # the writes of another process are listed once the interval elapsed,
+        # those of the process at once
+        with django_capture_on_commit_callbacks(execute=True):
+            company = Company(name="Epic")
+            company.save()
+        assert index.search("epic", 5) == [(company.id, "Epic")]
+        assert other.search("epic", 5) == []
+        other.checked -= typeahead_module.version_check_interval
+        assert other.search("epic", 5) == [(company.id, "Epic")]
+
+    def test_typeahead_rebuilt_after_the_deletions_kept(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        first, second = Company(name="Epic"), Company(name="Epic Events")
+        first.save()
+        second.save()
+        index = indexes[Company]
+        assert len(index.search("epic", 5)) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        index.synced -= typeahead_module.deletions_retention
+        rebuilt = []
+        monkeypatch.setattr(index, "rebuild", lambda version: rebuilt.append(version))
+
+        index.search("epic", 5)
+        assert rebuilt == [facets.version(index.version_key)]
+
+    def test_rolled_back_save_is_not_listed(self, django_capture_on_commit_callbacks):
+        typeahead("Gestion", "epic")
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            Company(name="Epic").save()
+
+        assert callbacks
+        assert indexes[Company].search("epic", 5) == []
@@ -6,7 +6,9 @@ from epic_events.urls.customer import (
     CreateView,
     DeleteView,
     DetailView,
+    DuplicatesView,
     ListView,
+    MergeView,
     MyListView,
     SearchView,
     UpdateView,
@@ -24,6 +26,8 @@ class TestCustomer:
             ("/customers/create/", "create_customer", None, CreateView),
             ("/customers/1/update/", "update_customer", 1, UpdateView),
             ("/customers/1/delete/", "delete_customer", 1, DeleteView),
+            ("/customers/duplicates/", "customer_duplicates", None, DuplicatesView),
+            ("/customers/duplicates/1/merge/", "merge_customers", 1, MergeView),
         ],
     )
     def test_url(self, url_path: str, url_name: str, id: int, ViewClass: View):
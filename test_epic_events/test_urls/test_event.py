@@ -11,7 +11,10 @@ from epic_events.urls.event import (
     SearchView,
     UpdateView,
     ChangeSupportView,
-    ListEventsWithoutSupport,
+    ConflictsView,
+    CalendarView,
+    FeedView,
+    AssignSupportsView,
 )
 
 
@@ -19,7 +22,6 @@ class TestEvent:
     @pytest.mark.parametrize(
         "url_path, url_name, id, ViewClass",
         [
-            ("/events/without_support/", "events_without_support", None, ListEventsWithoutSupport),
             ("/events/", "events", None, ListView),
             ("/collaborators/1/my_events/", "my_events", 1, MyListView),
             ("/events/1/", "event", 1, DetailView),
@@ -28,6 +30,10 @@ class TestEvent:
             ("/events/1/update/", "update_event", 1, UpdateView),
             ("/events/1/delete/", "delete_event", 1, DeleteView),
             ("/events/1/change_support/", "change_support", 1, ChangeSupportView),
+            ("/events/conflicts/", "event_conflicts", None, ConflictsView),
+            ("/events/calendar/", "event_calendar", None, CalendarView),
+            ("/collaborators/1/events.ics", "event_feed", 1, FeedView),
+            ("/events/assign_supports/", "assign_supports", None, AssignSupportsView),
         ],
     )
     def test_url(self, url_path: str, url_name: str, id: int, ViewClass: View):
@@ -5,6 +5,7 @@ from epic_events.urls.location import (
     DeleteView,
     DetailView,
     ListView,
+    NearbyView,
     SearchView,
     UpdateView,
 )
@@ -31,6 +32,16 @@ class TestLocation:
         # 3. view_class check
         assert resolve("/locations/1/").func.view_class == DetailView
 
+    def test_nearby_url(self):
+        # 1. path check
+        assert reverse("nearby_locations") == "/locations/nearby/"
+
+        # 2. view_name check
+        assert resolve("/locations/nearby/").view_name == "nearby_locations"
+
+        # 3. view_class check
+        assert resolve("/locations/nearby/").func.view_class == NearbyView
+
     def test_search_url(self):
         # 1. path check
         assert reverse("search_location", args=[1]) == "/locations/1/search/"
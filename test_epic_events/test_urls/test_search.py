@@ -0,0 +1,15 @@
+from django.urls import resolve, reverse
+
+from epic_events.urls.search import GlobalSearchView
+
+
+class TestSearch:
+    def test_global_search_url(self):
+        # 1. path check
+        assert reverse("global_search") == "/find/"
+
+        # 2. view_name check
+        assert resolve("/find/").view_name == "global_search"
+
+        # 3. view_class check
+        assert resolve("/find/").func.view_class == GlobalSearchView
@@ -0,0 +1,15 @@
+from django.urls import resolve, reverse
+
+from epic_events.urls.typeahead import TypeaheadView
+
+
+class TestTypeahead:
+    def test_typeahead_url(self):
+        # 1. path check
+        assert reverse("typeahead") == "/typeahead/"
+
+        # 2. view_name check
+        assert resolve("/typeahead/").view_name == "typeahead"
+
+        # 3. view_class check
+        assert resolve("/typeahead/").func.view_class == TypeaheadView
@@ -5,6 +5,7 @@ from django.urls import reverse
 from pytest_django.asserts import assertTemplateUsed
 
 from epic_events.models import Collaborator, Contract, Customer, Department
+from epic_events.upserts import get_or_create
 
 
 class CollaboratorMixin:
@@ -27,8 +28,7 @@ class CollaboratorMixin:
 
     @classmethod
     def create_department(self, name: str) -> Department:
-        department = Department(name=name)
-        department.save()
+        department, _ = get_or_create(Department, name=name)
 
         return department
 
@@ -3,9 +3,13 @@ make another get method to be able to read response.context['request']"""
 
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django.asserts import assertTemplateUsed
 
+from epic_events.models import Customer
+
 from . import Collaborator, CollaboratorMixin
 
 
@@ -62,6 +66,55 @@ class TestCollaborator(CollaboratorMixin):
         # "/?next=/collaborators/" : redirected to login view
         assert response.url == "/?next=/collaborators/"
 
+    def test_get_collaborator_queries_count(self):
+        # 0. post one customer
+        customer = self.create_customer()
+        commercial = customer.commercial
+        url = reverse("collaborator", args=[commercial.id])
+
+        # 1. count the queries of the commercial profile with one customer
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        queries_count = len(context)
+        assert response.context["collaborator"].customers_count == 1
+
+        # 2. count the queries of the commercial profile with more customers
+        for i in range(20):
+            Customer(
+                first_name="Jean",
+                last_name="Dupont",
+                email=f"{i}_jeandupont@gmail.com",
+                commercial=commercial,
+            ).save()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        assert response.context["collaborator"].customers_count == 21
+        # the customers are counted, not loaded
+        assert len(context) == queries_count
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_home_queries_count(self, role: str):
+        # 0. post one contract
+        customer, contract = self.create_contract()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. the counters are read with one query, once computed for the user
+        self.client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("home"))
+        counter_queries = [q for q in context if "epic_events_counter" in q["sql"]]
+        assert len(counter_queries) == 1
+        assert response.context["all_customers"] == 1
+        assert response.context["all_contracts"] == 1
+
+        if role == "Commercial":
+            assert response.context["my_unsigned_contracts"] == 1
+        if role == "Gestion":
+            assert response.context["events_without_support"] == 0
+
     """test if create permission is allowed or forbidden"""
 
     @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
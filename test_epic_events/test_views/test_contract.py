@@ -2,17 +2,23 @@
 # # test create contract (visitor(no), commercial(no), support(no), gestion(yes))
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django.asserts import assertTemplateUsed
 
+from epic_events import facets
 from epic_events.models import Contract
+from epic_events.views import paginator
+from epic_events.views.paginator import cached_count, estimated_count, exact_count
 
 from . import CollaboratorMixin
 
 
 @pytest.mark.django_db
 class TestContract(CollaboratorMixin):
-
     """test read permission"""
 
     @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
@@ -26,6 +32,232 @@ class TestContract(CollaboratorMixin):
         assert response.status_code == 200
         assertTemplateUsed(response, "contract/list.html")
 
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial")])
+    def test_get_contracts_queries_count(
+        self, role: str, django_capture_on_commit_callbacks
+    ):
+        # 0. post one contract
+        with django_capture_on_commit_callbacks(execute=True):
+            customer, contract = self.create_contract()
+        commercial = customer.commercial
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. count the queries of one page of one contract
+        urls = [reverse("contracts"), reverse("my_contracts", args=[commercial.id])]
+        queries_count = []
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+            queries_count.append(len(context))
+
+        # 3. count the queries of one full page of contracts, the cached
+        # facets and totals invalidated once committed
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(9):
+                Contract(customer=customer).save()
+
+        for i, url in enumerate(urls):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            assert len(response.context["page_obj"]) == 10
+            # the page size does not change the number of queries
+            assert len(context) == queries_count[i]
+
+    def test_get_filtered_contracts(self):
+        # 0. post one unsigned contract and one signed and paid contract
+        customer, contract1 = self.create_contract()
+        contract2 = Contract(customer=customer, is_signed=True)
+        contract2.save()
+
+        # 1. login
+        collaborator = self.login(role="Gestion")
+
+        # 2. test the filters, the first request caches the facets
+        self.client.get(reverse("contracts"))
+        queries_count = []
+        for query, expected in [
+            ("", [contract2.id, contract1.id]),
+            ("?signed=1&paid=1", [contract2.id]),
+            ("?signed=0", [contract1.id]),
+            ("?paid=0", [contract1.id]),
+            ("?ready_for_event=1", [contract2.id]),
+            (f"?commercial={customer.commercial.id}&signed=1", [contract2.id]),
+            ("?commercial=none", []),
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse("contracts") + query)
+            assert [row.id for row in response.context["page_obj"]] == expected
+            queries_count.append(len(context))
+
+        # the filters do not add queries
+        assert len(set(queries_count)) == 1
+
+        # 3. the commercial contracts ignore the commercial parameter
+        response = self.client.get(
+            reverse("my_contracts", args=[collaborator.id]) + "?signed=1"
+        )
+        assert len(response.context["page_obj"]) == 0
+        assert response.context["filter_query"] == "signed=1"
+
+    def test_get_contracts_pages(self):
+        # 0. post 25 contracts, 5 of them without edition time
+        customer, contract = self.create_contract()
+        for _ in range(24):
+            Contract(customer=customer).save()
+        Contract.objects.filter(id__in=Contract.objects.order_by("id")[:5]).update(
+            edition_time=None
+        )
+        newest_first = list(
+            Contract.objects.order_by(
+                F("edition_time").desc(nulls_last=True), "-id"
+            ).values_list("id", flat=True)
+        )
+
+        # 1. login
+        self.login(role="Gestion")
+
+        # 2. follow the next pages
+        url = reverse("contracts")
+        response = self.client.get(url)
+        pages = [response.context["page_obj"]]
+        while pages[-1].has_next:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(f"{url}?cursor={pages[-1].next_cursor}")
+            pages.append(response.context["page_obj"])
+            rows_queries = [
+                q
+                for q in context
+                if "epic_events_contract" in q["sql"] and "COUNT" not in q["sql"]
+            ]
+            # one single query per page, without OFFSET
+            assert len(rows_queries) == 1
+            assert "OFFSET" not in rows_queries[0]["sql"]
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [page.total.value for page in pages] == [25, 25, 25]
+        assert [row.id for page in pages for row in page] == newest_first
+        assert not pages[0].has_previous
+
+        # 3. follow the previous pages from the last one
+        response = self.client.get(f"{url}?cursor=last")
+        last_page = response.context["page_obj"]
+        assert [row.id for row in last_page] == newest_first[-10:]
+        assert not last_page.has_next
+        response = self.client.get(f"{url}?cursor={last_page.previous_cursor}")
+        assert [row.id for row in response.context["page_obj"]] == newest_first[5:15]
+
+        # 4. an invalid cursor shows the first page
+        response = self.client.get(f"{url}?cursor=invalid")
+        assert [row.id for row in response.context["page_obj"]] == newest_first[:10]
+
+    @pytest.mark.usefixtures("memory_cache")
+    def test_count_strategies(
+        self, monkeypatch, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        # 0. post 30 contracts
+        customer, contract = self.create_contract()
+        for _ in range(29):
+            Contract(customer=customer).save()
+        qs = Contract.objects.all()
+
+        # 1. the cached count is computed once per version of the data
+        cache.clear()
+        assert exact_count(qs).value == 30
+        assert cached_count(qs).value == 30
+        with django_assert_num_queries(0):
+            total = cached_count(qs)
+        assert str(total) == "30"
+        with django_capture_on_commit_callbacks(execute=True):
+            Contract(customer=customer).save()
+        assert cached_count(qs).value == 31
+
+        # 2. the estimated count is exact below the limit
+        total = estimated_count(qs)
+        assert (total.value, total.exact) == (31, True)
+
+        # 3. above the limit, the matching rows of the lowest ids are sampled
+        monkeypatch.setattr(paginator, "exact_limit", 10)
+        ids = list(qs.order_by("id").values_list("id", flat=True))
+        qs.filter(id__in=ids[::2]).update(is_signed=True)
+        total = estimated_count(qs.filter(is_signed=True))
+        assert (total.value, total.exact) == (16, False)
+        assert total.results_message() == " ℹ️ environ 16 résultats trouvés."
+
+    @pytest.mark.usefixtures("memory_cache")
+    def test_get_contracts_facets(self, django_capture_on_commit_callbacks):
+        # 0. post one contract
+        cache.clear()
+        customer, contract = self.create_contract()
+
+        # 1. login
+        self.login(role="Commercial")
+
+        # 2. the facets are computed by one query, then read from the cache
+        queries_count = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse("contracts"))
+            queries_count.append(len(context))
+        assert queries_count[1] == queries_count[0] - 1
+        assert response.context["facets"]["all"] == 1
+        assert response.context["facets"]["my_all"] == 1
+
+        # 3. saving a contract invalidates the facets, once committed
+        with django_capture_on_commit_callbacks(execute=True):
+            Contract(customer=customer, is_signed=True).save()
+        response = self.client.get(reverse("contracts"))
+        assert response.context["facets"]["all"] == 2
+        assert response.context["filters"][0][2] == 1
+        assert "signés et payés (1)" in response.content.decode()
+
+        # 4. deleting the commercial sets the commercial of its customers to
+        # NULL without signal, the facets are invalidated anyway
+        version = facets.version()
+        with django_capture_on_commit_callbacks(execute=True):
+            customer.commercial.delete()
+        assert facets.version() != version
+
+        # 5. a version evicted from the cache is replaced by a new one, the
+        # facets cached under the previous versions are not read again
+        version = facets.version()
+        cache.delete(facets.version_key)
+        assert facets.version() not in (version, None)
+
+    @pytest.mark.parametrize(
+        "query", ["?note=1", "?signed=yes", "?signed=1&signed=0", "?commercial=-1"]
+    )
+    def test_get_contracts_with_invalid_filter(self, query: str):
+        # 1. login
+        self.login(role="Gestion")
+
+        # 2. test invalid filter
+        response = self.client.get(reverse("contracts") + query)
+        # status_code == 302 : redirected to the list without filter
+        assert response.status_code == 302
+        assert response.url == reverse("contracts")
+
+    def test_search_contracts_with_query(self):
+        # 0. a signed contract of 5000 € and an unsigned one of 1000 €
+        customer, contract = self.create_contract()
+        Contract(customer=customer, total_amount=5000, is_signed=True).save()
+
+        # 1. login
+        self.login(role="Gestion")
+
+        # 2. search with qualifiers and free text
+        url = reverse("search_contract", args=["signed:oui amount>2k doe"])
+        response = self.client.get(url)
+        rows = list(response.context["page_obj"])
+        assert [row.formatted_total_amount for row in rows] == ["5 000"]
+        assert "signed:…" in response.content.decode()
+
+        # 3. an invalid query redirects to the list
+        response = self.client.get(reverse("search_contract", args=["note:1"]))
+        assert response.status_code == 302
+        assert response.url == reverse("contracts")
+
     def test_get_contracts_as_visitor(self):
         # 0. logout
         self.logout()
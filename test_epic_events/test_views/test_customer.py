@@ -3,9 +3,13 @@ make another get method to be able to read response.context['request']"""
 
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django.asserts import assertTemplateUsed
 
+from epic_events.duplicates import find_duplicates, store_duplicates
+from epic_events.models.contract_event import Contract
 from epic_events.models.customer import Customer
 
 from . import CollaboratorMixin
@@ -33,6 +37,38 @@ class TestCustomer(CollaboratorMixin):
         assert response.status_code == 200
         assertTemplateUsed(response, "customer/list.html")
 
+    def test_get_customers_queries_count(self):
+        # 0. post one customer
+        customer = self.create_customer()
+
+        # 1. count the queries of one page of one customer
+        urls = [
+            reverse("customers"),
+            reverse("my_customers", args=[customer.commercial.id]),
+        ]
+        queries_count = []
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+            queries_count.append(len(context))
+
+        # 2. count the queries of one full page of customers
+        for i in range(9):
+            Customer(
+                first_name="Jean",
+                last_name="Dupont",
+                email=f"{i}_jeandupont@gmail.com",
+                company=customer.company,
+                commercial=customer.commercial,
+            ).save()
+
+        for i, url in enumerate(urls):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            assert len(response.context["page_obj"]) == 10
+            # the page size does not change the number of queries
+            assert len(context) == queries_count[i]
+
     def test_get_customers_as_visitor(self):
         # 0. logout
         self.logout()
@@ -160,3 +196,39 @@ class TestCustomer(CollaboratorMixin):
         assert response.status_code == 302
         # "/?next=/..." : redirected to login view
         assert response.url == "/?next=/customers/1/delete/"
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_merge_duplicates_as_collaborator(self, role: str):
+        # 0. post two customers of the same company, and a contract
+        customer = self.create_customer()
+        self.client.post(
+            reverse("create_customer"),
+            {**self.customer_data, "last_name": "Doee", "email": "john@entreprise.com"},
+        )
+        duplicate = Customer.objects.get(email="john@entreprise.com")
+        Contract(customer=duplicate, total_amount=100).save()
+        store_duplicates(find_duplicates())
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. test get the pairs
+        response = self.client.get(reverse("customer_duplicates"))
+        if role == "Commercial":
+            assert response.status_code == 200
+            assertTemplateUsed(response, "customer/duplicates.html")
+            (pair,) = response.context["duplicates"]
+            assert (pair.customer, pair.duplicate) == (customer, duplicate)
+
+            # 3. test merge the duplicate into the customer
+            response = self.client.post(
+                reverse("merge_customers", args=[pair.id]), {"kept": customer.id}
+            )
+            assert response.status_code == 302
+            assert response.url == reverse("customer_duplicates")
+            assert not Customer.objects.filter(id=duplicate.id).exists()
+            assert Contract.objects.get().customer == customer
+
+        if role in ["Gestion", "Support"]:
+            # 403 : forbidden permission
+            assert response.status_code == 403
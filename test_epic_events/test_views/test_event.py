@@ -1,8 +1,13 @@
+from datetime import datetime, timedelta
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from pytest_django.asserts import assertTemplateUsed
 
-from epic_events.models import Event
+from epic_events.models import Contract, Event, Location
 
 from . import CollaboratorMixin
 
@@ -58,6 +63,80 @@ class TestEvent(CollaboratorMixin):
         assert response.status_code == 200
         assertTemplateUsed(response, "event/list.html")
 
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_events_queries_count(
+        self, role: str, django_capture_on_commit_callbacks
+    ):
+        # 0. post one event
+        with django_capture_on_commit_callbacks(execute=True):
+            event = self._create_and_assign_support_to_event()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. count the queries of one page of one event
+        urls = [
+            reverse("events"),
+            reverse("my_events", args=[event.support.id]),
+            reverse("search_event", args=["john"]),
+        ]
+        queries_count = []
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+            queries_count.append(len(context))
+
+        # 3. count the queries of one full page of events, the cached facets
+        # and totals invalidated once committed
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(9):
+                contract = Contract(customer=event.contract.customer, is_signed=True)
+                contract.save()
+                location = Location(city="Paris", zip=f"7501{i}")
+                location.save()
+                Event(
+                    contract=contract, location=location, support=event.support
+                ).save()
+
+        for i, url in enumerate(urls):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            assert len(response.context["page_obj"]) == 10
+            # the page size does not change the number of queries
+            assert len(context) == queries_count[i]
+
+    def test_get_filtered_events(self):
+        # 0. post one event with support and one event without support
+        event1 = self._create_and_assign_support_to_event()
+        event1.start_date = timezone.make_aware(datetime(2024, 6, 1, 10))
+        event1.save()
+        contract = Contract(customer=event1.contract.customer, is_signed=True)
+        contract.save()
+        event2 = Event(contract=contract)
+        event2.save()
+
+        # 1. login
+        self.login(role="Gestion")
+
+        # 2. test the filters
+        for query, expected in [
+            ("", [event2.id, event1.id]),
+            ("?support=none", [event2.id]),
+            (f"?support={event1.support.id}", [event1.id]),
+            ("?start_after=2024-06-01", [event1.id]),
+            ("?start_after=2024-06-01T11:00:00", []),
+            ("?start_before=2024-06-01&support=none", []),
+        ]:
+            response = self.client.get(reverse("events") + query)
+            assert [row.id for row in response.context["page_obj"]] == expected
+
+        # 3. test invalid filters
+        for query in ["?start_after=june", "?support=someone", "?signed=1"]:
+            response = self.client.get(reverse("events") + query)
+            # status_code == 302 : redirected to the list without filter
+            assert response.status_code == 302
+            assert response.url == reverse("events")
+
     def test_get_events_as_visitor(self):
         # 0. logout
         self.logout()
@@ -271,3 +350,132 @@ class TestEvent(CollaboratorMixin):
         assert response.status_code == 302
         # "/?next=/..." : redirected to login view
         assert response.url == "/?next=/events/1/delete/"
+
+    """test the conflicts of the supports"""
+
+    def test_change_support_refused_when_busy(self):
+        support_1 = self.create_collaborator(role="Support", number="1")
+        event = self._create_event()
+        other = Event.objects.create(support=support_1)
+        start = timezone.make_aware(datetime(2026, 5, 4, 9))
+        end = timezone.make_aware(datetime(2026, 5, 4, 18))
+        Event.objects.filter(id__in=[event.id, other.id]).update(
+            start_date=start, end_date=end
+        )
+
+        self.login(role="Gestion")
+        data = {"support": support_1.str_id}
+        response = self.client.post(reverse("change_support", args=[event.id]), data)
+        # 200 : the form is shown again with the conflict
+        assert response.status_code == 200
+        assert f"n°{other.id}" in response.content.decode()
+        assert Event.objects.get(id=event.id).support is None
+
+        # the other event ends before
+        Event.objects.filter(id=other.id).update(end_date=start)
+        response = self.client.post(reverse("change_support", args=[event.id]), data)
+        assert response.status_code == 302
+        assert Event.objects.get(id=event.id).support == support_1
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_conflicts_as_collaborator(self, role: str):
+        self.login(role=role)
+
+        response = self.client.get(reverse("event_conflicts"))
+        if role == "Gestion":
+            assert response.status_code == 200
+            assertTemplateUsed(response, "event/conflicts.html")
+            response = self.client.get(reverse("event_conflicts") + "?start=juin")
+            assert response.status_code == 302
+        else:
+            assert response.status_code == 403
+
+    """test the calendar and the feeds"""
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_calendar_as_collaborator(self, role: str):
+        self.login(role=role)
+
+        for query in ["", "?period=month&day=2026-10-17"]:
+            response = self.client.get(reverse("event_calendar") + query)
+            assert response.status_code == 200
+            assertTemplateUsed(response, "event/calendar.html")
+        assert (response.context["feed_url"] is None) == (role == "Gestion")
+
+        response = self.client.get(reverse("event_calendar") + "?period=year")
+        assert response.status_code == 302
+
+    def test_get_feed(self):
+        event = self._create_and_assign_support_to_event()
+        Event.objects.filter(id=event.id).update(start_date=timezone.now())
+        self.logout()
+        url = reverse("event_feed", args=[event.support.id])
+
+        # calendar clients are not logged in
+        assert self.client.get(url).status_code == 403
+        self.login(role="Support", number="1")
+        feed_url = self.client.get(reverse("event_calendar")).context["feed_url"]
+        self.logout()
+
+        response = self.client.get(feed_url)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/calendar; charset=utf-8"
+        assert (
+            f"UID:event-{event.id}@epic-events"
+            in b"".join(response.streaming_content).decode()
+        )
+
+        # unchanged feed
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(feed_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+        # the collaborator and the state of the feed, without rendering it
+        assert len(queries) == 2
+
+        response = self.client.get(
+            feed_url, HTTP_IF_MODIFIED_SINCE=self.client.get(feed_url)["Last-Modified"]
+        )
+        assert response.status_code == 304
+
+        # the feed renders the location of its events
+        location = Location(city="Lyon", zip="69001")
+        location.save()
+        Event.objects.filter(id=event.id).update(location=location)
+        etag = self.client.get(feed_url)["ETag"]
+        assert self.client.get(feed_url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        location.city = "Lyon 1er"
+        location.save()
+        response = self.client.get(feed_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert "LOCATION:" in b"".join(response.streaming_content).decode()
+
+    """test the automatic assignment of the supports"""
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_assign_supports_as_collaborator(self, role: str):
+        support_1 = self.create_collaborator(role="Support", number="1")
+        event = self._create_event()
+        Event.objects.filter(id=event.id).update(
+            start_date=timezone.now() + timedelta(days=3)
+        )
+
+        self.login(role=role)
+        response = self.client.get(reverse("assign_supports"))
+        if role != "Gestion":
+            assert response.status_code == 403
+            return
+        assert response.status_code == 200
+        assertTemplateUsed(response, "event/assignments.html")
+        assert response.context["proposals"][0][:2] == (event, support_1)
+
+        # a support created since the review is not proposed by the POST
+        self.create_collaborator(role="Support", number="2")
+        response = self.client.post(
+            reverse("assign_supports"), {"assignment": f"{event.id}:{support_1.id}"}
+        )
+        assert response.status_code == 302
+        assert Event.objects.get(id=event.id).support == support_1
+
+        response = self.client.post(reverse("assign_supports"), {"assignment": "x:1"})
+        assert response.status_code == 302
+        assert response.url == reverse("assign_supports")
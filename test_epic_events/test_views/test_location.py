@@ -0,0 +1,78 @@
+import pytest
+from django.urls import reverse
+from pytest_django.asserts import assertTemplateUsed
+
+from epic_events.models.location import Location
+
+from . import CollaboratorMixin
+
+
+@pytest.mark.django_db
+class TestLocation(CollaboratorMixin):
+    def create_locations(self) -> (Location, Location):
+        lyon = Location(name="Part Dieu", zip="69003", city="Lyon")
+        lyon.save()
+        paris = Location(name="Louvre", zip="75001", city="Paris")
+        paris.save()
+        return lyon, paris
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_locations_near_as_collaborator(self, role: str):
+        # 0. create one location in Lyon and one in Paris
+        lyon, paris = self.create_locations()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. test get the locations near a postal code
+        response = self.client.get(reverse("locations"), {"near": "69001"})
+        assert response.status_code == 200
+        assertTemplateUsed(response, "location/list.html")
+        assert list(response.context["page_obj"]) == [lyon]
+        assert response.context["filter_query"] == "near=69001"
+
+        # 3. test an invalid filter redirects to the list
+        response = self.client.get(reverse("locations"), {"near": "lyon"})
+        assert response.status_code == 302
+        assert response.url == reverse("locations")
+
+    @pytest.mark.parametrize("role", [("Gestion"), ("Commercial"), ("Support")])
+    def test_get_nearby_locations_as_collaborator(self, role: str):
+        # 0. create one location in Lyon and one in Paris
+        lyon, paris = self.create_locations()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. test get the json of the nearest locations
+        response = self.client.get(
+            reverse("nearby_locations"), {"zip": "69001", "k": "2"}
+        )
+        assert response.status_code == 200
+        results = response.json()
+        assert results["center"]["zip"] == "69001"
+        assert [row["id"] for row in results["locations"]] == [lyon.id, paris.id]
+        assert results["locations"][0]["url"] == reverse("location", args=[lyon.id])
+        assert 0 < results["locations"][0]["distance"] < 5
+
+        # 3. test get the locations within a radius
+        response = self.client.get(
+            reverse("nearby_locations"), {"zip": "69001", "radius": "20"}
+        )
+        assert [row["id"] for row in response.json()["locations"]] == [lyon.id]
+
+        # 4. test 400 : radius or k is required
+        response = self.client.get(reverse("nearby_locations"), {"zip": "69001"})
+        assert response.status_code == 400
+        assert "error" in response.json()
+
+    def test_get_nearby_locations_as_visitor(self):
+        # 0. logout
+        self.logout()
+
+        # 1. test get nearby locations as visitor
+        response = self.client.get(
+            reverse("nearby_locations"), {"zip": "69001", "k": "2"}
+        )
+        # status_code == 302 : redirection to login view
+        assert response.status_code == 302
@@ -0,0 +1,55 @@
+import pytest
+from django.urls import reverse
+from pytest_django.asserts import assertTemplateUsed
+
+from . import CollaboratorMixin
+
+
+@pytest.mark.django_db
+class TestGlobalSearch(CollaboratorMixin):
+    @pytest.mark.parametrize(
+        "role, groups",
+        [
+            (
+                "Gestion",
+                [
+                    "customers",
+                    "companies",
+                    "contracts",
+                    "events",
+                    "locations",
+                    "collaborators",
+                ],
+            ),
+            (
+                "Commercial",
+                ["customers", "companies", "contracts", "events", "locations"],
+            ),
+            ("Support", ["customers", "companies", "contracts", "events", "locations"]),
+        ],
+    )
+    def test_get_global_search_as_collaborator(self, role: str, groups: list):
+        # 0. post one contract of the customer 'John Doe' of the company 'entreprise'
+        customer, contract = self.create_contract()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. test get the rows of every model matching the search
+        response = self.client.get(reverse("global_search"), {"search": "john"})
+        assert response.status_code == 200
+        assertTemplateUsed(response, "search/global.html")
+        results = {group["name"]: group["rows"] for group in response.context["groups"]}
+        assert list(results) == groups
+        assert results["customers"] == [customer]
+        assert results["contracts"] == [contract]
+        assert results["companies"] == []
+
+    def test_get_global_search_as_visitor(self):
+        # 0. logout
+        self.logout()
+
+        # 1. test get global search as visitor
+        response = self.client.get(reverse("global_search"), {"search": "john"})
+        # status_code == 302 : redirection to login view
+        assert response.status_code == 302
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from epic_events.typeahead import indexes
+
+from . import CollaboratorMixin
+
+
+@pytest.mark.django_db
+class TestTypeahead(CollaboratorMixin):
+    @pytest.fixture(autouse=True)
+    def empty_indexes(self):
+        """the indexes of the process outlive the rows of the previous tests"""
+
+        cache.clear()
+        for index in indexes.values():
+            index.version = None
+            index.checked = None
+
+    @pytest.mark.parametrize(
+        "role, lists",
+        [
+            ("Gestion", ["customers", "companies", "collaborators"]),
+            ("Commercial", ["customers", "companies"]),
+            ("Support", ["customers", "companies"]),
+        ],
+    )
+    def test_get_typeahead_as_collaborator(self, role: str, lists: list):
+        # 0. post one customer of the company 'entreprise'
+        customer = self.create_customer()
+
+        # 1. login
+        self.login(role=role)
+
+        # 2. test get the rows starting with the letters typed
+        response = self.client.get(reverse("typeahead"), {"q": "Jo"})
+        assert response.status_code == 200
+        results = response.json()
+        assert list(results) == lists
+        assert results["customers"] == [
+            {
+                "id": customer.id,
+                "label": "John Doe <new_collaborator@gmail.com>",
+                "url": reverse("customer", args=[customer.id]),
+            }
+        ]
+
+        response = self.client.get(reverse("typeahead"), {"q": "entr"})
+        assert [row["id"] for row in response.json()["companies"]] == [
+            customer.company.id
+        ]
+
+    def test_get_typeahead_as_visitor(self):
+        # 0. logout
+        self.logout()
+
+        # 1. test get typeahead as visitor
+        response = self.client.get(reverse("typeahead"), {"q": "jo"})
+        # status_code == 302 : redirection to login view
+        assert response.status_code == 302